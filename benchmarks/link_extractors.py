@@ -0,0 +1,101 @@
+# coding: utf-8
+"""
+Файл: link_extractors.py
+------------------------
+Назначение:
+Бенчмарк извлечения ссылок и форм (src/core/link_extractor.py) на реальных страницах.
+
+    python -m benchmarks.link_extractors CORPUS [--repeat N] [--chunk BYTES]
+
+CORPUS — каталог с *.html (ищутся рекурсивно), список путей (.txt, по пути
+на строку) или кассета трафика (--record, берутся ответы text/html).
+Для каждого установленного варианта печатается время разбора корпуса
+(лучшее из --repeat прогонов) и число страниц, где результат (links, forms)
+отличается от эталона html.parser. Потоковые варианты получают тело
+кусками по --chunk байт — так же, как от body_reader.read_body.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from src.core.cassette import MAGIC, CassetteReader
+from src.core.link_extractor import LinkAndFormExtractor, available_backends, make_extractor
+
+
+def load_corpus(path):
+    """Список тел страниц (bytes) из каталога, списка файлов или кассеты."""
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(path) for name in names
+            if name.endswith((".html", ".htm"))
+        )
+    else:
+        with open(path, "rb") as f:
+            head = f.read(len(MAGIC))
+        if head == MAGIC:
+            return [
+                response.body for _, _, response in CassetteReader(path).responses()
+                if "text/html" in response.headers.get("Content-Type", "")
+            ]
+        with open(path, encoding="utf-8") as f:
+            files = [line.strip() for line in f if line.strip()]
+
+    pages = []
+    for name in files:
+        with open(name, "rb") as f:
+            pages.append(f.read())
+    return pages
+
+
+def extract(backend, body, chunk):
+    """(links, forms) страницы так, как их получит краулер."""
+    parser = make_extractor(backend)
+    if isinstance(parser, LinkAndFormExtractor):
+        parser.feed(body.decode("utf-8", errors="replace"))
+        parser.close()
+        return parser.links, parser.forms
+    parser.reset("text/html")
+    for start in range(0, len(body), chunk):
+        parser.feed(body[start:start + chunk])
+    parser.finish(body)
+    return parser.links, parser.forms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Link/form extractor benchmark")
+    parser.add_argument("corpus", help="Directory of .html files, a file list or a traffic cassette")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend, the best one is reported (default: 3)")
+    parser.add_argument("--chunk", type=int, default=64 * 1024,
+                        help="Chunk size fed to streaming backends (default: 65536)")
+    args = parser.parse_args(argv)
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"No HTML pages found in {args.corpus}", file=sys.stderr)
+        return 1
+    size = sum(len(body) for body in pages)
+    print(f"Corpus: {len(pages)} pages, {size / 1024 / 1024:.1f} MiB")
+
+    expected = [extract("html.parser", body, args.chunk) for body in pages]
+    # Эталон — первым, чтобы у остальных сразу печатать ускорение
+    backends = ["html.parser"] + [b for b in available_backends() if b != "html.parser"]
+    baseline = None
+    for backend in backends:
+        best = None
+        for _ in range(max(1, args.repeat)):
+            started = time.perf_counter()
+            results = [extract(backend, body, args.chunk) for body in pages]
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        baseline = baseline or best
+        mismatches = sum(1 for got, want in zip(results, expected) if got != want)
+        print(f"{backend:12} {best:8.3f} s  {size / 1024 / 1024 / best:7.1f} MiB/s  "
+              f"x{baseline / best:4.1f}  mismatches: {mismatches}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
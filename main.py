@@ -7,17 +7,34 @@ main.py
 2) Настраиваем логгер (logger).
 3) Если указано --list-modules, выводим список модулей и завершаем.
 4) Инициализируем компоненты (requester, authenticator, crawler).
-5) Краулер обходит сайт, собирает ссылки и формы.
-6) Проверяем уязвимости (SQL Injection, XSS, CSRF, etc.) если выбраны в --modules.
+5) Краулер обходит сайт, собирает ссылки и формы (--crawl-only сохраняет их
+   в карту поверхности, --scan-from берёт их из карты вместо обхода).
+6) Проверяем уязвимости (SQL Injection, XSS, CSRF, etc.) если выбраны в --modules —
+   по мере того, как краулер находит URL и формы (см. ScanPipeline).
 7) Выводим результаты, при необходимости формируем отчёт.
 """
 
+import signal
+import sqlite3
 import sys
 from src.core.cli_parser import parse_arguments
 from src.utils.logger import Logger
 from src.utils.report_generator import ReportGenerator  # Если есть
 from src.core.requester import Requester
+from src.core.artifact_store import ArtifactStore
+from src.core.content_probe import ContentTypeFilter
 from src.core.crawler import Crawler
+from src.core.form_index import FormIndex
+from src.core.frontier import MemoryFrontier, PriorityFrontier, SQLiteFrontier
+from src.core.priority import UrlScorer
+from src.core.recrawl_cache import RecrawlCache
+from src.core.link_extractor import available_backends
+from src.core.simhash import SimHashIndex
+from src.core.sitemap import SitemapSeeder
+from src.core.surface_map import SurfaceMapReader, SurfaceMapWriter
+from src.core.url_traps import TrapDetector
+from src.core.scan_pipeline import ScanPipeline
+from src.core.visited import make_visited_set
 
 # Импортируем SQLi сканеры
 from src.modules.sql_injection.error_based import ErrorBasedSQLiScanner
@@ -74,12 +91,43 @@ def main():
             logger.info(f"- {m}")
         sys.exit(0)
 
-    # 4) Инициализируем Requester
-    requester = Requester(
-        timeout=args.timeout,
-        delay=args.delay,
-        user_agent=args.user_agent
+    # 4) Инициализируем Requester и хранилище страниц краулера
+    artifacts = ArtifactStore(
+        max_memory_bytes=int(args.artifact_memory_mb * 1024 * 1024),
+        max_disk_bytes=int(args.artifact_disk_mb * 1024 * 1024),
+        spill_dir=args.artifact_dir
     )
+    try:
+        requester = Requester(
+            timeout=args.timeout,
+            delay=args.delay,
+            user_agent=args.user_agent,
+            pool_size=args.pool_size,
+            pool_idle_timeout=args.pool_idle_timeout,
+            concurrency=args.concurrency,
+            per_host_concurrency=args.per_host_concurrency,
+            probe_cache_size=args.probe_cache_size,
+            probe_cache_bytes=int(args.probe_cache_mb * 1024 * 1024),
+            artifacts=artifacts,
+            rate=args.rate,
+            burst=args.burst,
+            adaptive_concurrency=args.adaptive_concurrency,
+            min_concurrency=args.min_concurrency,
+            logger=logger,
+            max_body_size=args.max_body_size,
+            compression=not args.no_compression,
+            retries=args.retries,
+            retry_backoff=args.retry_backoff,
+            breaker_threshold=args.breaker_threshold,
+            breaker_cooldown=args.breaker_cooldown,
+            record=args.record,
+            replay=args.replay,
+            replay_latency=args.replay_latency
+        )
+    except (OSError, ValueError) as e:
+        # Кассету для --record/--replay не удалось открыть
+        logger.error(f"Cannot open cassette: {e}")
+        sys.exit(1)
 
     # (Опционально аутентификация)
     # authenticator = None
@@ -87,33 +135,27 @@ def main():
     #     authenticator = Authenticator(requester, args.auth)
     #     authenticator.login()
 
-    # Инициализируем краулер
-    crawler = Crawler(
-        start_url=args.url,
-        depth=args.depth,
-        scope_pattern=args.scope,
-        exclude_pattern=args.exclude,
-        delay=args.delay,
-        timeout=args.timeout,
-        user_agent=args.user_agent
-    )
-
-    logger.info("Starting scan...")
-
-    # 5) Запуск краулера (собирает URL и формы)
-    found_urls = crawler.run()
-    logger.info(f"Crawler found {len(found_urls)} URLs:")
-    for link in found_urls:
-        logger.info(f" - {link}")
-
-    found_forms = getattr(crawler, "found_forms", [])
-    if found_forms:
-        logger.info(f"Found {len(found_forms)} forms total.")
-        for f in found_forms:
-            logger.info(f"FORM: method={f['method']}, action={f['action']}, inputs={f['inputs']}")
+    # Источник находок: обход сайта или карта поверхности прошлого --crawl-only
+    crawler = None
+    if args.scan_from:
+        try:
+            surface = SurfaceMapReader(args.scan_from)
+        except (OSError, ValueError) as e:
+            logger.error(f"Cannot open --scan-from {args.scan_from}: {e}")
+            sys.exit(1)
+        if args.url and args.url != surface.start_url:
+            logger.warn(f"{args.scan_from} was crawled from {surface.start_url}, not {args.url}; scanning the saved surface.")
+        map_stats = surface.stats()
+        logger.info(
+            f"Scanning surface map {args.scan_from}: {map_stats['urls']} URLs and {map_stats['forms']} forms "
+            f"crawled from {surface.start_url} (depth {surface.depth}), no crawl."
+        )
+        events = surface.events()
+    else:
+        crawler = create_crawler(args, requester, logger)
+        events = crawler.crawl()
 
-    # 6) Проверка на уязвимости
-    results = []
+    logger.info("Starting crawl (--crawl-only, no modules)..." if args.crawl_only else "Starting scan...")
 
     # Если modules=all, то берём все, иначе разбиваем
     if args.modules == "all":
@@ -121,15 +163,124 @@ def main():
     else:
         chosen_modules = args.modules.split(",")
 
+    handlers = []
+    if args.crawl_only:
+        # Только обход: модули запустит следующий запуск с --scan-from
+        chosen_modules = []
     for mod in chosen_modules:
         mod = mod.strip()
         handler = module_handlers.get(mod)
         if handler:
-            mod_results = handler(requester, logger, found_urls, found_forms)
-            results.extend(mod_results)
+            handlers.append((mod, handler))
         else:
             logger.warn(f"Module '{mod}' not recognized or not implemented.")
 
+    # 5-6) Краулер собирает URL и формы, модули проверяют их по мере обнаружения.
+    # Requester потокобезопасен (ответы — отдельные объекты Response), поэтому
+    # проверки идут в пуле потоков параллельно с обходом. Результаты собираем
+    # в исходном порядке модулей.
+    pipeline = ScanPipeline(handlers, requester, logger, workers=args.module_workers)
+    results = pipeline.run(events)
+
+    # В компактных режимах visited не хранит строки URL — перечисляем их из событий обхода
+    found_urls = pipeline.urls
+    logger.info(f"Crawler found {len(found_urls)} URLs:")
+    for link in found_urls:
+        if link in pipeline.duplicates:
+            logger.info(f" - {link} (near-duplicate of {pipeline.duplicates[link]}, not scanned)")
+        else:
+            logger.info(f" - {link}")
+
+    if crawler is not None:
+        log_crawl_stats(args, logger, crawler)
+    else:
+        surface.close()
+        if pipeline.forms:
+            logger.info(f"Found {len(pipeline.forms)} forms total.")
+            for f in pipeline.forms:
+                logger.info(f"FORM: method={f['method']}, action={f['action']}, inputs={f['inputs']}")
+
+    # Статистика пула соединений: сколько рукопожатий удалось сэкономить
+    pool_stats = requester.pool_stats()
+    logger.info(
+        f"Connection pool: {pool_stats['reused']}/{pool_stats['requests']} requests reused "
+        f"a connection ({pool_stats['hit_rate']}% hit rate, {pool_stats['created']} handshakes)."
+    )
+
+    # Статистика кэша проб: сколько одинаковых проб не ушло в сеть повторно
+    cache_stats = requester.cache_stats()
+    if cache_stats:
+        logger.info(
+            f"Probe cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+            f"({cache_stats['entries']} responses, {cache_stats['bytes'] // 1024} KiB kept)."
+        )
+        for module_name, counters in sorted(cache_stats["modules"].items()):
+            logger.debug(f"Probe cache [{module_name}]: {counters['hits']} hits, {counters['misses']} misses")
+
+    # Потоковое чтение: сколько ответов не пришлось скачивать целиком
+    transfer_stats = requester.transfer_stats()
+    logger.info(
+        f"Responses: {transfer_stats['responses']} read, {transfer_stats['truncated_size']} cut at --max-body-size, "
+        f"{transfer_stats['truncated_match']} stopped early on a signature match, "
+        f"{transfer_stats['truncated_type']} skipped after the headers (not HTML); "
+        f"{transfer_stats['wire_bytes'] // 1024} KiB on the wire, {transfer_stats['decoded_bytes'] // 1024} KiB decoded."
+    )
+
+    # Фазы запросов: где уходит время (DNS, connect, TLS, TTFB, тело)
+    logger.info("Request timings:")
+    for line in requester.metrics.summary_lines():
+        logger.info(f" {line}")
+    if args.metrics_output:
+        requester.metrics.write_json(args.metrics_output)
+        logger.info(f"Request metrics saved to {args.metrics_output}")
+
+    # Circuit breaker: были ли хосты, которые пришлось "выключать"
+    if requester.breaker is not None:
+        breaker_stats = requester.breaker.stats()
+        if breaker_stats["opened"]:
+            logger.warn(
+                f"Circuit breaker opened {breaker_stats['opened']} times, "
+                f"{breaker_stats['fast_failed']} requests failed fast or were deferred."
+            )
+
+    # Адаптивный параллелизм: к какому лимиту пришли
+    if requester.controller is not None:
+        controller_stats = requester.controller.stats()
+        logger.info(
+            f"Adaptive concurrency: final limit {controller_stats['limit']} "
+            f"({controller_stats['increases']} increases, {controller_stats['decreases']} decreases, "
+            f"baseline p95 {controller_stats['baseline_p95']}s)."
+        )
+
+    # Лимитер частоты: сколько суммарно ждали свободного токена
+    if requester.limiter is not None:
+        limiter_stats = requester.limiter.stats()
+        logger.info(
+            f"Rate limiter: {limiter_stats['requests']} requests at {requester.limiter.rate:g}/s per host "
+            f"(burst {requester.limiter.burst}), waited {limiter_stats['waited']}s in total."
+        )
+
+    # Хранилище страниц: сколько страниц сканеры прочитали без нового запроса
+    artifact_stats = artifacts.stats()
+    logger.info(
+        f"Artifact store: {artifact_stats['entries']} pages "
+        f"({artifact_stats['raw_bytes'] // 1024} KiB, {artifact_stats['memory_bytes'] // 1024} KiB compressed in memory, "
+        f"{artifact_stats['disk_entries']} spilled to disk), {artifact_stats['hits']} reads served without a request."
+    )
+
+    # Кассеты: сколько ответов записано / воспроизведено
+    cassette_stats = requester.cassette_stats()
+    if "recorded" in cassette_stats:
+        logger.info(f"Cassette: {cassette_stats['recorded']} responses recorded to {args.record}")
+    if "replayed" in cassette_stats:
+        replayed = cassette_stats["replayed"]
+        logger.info(
+            f"Cassette replay: {replayed['hits']} responses served from {args.replay} "
+            f"({replayed['records']} recorded), {replayed['misses']} requests not in the recording."
+        )
+    requester.close()
+    artifacts.close()
+
     # 7) Итог
     if results:
         logger.info(f"Found {len(results)} vulnerabilities.")
@@ -147,15 +298,186 @@ def main():
         logger.info(f"Report saved to {args.output}")
 
 
+def create_crawler(args, requester, logger):
+    """Краулер со структурами обхода по аргументам командной строки (ошибка настройки — выход)."""
+    if args.html_parser not in available_backends():
+        logger.error(f"--html-parser {args.html_parser} requires the {args.html_parser} package.")
+        sys.exit(1)
+    if args.frontier == "sqlite":
+        frontier = SQLiteFrontier(path=args.frontier_path)
+    elif args.frontier == "priority":
+        frontier = PriorityFrontier()
+    else:
+        frontier = MemoryFrontier()
+    traps = None
+    if not args.no_trap_detection:
+        traps = TrapDetector(
+            max_values_per_param=args.max_param_values,
+            max_urls_per_template=args.max_template_urls
+        )
+    near_duplicates = SimHashIndex(args.simhash_distance) if args.near_duplicates else None
+    recrawl = None
+    if args.recrawl_cache:
+        try:
+            recrawl = RecrawlCache(args.recrawl_cache)
+        except sqlite3.Error as e:
+            logger.error(f"Cannot open --recrawl-cache {args.recrawl_cache}: {e}")
+            sys.exit(1)
+    surface = None
+    if args.crawl_only:
+        try:
+            surface = SurfaceMapWriter(args.crawl_only, args.url, args.depth)
+        except sqlite3.Error as e:
+            logger.error(f"Cannot create --crawl-only {args.crawl_only}: {e}")
+            sys.exit(1)
+    try:
+        crawler = Crawler(
+            start_url=args.url,
+            depth=args.depth,
+            scope_pattern=args.scope,
+            exclude_pattern=args.exclude,
+            delay=args.delay,
+            timeout=args.timeout,
+            user_agent=args.user_agent,
+            requester=requester,
+            workers=args.crawl_workers,
+            visited=make_visited_set(args.visited_mode, args.bloom_capacity, args.bloom_error_rate),
+            frontier=frontier,
+            checkpoint=args.checkpoint,
+            checkpoint_interval=args.checkpoint_interval,
+            resume=args.resume,
+            traps=traps,
+            near_duplicates=near_duplicates,
+            form_index=FormIndex(dedupe=not args.no_form_dedup),
+            sitemaps=SitemapSeeder(args.sitemap_max_urls, args.sitemap_max_files) if args.sitemap else None,
+            content_filter=None if args.no_content_probe else ContentTypeFilter(),
+            priority=UrlScorer(args.priority_weights) if args.frontier == "priority" else None,
+            max_pages=args.max_pages,
+            recrawl=recrawl,
+            surface=surface,
+            html_parser=args.html_parser
+        )
+    except (OSError, ValueError) as e:
+        # Контрольную точку для --resume не удалось прочитать
+        logger.error(f"Cannot resume crawl: {e}")
+        sys.exit(1)
+    if crawler.resumed:
+        logger.info(f"Resuming crawl from checkpoint {args.checkpoint}.")
+    elif args.resume:
+        logger.warn(f"Checkpoint {args.checkpoint} not found, starting a new crawl.")
+
+    # SIGTERM/SIGINT: краулер сохраняет контрольную точку и останавливается,
+    # уже найденное досканируется. Повторный сигнал завершает процесс сразу.
+    if args.checkpoint:
+        def _stop_crawl(signum, frame):
+            logger.warn("Stopping crawl and saving a checkpoint (send the signal again to exit now)...")
+            crawler.stop()
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+
+        signal.signal(signal.SIGTERM, _stop_crawl)
+        signal.signal(signal.SIGINT, _stop_crawl)
+
+    return crawler
+
+
+def log_crawl_stats(args, logger, crawler):
+    """Итоги обхода: кластеры дубликатов, память, кэши, ловушки, формы; закрывает файлы обхода."""
+    if crawler.near_duplicates is not None:
+        clusters = crawler.near_duplicates.stats()
+        logger.info(
+            f"Near-duplicate pages: {clusters['duplicates']} of {clusters['pages']} pages "
+            f"fall into {clusters['clusters']} clusters; one URL per cluster was scanned."
+        )
+        for representative, size in clusters["largest"]:
+            logger.debug(f" - {representative}: {size} pages")
+
+    # Память структур обхода: сколько байт на URL ушло на visited и где лежала очередь
+    memory = crawler.memory_stats()
+    logger.info(
+        f"Crawler memory: {memory['urls']} visited URLs in {memory['visited_bytes'] // 1024} KiB "
+        f"({memory['bytes_per_url']} bytes/URL, --visited-mode {args.visited_mode}); "
+        f"frontier ({memory['frontier']['backend']}) peaked at {memory['frontier']['peak']} URLs."
+    )
+    crawler.queue.close()
+
+    # Повторный обход: сколько страниц не пришлось скачивать и разбирать заново
+    recrawl = crawler.recrawl
+    if recrawl is not None:
+        recrawl_stats = recrawl.stats()
+        logger.info(
+            f"Re-crawl cache: {recrawl_stats['revalidated']} pages not modified (304), "
+            f"{recrawl_stats['reused']} reused without parsing, {recrawl_stats['changed']} changed, "
+            f"{recrawl_stats['new']} new."
+        )
+        recrawl.close()
+
+    # Сколько URL дала карта сайта
+    if crawler.sitemaps is not None and not crawler.resumed:
+        sitemap_stats = crawler.sitemaps.stats()
+        logger.info(
+            f"Sitemap seeding: {crawler.seeded} URLs queued from {sitemap_stats['urls']} listed in "
+            f"{sitemap_stats['sitemaps']} sitemap file(s) ({sitemap_stats['failed']} failed"
+            f"{', budget exhausted' if sitemap_stats['truncated'] else ''})."
+        )
+
+    # Сколько не-HTML ресурсов не пришлось скачивать
+    if crawler.content_filter is not None:
+        probe_stats = crawler.content_filter.stats()
+        logger.info(
+            f"Non-HTML resources: {probe_stats['extension'] + probe_stats['cached']} URLs not fetched "
+            f"({probe_stats['extension']} by extension, {probe_stats['cached']} by cached extension results), "
+            f"{probe_stats['headers_only']} responses read up to the headers only."
+        )
+        for extension, n in probe_stats["by_extension"]:
+            logger.debug(f" - .{extension}: {n} URLs not fetched")
+
+    # Сколько запросов сэкономило отсечение ловушек
+    if crawler.traps is not None:
+        trap_stats = crawler.traps.stats()
+        rules = ", ".join(f"{rule}: {n}" for rule, n in sorted(trap_stats["by_rule"].items())) or "none"
+        logger.info(
+            f"Trap detection: {trap_stats['skipped']} links skipped (fetches avoided; {rules}), "
+            f"{trap_stats['rewritten']} links rewritten to canonical form."
+        )
+        for template, n in trap_stats["top_templates"]:
+            logger.debug(f" - {template}: {n} links skipped")
+    if crawler.budget_exhausted:
+        logger.warn(f"Crawl stopped after --max-pages {args.max_pages} pages; {memory['frontier']['pending']} URLs were not crawled.")
+    if crawler.interrupted:
+        logger.warn(f"Crawl interrupted; checkpoint saved to {args.checkpoint}. Continue with --resume.")
+
+    found_forms = crawler.found_forms
+    if found_forms:
+        form_stats = crawler.form_index.stats()
+        logger.info(
+            f"Found {len(found_forms)} forms total ({form_stats['occurrences']} copies on crawled pages, "
+            f"{form_stats['duplicates']} duplicates not scanned again)."
+        )
+        for f in found_forms:
+            logger.info(f"FORM: method={f['method']}, action={f['action']}, inputs={f['inputs']}, "
+                        f"found on {crawler.form_index.page_count(f)} page(s)")
+
+    # Карта поверхности для следующих запусков с --scan-from
+    if crawler.surface is not None:
+        crawler.surface.close()
+        map_stats = SurfaceMapReader(args.crawl_only).stats()
+        logger.info(
+            f"Surface map saved to {args.crawl_only}: {map_stats['urls']} URLs, {map_stats['forms']} forms, "
+            f"{map_stats['injection_points']} injection points, {map_stats['fingerprints']} page fingerprints. "
+            f"Scan it with --scan-from {args.crawl_only}."
+        )
+
+
 def run_sql_injection_scanners(requester, logger, urls, forms):
     """
     Запускает все необходимые сканеры SQLi (Error-based, Boolean-based, Time-based).
     Возвращает список обнаруженных уязвимостей.
     """
     scanners = [
-        ErrorBasedSQLiScanner(requester, logger),
-        BooleanBasedSQLiScanner(requester, logger),
-        TimeBasedSQLiScanner(requester, logger, delay_threshold=5.0)
+        ErrorBasedSQLiScanner(requester.scoped("error_based_sqli"), logger),
+        BooleanBasedSQLiScanner(requester.scoped("boolean_based_sqli"), logger),
+        TimeBasedSQLiScanner(requester.scoped("time_based_sqli"), logger, delay_threshold=5.0)
     ]
 
     sqli_results = []
@@ -172,9 +494,9 @@ def run_xss_scanners(requester, logger, urls, forms):
     Запускает сканеры XSS (Reflected, Stored, DOM-based).
     """
     scanners = [
-        ReflectedXSSScanner(requester, logger),
-        StoredXSSScanner(requester, logger),
-        DomBasedXSSScanner(requester, logger)
+        ReflectedXSSScanner(requester.scoped("reflected_xss"), logger),
+        StoredXSSScanner(requester.scoped("stored_xss"), logger),
+        DomBasedXSSScanner(requester.scoped("dom_based_xss"), logger)
     ]
 
     xss_results = []
@@ -193,7 +515,7 @@ def run_csrf_scanner(requester, logger, urls, forms):
     from src.modules.csrf.csrf_scanner import BasicCSRFScanner
 
     scanners = [
-        BasicCSRFScanner(requester, logger)
+        BasicCSRFScanner(requester.scoped("csrf"), logger)
         # Если захотите сделать несколько видов CSRF-сканеров, добавьте их сюда
     ]
 
@@ -260,8 +582,8 @@ def run_nosql_injection_scanners(requester, logger, urls, forms):
     Запускает SimpleNoSQLiScanner и AdvancedNoSQLiScanner.
     """
     scanners = [
-        SimpleNoSQLiScanner(requester, logger),
-        AdvancedNoSQLiScanner(requester, logger, delay_threshold=2.0)
+        SimpleNoSQLiScanner(requester.scoped("simple_nosql"), logger),
+        AdvancedNoSQLiScanner(requester.scoped("advanced_nosql"), logger, delay_threshold=2.0)
     ]
 
     results = []
@@ -274,7 +596,7 @@ def run_nosql_injection_scanners(requester, logger, urls, forms):
 
 
 def run_directory_traversal_scanner(requester, logger, urls, forms):
-    scanner = DirectoryTraversalScanner(requester, logger)
+    scanner = DirectoryTraversalScanner(requester.scoped("directory_traversal"), logger)
     results = []
     results.extend(scanner.scan_urls(urls))
     results.extend(scanner.scan_forms(forms))
@@ -283,8 +605,8 @@ def run_directory_traversal_scanner(requester, logger, urls, forms):
 
 def run_rce_scanners(requester, logger, urls, forms):
     scanners = [
-        CommandInjectionScanner(requester, logger),
-        CodeInjectionScanner(requester, logger)
+        CommandInjectionScanner(requester.scoped("rce_command_injection"), logger),
+        CodeInjectionScanner(requester.scoped("rce_code_injection"), logger)
     ]
     results = []
     for scanner in scanners:
@@ -296,21 +618,21 @@ def run_rce_scanners(requester, logger, urls, forms):
 
 
 def run_open_redirect_scanner(requester, logger, urls, forms):
-    scanner = OpenRedirectScanner(requester, logger)
+    scanner = OpenRedirectScanner(requester.scoped("open_redirect"), logger)
     results = []
     results.extend(scanner.scan_urls(urls))
     results.extend(scanner.scan_forms(forms))
     return results
 
 def run_idor_scanner(requester, logger, urls, forms):
-    scanner = IDORScanner(requester, logger)
+    scanner = IDORScanner(requester.scoped("idor"), logger)
     results = []
     results.extend(scanner.scan_urls(urls))
     results.extend(scanner.scan_forms(forms))
     return results
 
 def run_ssrf_scanner(requester, logger, urls, forms):
-    scanner = SSRFScanner(requester, logger)
+    scanner = SSRFScanner(requester.scoped("ssrf"), logger)
     results = []
     results.extend(scanner.scan_urls(urls))
     results.extend(scanner.scan_forms(forms))
@@ -318,7 +640,7 @@ def run_ssrf_scanner(requester, logger, urls, forms):
 
 
 def run_insecure_file_upload_scanner(requester, logger, urls, forms):
-    scanner = FileUploadScanner(requester, logger)
+    scanner = FileUploadScanner(requester.scoped("insecure_file_upload"), logger)
     results = []
     results.extend(scanner.scan_urls(urls))
     results.extend(scanner.scan_forms(forms))
@@ -326,7 +648,7 @@ def run_insecure_file_upload_scanner(requester, logger, urls, forms):
 
 
 def run_authentication_scanner(requester, logger, urls, forms):
-    scanner = AuthScanner(requester, logger)
+    scanner = AuthScanner(requester.scoped("authentication"), logger)
     results = []
     # Сканируем URL
     r_urls = scanner.scan_urls(urls)
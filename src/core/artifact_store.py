@@ -0,0 +1,193 @@
+# coding: utf-8
+"""
+Файл: artifact_store.py
+-----------------------
+Назначение:
+Хранилище страниц, скачанных краулером (тело + заголовки + статус).
+
+Раньше Crawler скачивал страницу, вытаскивал из неё ссылки и формы и выбрасывал
+HTML, а DomBasedXSSScanner тут же запрашивал те же URL заново, только чтобы
+поискать в них DOM-синки. Теперь краулер кладёт ответы сюда, и пассивный
+анализ (поиск синков, заголовки) обходится без лишних запросов.
+
+Особенности:
+- Тела хранятся сжатыми (zlib), заголовки — списком пар (name, value).
+- Память ограничена max_memory_bytes (по сжатому размеру). При переполнении
+  самые старые записи выгружаются в файлы во временном каталоге (spill_dir).
+- Диск ограничен max_disk_bytes: если и он переполнен, старые записи удаляются.
+- get(url) восстанавливает Response — сканер работает с ним как с обычным ответом.
+- Все методы потокобезопасны.
+"""
+
+import http.client
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+
+from src.core.response import Response
+
+
+class ArtifactStore:
+    def __init__(self, max_memory_bytes=32 * 1024 * 1024, max_disk_bytes=256 * 1024 * 1024,
+                 spill_dir=None, compress_level=6):
+        """
+        :param max_memory_bytes: Сколько сжатых данных держим в памяти (байт).
+        :param max_disk_bytes: Сколько сжатых данных готовы выгрузить на диск (0 — не выгружать).
+        :param spill_dir: Каталог для выгрузки. Если None, создаём временный при первой выгрузке
+                          и удаляем его в close().
+        :param compress_level: Уровень сжатия zlib (1 — быстрее, 9 — компактнее).
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.spill_dir = spill_dir
+        self.compress_level = compress_level
+
+        self._own_dir = False
+        self._memory = OrderedDict()  # url -> (meta, compressed_body)
+        self._disk = OrderedDict()    # url -> (meta, path, size)
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._raw_bytes = 0
+        self._next_file = 0
+        self._hits = 0
+        self._lock = threading.Lock()
+
+    def put(self, url, response):
+        """
+        Сохраняет ответ краулера под запрошенным URL.
+        :param url: URL, который запрашивал краулер (финальный URL хранится в meta).
+        :param response: Response
+        """
+        meta = {
+            "status": response.status,
+            "url": response.url,
+            "elapsed": response.elapsed,
+            "headers": list(response.headers.items()) if response.headers is not None else [],
+            "size": len(response.body),
+            "truncated": response.truncated
+        }
+        compressed = zlib.compress(response.body, self.compress_level)
+
+        with self._lock:
+            self._remove(url)
+            self._memory[url] = (meta, compressed)
+            self._memory_bytes += len(compressed)
+            self._raw_bytes += meta["size"]
+            self._spill()
+
+    def get(self, url):
+        """Возвращает сохранённый Response для url или None, если страницы нет."""
+        with self._lock:
+            if url in self._memory:
+                meta, compressed = self._memory[url]
+            elif url in self._disk:
+                meta, path, _ = self._disk[url]
+                try:
+                    with open(path, "rb") as f:
+                        compressed = f.read()
+                except OSError:
+                    return None
+            else:
+                return None
+            self._hits += 1
+
+        headers = http.client.HTTPMessage()
+        for name, value in meta["headers"]:
+            headers[name] = value
+        return Response(meta["status"], headers, meta["url"], meta["elapsed"],
+                        zlib.decompress(compressed), meta["truncated"])
+
+    def __contains__(self, url):
+        with self._lock:
+            return url in self._memory or url in self._disk
+
+    def __len__(self):
+        with self._lock:
+            return len(self._memory) + len(self._disk)
+
+    def stats(self):
+        """
+        Возвращает словарь:
+        {"entries", "memory_entries", "disk_entries", "raw_bytes",
+         "memory_bytes", "disk_bytes", "hits"}
+        """
+        with self._lock:
+            return {
+                "entries": len(self._memory) + len(self._disk),
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk),
+                "raw_bytes": self._raw_bytes,
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+                "hits": self._hits
+            }
+
+    def close(self):
+        """Удаляет выгруженные файлы (и временный каталог, если создавали его сами)."""
+        with self._lock:
+            for _, path, _ in self._disk.values():
+                self._unlink(path)
+            self._disk.clear()
+            self._disk_bytes = 0
+            if self._own_dir and self.spill_dir:
+                shutil.rmtree(self.spill_dir, ignore_errors=True)
+                self.spill_dir = None
+                self._own_dir = False
+
+    def _remove(self, url):
+        # Повторный put() того же URL заменяет старую запись
+        if url in self._memory:
+            meta, compressed = self._memory.pop(url)
+            self._memory_bytes -= len(compressed)
+            self._raw_bytes -= meta["size"]
+        elif url in self._disk:
+            meta, path, size = self._disk.pop(url)
+            self._disk_bytes -= size
+            self._raw_bytes -= meta["size"]
+            self._unlink(path)
+
+    def _spill(self):
+        # Выгружаем самые старые записи из памяти на диск, пока не уложимся в лимит
+        while self._memory and self._memory_bytes > self.max_memory_bytes:
+            url, (meta, compressed) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(compressed)
+
+            path = self._write(compressed) if len(compressed) <= self.max_disk_bytes else None
+            if path is None:
+                self._raw_bytes -= meta["size"]
+                continue
+            self._disk[url] = (meta, path, len(compressed))
+            self._disk_bytes += len(compressed)
+
+        # Диск тоже ограничен: удаляем самые старые выгруженные записи
+        while self._disk and self._disk_bytes > self.max_disk_bytes:
+            _, (meta, path, size) = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._raw_bytes -= meta["size"]
+            self._unlink(path)
+
+    def _write(self, compressed):
+        """Пишет сжатое тело в файл, возвращает путь или None при ошибке."""
+        try:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="webscanner-artifacts-")
+                self._own_dir = True
+            else:
+                os.makedirs(self.spill_dir, exist_ok=True)
+            self._next_file += 1
+            path = os.path.join(self.spill_dir, f"{self._next_file}.z")
+            with open(path, "wb") as f:
+                f.write(compressed)
+            return path
+        except OSError:
+            return None
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
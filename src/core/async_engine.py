@@ -0,0 +1,135 @@
+# coding: utf-8
+"""
+Файл: async_engine.py
+---------------------
+Назначение:
+Асинхронный движок запросов (asyncio) с ограничением параллелизма.
+
+Сканеры в src/modules/* отправляют пробы по одной, и скорость скана равна
+одному round-trip за другим. Движок позволяет отдать пачку проб сразу
+и получать ответы по мере готовности:
+- concurrency: глобальный лимит одновременных запросов
+- per_host: лимит одновременных запросов к одному хосту
+
+Сама сетевая часть остаётся в Requester (пул keep-alive соединений, редиректы),
+движок лишь планирует запросы в event loop и исполняет их в пуле потоков —
+так все возможности Requester работают одинаково в синхронном и пакетном режимах.
+
+Проба (probe) — обычный словарь:
+    {"method": "GET" | "POST", "url": "...", "data": {...} или None, ...}
+Любые другие ключи (param, payload и т.д.) движок не трогает и возвращает
+вместе с ответом, чтобы сканер мог сопоставить ответ с пэйлоадом.
+
+Пример:
+    engine = AsyncRequestEngine(requester, concurrency=10, per_host=4)
+    for probe, response in engine.run_batch(probes):
+        ...
+"""
+
+import asyncio
+import queue
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncRequestEngine:
+    def __init__(self, requester, concurrency=10, per_host=4):
+        """
+        :param requester: Requester, через который выполняются запросы.
+        :param concurrency: Глобальный лимит одновременных запросов.
+        :param per_host: Лимит одновременных запросов к одному хосту.
+        """
+        self.requester = requester
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="requester"
+        )
+
+    async def fetch(self, probe, global_sem, host_sems, cancelled=None):
+        """
+        Выполняет одну пробу с учётом глобального и per-host лимитов.
+        Возвращает (probe, response), где response — Response или None.
+        Если cancelled установлен к моменту получения слота, запрос не отправляется.
+        """
+        host = urllib.parse.urlsplit(probe["url"]).netloc
+        host_sem = host_sems.setdefault(host, asyncio.Semaphore(self.per_host))
+
+        # Сначала ждём слот хоста, потом глобальный — чтобы не занимать
+        # глобальный слот, пока хост перегружен
+        async with host_sem:
+            async with global_sem:
+                if cancelled is not None and cancelled.is_set():
+                    return probe, None
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(
+                    self._executor,
+                    self.requester.fetch_probe,
+                    probe
+                )
+        return probe, response
+
+    async def iter_batch(self, probes, cancelled=None):
+        """
+        Асинхронный генератор: запускает все пробы и отдаёт (probe, response)
+        по мере завершения.
+        :param cancelled: threading.Event — если установлен, новые пробы не запускаются.
+        """
+        global_sem = asyncio.Semaphore(self.concurrency)
+        host_sems = {}
+
+        tasks = [
+            asyncio.ensure_future(self.fetch(p, global_sem, host_sems, cancelled))
+            for p in probes
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def run_batch(self, probes):
+        """
+        Синхронная обёртка для сканеров: запускает event loop в отдельном потоке
+        и отдаёт (probe, response) по мере готовности.
+        Если вызывающий код прервёт перебор (break), оставшиеся пробы не запускаются.
+        """
+        probes = list(probes)
+        if not probes:
+            return
+
+        results = queue.Queue()
+        cancelled = threading.Event()
+        done = object()
+
+        def runner():
+            async def consume():
+                async for item in self.iter_batch(probes, cancelled):
+                    results.put(item)
+            try:
+                asyncio.run(consume())
+            except BaseException as e:  # пробрасываем ошибку в поток сканера
+                results.put(e)
+            finally:
+                results.put(done)
+
+        thread = threading.Thread(target=runner, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+            thread.join()
+
+    def close(self):
+        """Останавливает пул потоков движка."""
+        self._executor.shutdown(wait=False)
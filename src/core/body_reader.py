@@ -0,0 +1,242 @@
+# coding: utf-8
+"""
+Файл: body_reader.py
+--------------------
+Назначение:
+Потоковое чтение тела HTTP-ответа кусками вместо response.read() целиком.
+
+Одна многомегабайтная "скачка" в области скана раньше занимала поток надолго
+и целиком ложилась в память. Теперь тело читается кусками по CHUNK_SIZE:
+- max_size: больше этого не читаем (ответ помечается truncated="size");
+- stop_when: скомпилированный регекс сигнатуры. Как только он нашёлся,
+  чтение прекращается (truncated="match") — детектору остальное тело не нужно.
+
+Сигнатура может попасть на стык двух кусков, поэтому поиск идёт по новому
+куску вместе с хвостом предыдущего (MATCH_OVERLAP символов).
+
+Если тело дочитано не до конца, соединение нельзя вернуть в пул:
+в нём остались непрочитанные байты. Небольшой остаток (известный по
+Content-Length) дешевле дочитать, чем открывать новое соединение.
+
+Сжатие (Content-Encoding: gzip, deflate, br):
+- Requester отправляет Accept-Encoding = ACCEPT_ENCODING; br — только если
+  установлен необязательный пакет brotli.
+- Тело распаковывается по мере чтения, max_size и stop_when применяются
+  к распакованным данным (так "zip-бомба" тоже упирается в лимит).
+- read_body() возвращает, сколько байт пришло по сети, — для статистики
+  "по сети / после распаковки".
+
+sink (необязательный получатель тела, см. link_extractor.py): в начале
+ответа вызывается sink.reset(content_type), затем sink.feed(data) для
+каждого распакованного куска — разбор может идти, пока тело ещё читается.
+Если reset() вернул False, тело этого ответа получателю не нужно (например,
+краулеру — не HTML): оно не читается вовсе, ответ помечается truncated="type".
+"""
+
+import codecs
+import http.client
+import zlib
+
+try:
+    import brotli
+except ImportError:  # br — необязательная зависимость
+    brotli = None
+
+# Размер куска чтения из сокета
+CHUNK_SIZE = 64 * 1024
+
+# Сколько символов предыдущего куска участвует в поиске сигнатуры
+MATCH_OVERLAP = 512
+
+# Остаток тела, который дочитываем, чтобы сохранить keep-alive соединение
+DRAIN_LIMIT = 64 * 1024
+
+# Что предлагаем серверу в Accept-Encoding
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+
+# Сколько байт сети читаем за раз, проверяя, кончился ли сжатый поток на лимите
+TAIL_READ = 1024
+
+# Ошибки распаковки повреждённого тела
+_DECODE_ERRORS = (zlib.error,) + ((brotli.error,) if brotli is not None else ())
+
+
+class _Decompressor:
+    """
+    Потоковый распаковщик для одного Content-Encoding.
+    decompress(chunk, limit) отдаёт не больше limit байт (0 — без ограничения),
+    остаток входа хранит у себя (pending). finished — поток сжатия дочитан до конца.
+    """
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self._zlib = None
+        self._brotli = None
+        self._leftover = b""  # распакованный brotli-вывод сверх limit
+        self._head = b""  # начало deflate-тела, пока по нему не определён формат
+        if encoding in ("gzip", "x-gzip"):
+            self._zlib = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "br":
+            self._brotli = brotli.Decompressor()
+
+    @property
+    def pending(self):
+        if self._zlib is not None and self._zlib.unconsumed_tail:
+            return True
+        return bool(self._leftover)
+
+    @property
+    def finished(self):
+        if self._zlib is not None:
+            return self._zlib.eof
+        if self._brotli is not None:
+            return not self._leftover and self._brotli.is_finished()
+        return False
+
+    @property
+    def unused(self):
+        """Данные сети после конца потока сжатия."""
+        return self._zlib.unused_data if self._zlib is not None else b""
+
+    def decompress(self, chunk, limit=0):
+        try:
+            if self._brotli is not None:
+                data = self._leftover + (self._brotli.process(chunk) if chunk else b"")
+                self._leftover = data[limit:] if limit else b""
+                return data[:limit] if limit else data
+            if self._zlib is None:
+                # deflate: по RFC это zlib-обёртка, но часть серверов шлёт "сырой" deflate.
+                # Заголовок — 2 байта, а первый кусок из сети может быть короче
+                self._head += chunk
+                if len(self._head) < 2:
+                    return b""
+                wbits = zlib.MAX_WBITS if _has_zlib_header(self._head) else -zlib.MAX_WBITS
+                self._zlib = zlib.decompressobj(wbits)
+                chunk, self._head = self._head, b""
+            return self._zlib.decompress(self._zlib.unconsumed_tail + chunk, limit)
+        except _DECODE_ERRORS as e:
+            raise http.client.HTTPException(f"Cannot decode {self.encoding} body: {e}")
+
+
+def _has_zlib_header(data):
+    return len(data) >= 2 and data[0] & 0x0F == 8 and (data[0] * 256 + data[1]) % 31 == 0
+
+
+def _decompressor_for(content_encoding):
+    """Распаковщик для заголовка Content-Encoding или None (тело без сжатия / неизвестная схема)."""
+    encoding = (content_encoding or "").strip().lower()
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        return _Decompressor(encoding)
+    if encoding == "br" and brotli is not None:
+        return _Decompressor(encoding)
+    return None
+
+
+def read_body(response, max_size=0, stop_when=None, sink=None):
+    """
+    Читает (и при необходимости распаковывает) тело http.client.HTTPResponse.
+    :param max_size: Максимум байт распакованного тела (0 — без ограничения).
+    :param stop_when: Регекс (объект с .search), при совпадении чтение прекращается.
+    :param sink: Получатель кусков тела (reset(content_type), feed(data)) или None.
+    :return: (raw_bytes, truncated, reusable, wire_bytes), где truncated — None, "size",
+             "match" или "type" (sink.reset() вернул False), reusable — можно ли вернуть соединение в пул,
+             wire_bytes — сколько байт тела пришло по сети.
+    """
+    decompressor = _decompressor_for(response.getheader("Content-Encoding"))
+    chunks = []
+    size = 0
+    wire = 0
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace") if stop_when is not None else None
+    tail = ""
+    truncated = None
+    if sink is not None and sink.reset(response.getheader("Content-Type", "")) is False:
+        # Получателю тело не нужно: хватило заголовков
+        return b"", "type", _drain(response), 0
+
+    while True:
+        limit = 0
+        if max_size:
+            limit = max_size - size
+            if limit <= 0:
+                truncated = "size"
+                break
+
+        if decompressor is not None and decompressor.pending:
+            # Распаковщик ещё не отдал всё, что уже пришло по сети
+            chunk = b""
+        else:
+            # Без сжатия читаем ровно до лимита; сжатые данные — кусками целиком
+            amount = min(CHUNK_SIZE, limit) if limit and decompressor is None else CHUNK_SIZE
+            chunk = response.read(amount)
+            if not chunk:
+                break
+            wire += len(chunk)
+
+        # Распаковываем порциями не больше CHUNK_SIZE: так и сигнатура, и лимит
+        # срабатывают, не разворачивая весь сжатый кусок в память
+        if decompressor is not None:
+            data = decompressor.decompress(chunk, min(limit, CHUNK_SIZE) if limit else CHUNK_SIZE)
+        else:
+            data = chunk
+        if not data:
+            continue
+        chunks.append(data)
+        size += len(data)
+        if sink is not None:
+            sink.feed(data)
+
+        if decoder is not None:
+            text = tail + decoder.decode(data)
+            if stop_when.search(text):
+                truncated = "match"
+                break
+            tail = text[-MATCH_OVERLAP:]
+
+    # Тело ровно в лимит: дочитано до конца, либо сервер дальше ничего не прислал
+    if truncated == "size" and decompressor is not None:
+        more, extra = _more_output(response, decompressor)
+        wire += extra
+        if not more:
+            truncated = None
+    elif truncated == "size":
+        extra = response.read(1)
+        wire += len(extra)
+        if not extra:
+            truncated = None
+
+    reusable = truncated is None or _drain(response)
+    return b"".join(chunks), truncated, reusable, wire
+
+
+def _more_output(response, decompressor):
+    """
+    Распакованное тело упёрлось в max_size: даст ли поток хоть байт сверх лимита.
+    Конец потока (трейлер gzip, adler32 у zlib) может ещё лежать в распаковщике
+    или в сети — его дочитываем, это не обрезка. Возвращает (more, wire_bytes).
+    """
+    wire = 0
+    chunk = b""
+    while True:
+        if decompressor.decompress(chunk, 1):
+            return True, wire
+        if decompressor.finished:
+            break
+        if wire >= DRAIN_LIMIT:
+            # Поток всё не кончается — считаем тело обрезанным
+            return True, wire
+        chunk = response.read(TAIL_READ)
+        if not chunk:
+            return False, wire
+        wire += len(chunk)
+    # После конца потока в теле ничего не должно остаться
+    extra = response.read(1)
+    return bool(extra or decompressor.unused), wire + len(extra)
+
+
+def _drain(response):
+    """Дочитывает небольшой остаток тела, чтобы соединение можно было переиспользовать."""
+    remaining = response.length
+    if remaining is None or remaining > DRAIN_LIMIT:
+        return False
+    response.read()
+    return True
@@ -0,0 +1,185 @@
+# coding: utf-8
+"""
+Файл: cassette.py
+-----------------
+Назначение:
+Запись и воспроизведение трафика ("кассета") для офлайн-бенчмарков сканера.
+
+Чтобы мерить CPU-стоимость детекторов и оркестрацию скана без живой цели,
+Requester умеет:
+- --record FILE: записывать каждую пару запрос/ответ в кассету;
+- --replay FILE: отдавать ответы из кассеты вместо сети — со скоростью памяти
+  или (--replay-latency) с записанными задержками.
+
+Формат файла (компактный, с индексом):
+    MAGIC
+    [4 байта длины (big-endian)][zlib(JSON-запись)]  ... по записи на ответ
+    [zlib(JSON-индекс)]
+    [8 байт смещения индекса (big-endian)] INDEX_MAGIC
+
+Запись — словарь {"method", "url", "body", "status", "headers", "final_url",
+"elapsed", "timings", "truncated", "response"}; тела запроса и ответа — base64.
+Индекс — {ключ: [смещения записей]}, ключ — sha1 от (method, url, body).
+Если одинаковый запрос записан несколько раз (например, Stored XSS до и после
+отправки формы), при воспроизведении ответы отдаются по очереди, последний
+повторяется.
+
+Файл без индекса (скан прервали) тоже читается: записи просматриваются подряд.
+"""
+
+import base64
+import hashlib
+import http.client
+import json
+import struct
+import threading
+import zlib
+
+from src.core.response import Response
+
+MAGIC = b"WSCASS1\n"
+INDEX_MAGIC = b"WSCIDX1\n"
+_LENGTH = struct.Struct(">I")
+_OFFSET = struct.Struct(">Q")
+
+
+def cassette_key(method, url, body):
+    """Ключ записи: sha1 от метода, URL и тела запроса."""
+    digest = hashlib.sha1()
+    digest.update(method.upper().encode("utf-8") + b"\0" + url.encode("utf-8") + b"\0")
+    digest.update(body or b"")
+    return digest.hexdigest()
+
+
+class CassetteWriter:
+    def __init__(self, path):
+        """:param path: Куда писать кассету (файл перезаписывается)."""
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._index = {}
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, method, url, body, response):
+        """Дописывает в кассету ответ на запрос (method, url, body)."""
+        record = {
+            "method": method,
+            "url": url,
+            "body": base64.b64encode(body).decode("ascii") if body else None,
+            "status": response.status,
+            "headers": list(response.headers.items()) if response.headers is not None else [],
+            "final_url": response.url,
+            "elapsed": response.elapsed,
+            "timings": response.timings,
+            "truncated": response.truncated,
+            "response": base64.b64encode(response.body).decode("ascii")
+        }
+        data = zlib.compress(json.dumps(record, separators=(",", ":")).encode("utf-8"))
+        key = cassette_key(method, url, body)
+
+        with self._lock:
+            if self._file is None:
+                return
+            offset = self._file.tell()
+            self._file.write(_LENGTH.pack(len(data)))
+            self._file.write(data)
+            self._index.setdefault(key, []).append(offset)
+            self.count += 1
+
+    def close(self):
+        """Дописывает индекс и закрывает файл. Возвращает число записей."""
+        with self._lock:
+            if self._file is None:
+                return self.count
+            index_offset = self._file.tell()
+            self._file.write(zlib.compress(json.dumps(self._index).encode("utf-8")))
+            self._file.write(_OFFSET.pack(index_offset) + INDEX_MAGIC)
+            self._file.close()
+            self._file = None
+            return self.count
+
+
+class CassetteReader:
+    def __init__(self, path, latency=False):
+        """
+        :param path: Файл кассеты.
+        :param latency: Воспроизводить записанное время ответа (его выдерживает Requester).
+        """
+        self.path = path
+        self.latency = latency
+        with open(path, "rb") as f:
+            self._data = f.read()
+        if not self._data.startswith(MAGIC):
+            raise ValueError(f"{path} is not a traffic cassette")
+
+        self._index = self._load_index()
+        self._served = {}  # key -> сколько раз уже отдавали
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(offsets) for offsets in self._index.values())
+
+    def lookup(self, method, url, body):
+        """
+        Возвращает Response, записанный для (method, url, body), или None,
+        если такого запроса в кассете нет (как будто сеть не ответила).
+        """
+        key = cassette_key(method, url, body)
+        with self._lock:
+            offsets = self._index.get(key)
+            if not offsets:
+                self.misses += 1
+                return None
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            self.hits += 1
+        return self._response(self._read(offsets[min(served, len(offsets) - 1)]))
+
+    def responses(self):
+        """Все записанные ответы в порядке записи: (method, url, Response). Не влияет на lookup()."""
+        for offset in sorted(offset for offsets in self._index.values() for offset in offsets):
+            record = self._read(offset)
+            yield record["method"], record["url"], self._response(record)
+
+    def stats(self):
+        with self._lock:
+            return {"records": len(self), "hits": self.hits, "misses": self.misses}
+
+    def _response(self, record):
+        headers = http.client.HTTPMessage()
+        for name, value in record["headers"]:
+            headers[name] = value
+        return Response(
+            record["status"], headers, record["final_url"], record["elapsed"],
+            base64.b64decode(record["response"]), record["truncated"], record["timings"]
+        )
+
+    def _read(self, offset):
+        (length,) = _LENGTH.unpack_from(self._data, offset)
+        start = offset + _LENGTH.size
+        return json.loads(zlib.decompress(self._data[start:start + length]))
+
+    def _load_index(self):
+        tail = _OFFSET.size + len(INDEX_MAGIC)
+        if len(self._data) >= len(MAGIC) + tail and self._data.endswith(INDEX_MAGIC):
+            (index_offset,) = _OFFSET.unpack_from(self._data, len(self._data) - tail)
+            return json.loads(zlib.decompress(self._data[index_offset:len(self._data) - tail]))
+
+        # Индекса нет (запись оборвалась) — восстанавливаем его, проходя записи подряд
+        index = {}
+        offset = len(MAGIC)
+        while offset + _LENGTH.size <= len(self._data):
+            (length,) = _LENGTH.unpack_from(self._data, offset)
+            if offset + _LENGTH.size + length > len(self._data):
+                break
+            try:
+                record = self._read(offset)
+            except (zlib.error, ValueError):
+                break
+            body = base64.b64decode(record["body"]) if record["body"] else None
+            index.setdefault(cassette_key(record["method"], record["url"], body), []).append(offset)
+            offset += _LENGTH.size + length
+        return index
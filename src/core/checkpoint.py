@@ -0,0 +1,121 @@
+# coding: utf-8
+"""
+Файл: checkpoint.py
+-------------------
+Назначение:
+Контрольные точки обхода (--checkpoint, --resume).
+
+Crawler периодически (checkpoint_interval) и при остановке по сигналу
+сохраняет своё состояние:
+- frontier: все ожидающие URL с глубиной (в порядке BFS);
+- redo: URL, которые были "в полёте" в момент сохранения. Они уже отмечены
+  в visited, но их ссылки и формы ещё не учтены — после --resume такие URL
+  скачиваются заново, а не пропускаются;
+- visited: объект множества посещённых URL (любой режим из visited.py);
+- forms: индекс найденных форм (FormIndex из form_index.py);
+- traps: счётчики TrapDetector (url_traps.py), если детектор включён;
+- near_duplicates: кластеры SimHashIndex (simhash.py), если он включён;
+- pages_fetched: сколько страниц уже скачано (бюджет --max-pages);
+- found_offset: длина журнала найденных URL (FoundUrlLog) на момент снимка.
+
+Журнал найденных URL — файл checkpoint + ".urls", по URL на строку, дописывается
+по мере обхода. Компактные множества visited (fingerprint, bloom) не хранят
+строки URL, а после --resume сканеры должны получить и URL прошлых запусков:
+они читаются из журнала. При --resume журнал обрезается до found_offset — URL,
+найденные после снимка, будут обойдены и записаны заново.
+
+Снимок делается в потоке обхода между шагами, поэтому он согласован:
+каждый URL либо полностью обработан (в visited, его ссылки — в frontier),
+либо ждёт обработки (в frontier или redo). Значит, после --resume ни один
+URL не будет пропущен и ни одна страница не будет учтена дважды.
+
+Файл — zlib-сжатый pickle, пишется во временный файл и атомарно заменяет
+старый (os.replace), так что падение во время записи не портит прошлую точку.
+Загружайте только собственные контрольные точки: pickle исполняет код.
+"""
+
+import os
+import pickle
+import time
+import zlib
+
+# Версия формата: при несовпадении --resume отказывается читать файл
+# (2 — формы хранятся в FormIndex, а не списком; 3 — FormIndex хранит число
+# страниц формы и первые из них, а не все; 4 — журнал найденных URL и pages_fetched)
+VERSION = 4
+
+
+def save_checkpoint(path, state):
+    """
+    Атомарно сохраняет состояние обхода.
+    :param state: {"start_url", "depth", "frontier", "redo", "visited", "forms", "traps", "near_duplicates",
+                   "pages_fetched", "found_offset"}
+    """
+    data = dict(state, version=VERSION, saved_at=time.time())
+    payload = zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), 1)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(payload)
+
+
+def load_checkpoint(path):
+    """Читает состояние, сохранённое save_checkpoint(). ValueError — файл не подходит."""
+    with open(path, "rb") as f:
+        payload = f.read()
+    try:
+        data = pickle.loads(zlib.decompress(payload))
+    except (zlib.error, pickle.UnpicklingError, EOFError) as e:
+        raise ValueError(f"{path} is not a crawl checkpoint: {e}")
+    if not isinstance(data, dict) or data.get("version") != VERSION:
+        raise ValueError(f"{path} has an unsupported checkpoint format")
+    return data
+
+
+def found_urls_path(path):
+    """Путь журнала найденных URL для контрольной точки path."""
+    return path + ".urls"
+
+
+class FoundUrlLog:
+    """Журнал URL, отданных обходом (см. описание модуля). Вызывается из одного потока обхода."""
+
+    def __init__(self, path, offset=None):
+        """
+        :param path: Файл журнала.
+        :param offset: None — новый обход (журнал очищается); иначе found_offset
+                       контрольной точки: журнал обрезается до него (OSError, если файла нет).
+        """
+        self.path = path
+        if offset is None:
+            self._file = open(path, "wb")
+        else:
+            self._file = open(path, "r+b")
+            self._file.truncate(offset)
+            self._file.seek(offset)
+        self._resumed = offset or 0
+
+    def add(self, url):
+        self._file.write(url.encode("utf-8") + b"\n")
+
+    def offset(self):
+        """Записывает журнал на диск и возвращает его длину (found_offset для снимка)."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def resumed_urls(self):
+        """URL, найденные до --resume (в порядке обнаружения)."""
+        remaining = self._resumed
+        with open(self.path, "rb") as f:
+            for line in f:
+                if remaining <= 0:
+                    break
+                remaining -= len(line)
+                yield line.rstrip(b"\n").decode("utf-8")
+
+    def close(self):
+        self._file.close()
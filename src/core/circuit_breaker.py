@@ -0,0 +1,116 @@
+# coding: utf-8
+"""
+Файл: circuit_breaker.py
+------------------------
+Назначение:
+Per-host circuit breaker: перестаём долбить хост, который перестал отвечать.
+
+Когда цель начинает отваливаться по таймауту, каждый сканер продолжал
+отправлять весь список пэйлоадов, и каждый запрос ждал полный --timeout.
+Breaker считает подряд идущие неудачи (после всех повторов) для каждого хоста:
+- closed: всё нормально, запросы идут;
+- open: failure_threshold неудач подряд — cooldown секунд запросы к хосту
+  не отправляются (Requester сразу отвечает отказом или откладывает пробу);
+- half-open: cooldown прошёл — пропускаем один пробный запрос. Успех
+  закрывает breaker, неудача снова открывает его с удвоенным cooldown
+  (но не больше max_cooldown).
+
+Состояние хоста — обычный словарь {"state", "failures", "open_until", "cooldown"}.
+Все методы потокобезопасны. Переходы пишутся в лог сканера.
+"""
+
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Запрос не отправлен: breaker хоста открыт."""
+
+    def __init__(self, host):
+        super().__init__(f"Circuit open for {host}")
+        self.host = host
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, cooldown=10.0, max_cooldown=120.0, logger=None):
+        """
+        :param failure_threshold: Сколько неудач подряд открывают breaker.
+        :param cooldown: Сколько секунд хост "отдыхает" после открытия.
+        :param max_cooldown: Потолок для удваивающегося cooldown.
+        :param logger: Logger сканера (или None).
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+        self.logger = logger
+
+        self._hosts = {}
+        self._opened = 0
+        self._fast_failed = 0
+        self._lock = threading.Lock()
+
+    def allow(self, host):
+        """Можно ли сейчас отправить запрос к host."""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state["state"] == CLOSED:
+                return True
+
+            if state["state"] == OPEN and time.monotonic() >= state["open_until"]:
+                # Пробный запрос: остальные ждут его результата
+                state["state"] = HALF_OPEN
+                return True
+
+            self._fast_failed += 1
+            return False
+
+    def record(self, host, success):
+        """Учитывает результат запроса к host (после всех повторов)."""
+        with self._lock:
+            state = self._hosts.setdefault(
+                host, {"state": CLOSED, "failures": 0, "open_until": 0.0, "cooldown": self.cooldown}
+            )
+
+            if success:
+                if state["state"] != CLOSED:
+                    self._log("info", f"Circuit breaker: {host} is responding again, resuming requests.")
+                state.update(state=CLOSED, failures=0, cooldown=self.cooldown)
+                return
+
+            state["failures"] += 1
+            if state["state"] == HALF_OPEN:
+                # Пробный запрос не прошёл — отдыхаем дольше
+                self._open(host, state, min(self.max_cooldown, state["cooldown"] * 2))
+            elif state["state"] == CLOSED and state["failures"] >= self.failure_threshold:
+                self._open(host, state, state["cooldown"])
+
+    def retry_after(self, host):
+        """Через сколько секунд к host можно будет отправить пробный запрос (0 — уже можно)."""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state["state"] != OPEN:
+                return 0.0
+            return max(0.0, state["open_until"] - time.monotonic())
+
+    def stats(self):
+        """Сколько раз открывался breaker, сколько запросов отклонено, какие хосты сейчас открыты."""
+        with self._lock:
+            return {
+                "opened": self._opened,
+                "fast_failed": self._fast_failed,
+                "open_hosts": sorted(h for h, s in self._hosts.items() if s["state"] != CLOSED)
+            }
+
+    def _open(self, host, state, cooldown):
+        state.update(state=OPEN, open_until=time.monotonic() + cooldown, cooldown=cooldown)
+        self._opened += 1
+        self._log("warn", f"Circuit breaker: {host} failed {state['failures']} times in a row, "
+                          f"pausing requests for {cooldown:g}s.")
+
+    def _log(self, level, msg):
+        if self.logger is not None:
+            getattr(self.logger, level)(msg)
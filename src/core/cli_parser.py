@@ -18,6 +18,9 @@
 
 import argparse
 
+from src.core.priority import parse_weights
+
+
 def parse_arguments():
     # Создаем парсер командной строки
     # Используем английский для описания команд в help-тексте,
@@ -45,6 +48,179 @@ def parse_arguments():
         help="Depth of crawling (default: 1)."
     )
 
+    # Структуры обхода для больших сайтов: компактное множество посещённых URL и очередь на диске
+    parser.add_argument(
+        "--visited-mode",
+        choices=["exact", "fingerprint", "bloom"],
+        default="exact",
+        help="How the crawler remembers visited URLs: exact strings (default), 64-bit fingerprints, "
+             "or a Bloom filter (a false positive skips a URL)."
+    )
+    parser.add_argument(
+        "--bloom-capacity",
+        type=int,
+        default=1000000,
+        help="Expected number of URLs for --visited-mode bloom (default: 1000000; the filter grows past it)."
+    )
+    parser.add_argument(
+        "--bloom-error-rate",
+        type=float,
+        default=0.001,
+        help="False-positive rate for --visited-mode bloom (default: 0.001)."
+    )
+    parser.add_argument(
+        "--frontier",
+        choices=["memory", "sqlite", "priority"],
+        default="memory",
+        help="Crawl queue: breadth-first in memory (default) or in an SQLite file with bounded RAM use, "
+             "or 'priority' (in memory) to crawl the URLs scanners care about first (see --priority-weights)."
+    )
+    parser.add_argument(
+        "--frontier-path",
+        help="SQLite file for --frontier sqlite (default: a temporary file removed after the crawl)."
+    )
+    parser.add_argument(
+        "--priority-weights",
+        default="",
+        help="Weights of URL features for --frontier priority, e.g. 'params=4,template=2,form=2,depth=1' "
+             "(query parameters, first URL of its template, found on a page with forms, penalty per depth "
+             "level; omitted ones keep these defaults)."
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=0,
+        help="Stop the crawl after downloading this many pages (default: 0, no limit). "
+             "The rest of the queue is kept in --checkpoint; pages fetched before --resume count too."
+    )
+
+    # Контрольные точки обхода: периодически и по SIGTERM/SIGINT; --resume продолжает с последней
+    parser.add_argument(
+        "--checkpoint",
+        metavar="FILE",
+        help="Save crawl state (frontier, visited URLs, forms, pages fetched) to this file periodically and "
+             "on SIGTERM/SIGINT; discovered URLs are appended to FILE.urls for --resume."
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=60.0,
+        help="Seconds between crawl checkpoints (default: 60)."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the crawl from the --checkpoint file instead of starting over."
+    )
+
+    # Повторный обход: условные запросы и ссылки/формы неизменившихся страниц (см. src/core/recrawl_cache.py)
+    parser.add_argument(
+        "--recrawl-cache",
+        metavar="FILE",
+        help="Keep ETag/Last-Modified, content hashes, links and forms of crawled pages in this SQLite file; "
+             "the next crawl with the same file revalidates pages with conditional requests and reuses "
+             "the links and forms of unchanged ones."
+    )
+
+    # Обход и скан отдельными запусками (см. src/core/surface_map.py)
+    parser.add_argument(
+        "--crawl-only",
+        metavar="FILE",
+        help="Crawl the target and save the discovered URLs, forms, injection points and page fingerprints "
+             "to this SQLite surface map without scanning."
+    )
+    parser.add_argument(
+        "--scan-from",
+        metavar="FILE",
+        help="Scan the surface map saved by --crawl-only instead of crawling (the target URL is optional)."
+    )
+
+    # Ловушки обхода: календари, ?page=N, параметры сессии (см. src/core/url_traps.py)
+    parser.add_argument(
+        "--no-trap-detection",
+        action="store_true",
+        help="Crawl every discovered URL as is: no canonical URL form and no crawler trap limits."
+    )
+    parser.add_argument(
+        "--max-param-values",
+        type=int,
+        default=50,
+        help="Distinct values of one query parameter crawled per URL template (default: 50)."
+    )
+    parser.add_argument(
+        "--max-template-urls",
+        type=int,
+        default=500,
+        help="Distinct URLs crawled per URL template, e.g. /calendar/{n}/{n} (default: 500)."
+    )
+
+    # Почти одинаковые страницы (SimHash): сканеры проверяют один URL на кластер
+    parser.add_argument(
+        "--near-duplicates",
+        action="store_true",
+        help="Cluster near-duplicate pages by SimHash and scan only one URL per cluster."
+    )
+    parser.add_argument(
+        "--simhash-distance",
+        type=int,
+        default=6,
+        help="Maximum Hamming distance (bits of 64) between SimHash fingerprints of "
+             "near-duplicate pages (default: 6)."
+    )
+
+    # Затравка очереди обхода из robots.txt и sitemap.xml (см. src/core/sitemap.py)
+    parser.add_argument(
+        "--sitemap",
+        action="store_true",
+        help="Also queue the URLs listed in robots.txt / sitemap.xml (including gzipped and nested "
+             "sitemap indexes); they are crawled regardless of --depth, within their own budget."
+    )
+    parser.add_argument(
+        "--sitemap-max-urls",
+        type=int,
+        default=10000,
+        help="Maximum number of URLs taken from sitemaps (default: 10000)."
+    )
+    parser.add_argument(
+        "--sitemap-max-files",
+        type=int,
+        default=50,
+        help="Maximum number of sitemap files fetched, nested ones included (default: 50)."
+    )
+
+    # Не-HTML ресурсы: отсев по расширению и GET, читающий только заголовки (см. src/core/content_probe.py)
+    parser.add_argument(
+        "--no-content-probe",
+        action="store_true",
+        help="Download every crawled URL in full, including images, archives and other non-HTML resources."
+    )
+
+    # Одинаковые формы (метод, action, имена полей) со многих страниц сканируются один раз
+    parser.add_argument(
+        "--no-form-dedup",
+        action="store_true",
+        help="Scan every copy of a form found on different pages instead of one per "
+             "(method, action, input names)."
+    )
+
+    # Чем краулер разбирает HTML (lxml и selectolax — если установлены)
+    parser.add_argument(
+        "--html-parser",
+        choices=["stream", "lxml", "selectolax", "html.parser"],
+        default="stream",
+        help="How the crawler extracts links and forms: 'stream' parses pages while they download "
+             "(default), 'lxml'/'selectolax' use those packages, 'html.parser' is the old stdlib parser."
+    )
+
+    # Сколько страниц краулер скачивает параллельно
+    parser.add_argument(
+        "--crawl-workers",
+        type=int,
+        default=1,
+        help="Number of pages the crawler fetches and parses in parallel (default: 1). "
+             "The set of found URLs and forms does not depend on it."
+    )
+
     # Модули уязвимостей: список или 'all'
     parser.add_argument(
         "--modules",
@@ -86,7 +262,23 @@ def parse_arguments():
         "--delay",
         type=float,
         default=0.0,
-        help="Delay between requests in seconds (default: 0.0)."
+        help="Minimum interval between requests to the same host in seconds, used when --rate is not set (default: 0.0)."
+    )
+
+    # Ограничение частоты: запросов в секунду к одному хосту (token bucket)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="Maximum requests per second per host, shared by the crawler and all modules (default: 0 = unlimited)."
+    )
+
+    # Сколько запросов можно отправить подряд без ожидания
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=1,
+        help="Number of requests per host allowed in a burst when --rate is set (default: 1)."
     )
 
     # Режим quiet — минимальный вывод
@@ -136,6 +328,171 @@ def parse_arguments():
         help="Disable colored output in the console."
     )
 
+    # Пул keep-alive соединений: сколько соединений держим на хост
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=10,
+        help="Maximum number of idle keep-alive connections kept per host (default: 10)."
+    )
+
+    # Через сколько секунд простоя соединение из пула закрывается
+    parser.add_argument(
+        "--pool-idle-timeout",
+        type=float,
+        default=30.0,
+        help="Close pooled connections idle for longer than this many seconds (default: 30.0)."
+    )
+
+    # Асинхронный движок: сколько проб сканер может держать "в полёте" одновременно
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Maximum number of concurrent probes sent by scanners (default: 1, sequential). "
+             "Parallel probes multiply the load on the target, so raise it (e.g. 10) only when that is acceptable."
+    )
+
+    # Лимит одновременных запросов к одному хосту
+    parser.add_argument(
+        "--per-host-concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of concurrent probes per host when --concurrency is above 1 (default: 4)."
+    )
+
+    # Адаптивный параллелизм: лимит подбирается по задержкам и ошибкам сервера
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Adjust the number of in-flight requests to latency and errors (AIMD), using --concurrency as the ceiling (has no effect while --concurrency is 1)."
+    )
+
+    # Нижняя граница адаптивного лимита
+    parser.add_argument(
+        "--min-concurrency",
+        type=int,
+        default=1,
+        help="Lower bound for --adaptive-concurrency (default: 1)."
+    )
+
+    # Максимальный размер читаемого тела ответа (остальное не скачиваем)
+    parser.add_argument(
+        "--max-body-size",
+        type=int,
+        default=10 * 1024 * 1024,
+        help="Maximum response body size to read, in bytes (default: 10485760, 0 = unlimited)."
+    )
+
+    # Отключить сжатие ответов (Accept-Encoding)
+    parser.add_argument(
+        "--no-compression",
+        action="store_true",
+        help="Do not request compressed responses (gzip/deflate/br)."
+    )
+
+    # Повторы при временных сбоях (таймаут, сетевая ошибка, 429/502/503/504)
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Number of retries for transient failures, with jittered exponential backoff (default: 2)."
+    )
+
+    # Базовая задержка перед повтором
+    parser.add_argument(
+        "--retry-backoff",
+        type=float,
+        default=0.5,
+        help="Base backoff in seconds before a retry, doubled on each attempt (default: 0.5)."
+    )
+
+    # Circuit breaker: сколько неудач подряд "выключают" хост
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=5,
+        help="Consecutive failures after which requests to a host are paused (default: 5, 0 = disabled)."
+    )
+
+    # Сколько секунд хост "отдыхает"
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=10.0,
+        help="Seconds to pause an unhealthy host before a trial request (default: 10.0)."
+    )
+
+    # Файл для метрик запросов (гистограммы фаз по хостам и модулям) в JSON
+    parser.add_argument(
+        "--metrics-output",
+        help="Write per-host and per-module request phase histograms (DNS, connect, TLS, TTFB, body) to this JSON file."
+    )
+
+    # Запись трафика в кассету и воспроизведение без сети (офлайн-бенчмарки)
+    parser.add_argument(
+        "--record",
+        metavar="FILE",
+        help="Record every request/response pair (crawler and scanners) to this cassette file."
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="FILE",
+        help="Serve responses from a recorded cassette instead of the network; unrecorded requests fail."
+    )
+    parser.add_argument(
+        "--replay-latency",
+        action="store_true",
+        help="With --replay, wait for each response's recorded latency instead of answering at memory speed."
+    )
+
+    # Кэш проб: одинаковые запросы разных модулей уходят в сеть один раз
+    parser.add_argument(
+        "--probe-cache-size",
+        type=int,
+        default=10000,
+        help="Maximum number of responses kept in the scan-wide probe cache (default: 10000, 0 = disabled)."
+    )
+
+    # Лимит памяти кэша проб
+    parser.add_argument(
+        "--probe-cache-mb",
+        type=float,
+        default=64.0,
+        help="Memory limit of the probe cache in megabytes (default: 64)."
+    )
+
+    # Сколько модулей уязвимостей запускать параллельно (в пуле потоков)
+    parser.add_argument(
+        "--module-workers",
+        type=int,
+        default=1,
+        help="Number of scan batches (module x crawled URLs/forms) checked in parallel threads "
+             "while the crawl goes on (default: 1)."
+    )
+
+    # Хранилище страниц краулера: сколько сжатых тел держим в памяти
+    parser.add_argument(
+        "--artifact-memory-mb",
+        type=float,
+        default=32.0,
+        help="Memory limit for compressed crawled pages reused by scanners (default: 32)."
+    )
+
+    # Сверх лимита памяти страницы выгружаются на диск (0 — не выгружать)
+    parser.add_argument(
+        "--artifact-disk-mb",
+        type=float,
+        default=256.0,
+        help="Disk limit for crawled pages spilled out of memory (default: 256, 0 = no spill)."
+    )
+
+    # Каталог для выгрузки (по умолчанию — временный, удаляется после скана)
+    parser.add_argument(
+        "--artifact-dir",
+        help="Directory for spilled crawled pages (default: a temporary directory removed after the scan)."
+    )
+
     # Парсим аргументы
     args = parser.parse_args()
 
@@ -143,9 +500,24 @@ def parse_arguments():
     # 1) Если не указана URL ни позиционно, ни через --url, нужно указать пользователю ошибку.
     #    Но Argparse может вывести help автоматически, если не указан URL.
     #    Здесь можно добавить проверку.
-    if args.url is None and not args.list_modules:
+    if args.url is None and not args.list_modules and not args.scan_from:
         # Если не указан URL и пользователь не запросил список модулей, считаем это ошибкой
-        parser.error("Please specify a target URL or use --list-modules.")
+        parser.error("Please specify a target URL, --scan-from FILE or --list-modules.")
+
+    if not 0 <= args.simhash_distance < 32:
+        parser.error("--simhash-distance must be between 0 and 31.")
+
+    try:
+        args.priority_weights = parse_weights(args.priority_weights)
+    except ValueError as e:
+        parser.error(f"--priority-weights: {e}")
+
+    if args.crawl_only and args.scan_from:
+        parser.error("--crawl-only and --scan-from cannot be used together.")
+
+    # --resume без файла контрольной точки не имеет смысла
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint FILE.")
 
     # 2) Если пользователь указал и --quiet, и --verbose одновременно,
     #    можно либо отдать приоритет одному, либо вывести предупреждение.
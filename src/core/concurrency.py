@@ -0,0 +1,141 @@
+# coding: utf-8
+"""
+Файл: concurrency.py
+--------------------
+Назначение:
+Адаптивный лимит одновременных запросов (AIMD) по обратной связи от сервера.
+
+Фиксированный --concurrency либо слишком мал для мощного приложения (скан
+тянется часами), либо слишком велик для хрупкого (мы его роняем). Контроллер
+подбирает лимит на ходу:
+- Additive increase: если окно из `window` завершённых запросов прошло без
+  ошибок и p95 задержки стабилен, лимит растёт на `increase`.
+- Multiplicative decrease: таймаут, сетевая ошибка, ответ 429/503 или всплеск
+  p95 (больше базового в `latency_factor` раз) — лимит умножается на `decrease`.
+  После снижения следующее снижение возможно не раньше, чем завершится ещё одно
+  окно запросов: ответы, отправленные до снижения, не "наказывают" дважды.
+
+Requester вызывает acquire() перед каждым реальным сетевым запросом
+и release() после него. Оба метода потокобезопасны (threading.Condition).
+Решения контроллера пишутся в лог сканера: снижения — info, рост — debug.
+"""
+
+import threading
+
+
+class AdaptiveConcurrency:
+    # Статусы, которыми сервер просит притормозить
+    BACKOFF_STATUSES = (429, 503)
+
+    def __init__(self, initial, minimum=1, maximum=10, window=20, increase=1,
+                 decrease=0.5, latency_factor=2.0, logger=None):
+        """
+        :param initial: Начальный лимит.
+        :param minimum: Ниже этого лимит не опускается.
+        :param maximum: Выше этого лимит не поднимается (обычно --concurrency).
+        :param window: Сколько завершённых запросов составляют одно окно наблюдения.
+        :param increase: На сколько поднимаем лимит после спокойного окна.
+        :param decrease: Во сколько раз уменьшаем лимит при перегрузке (0 < decrease < 1).
+        :param latency_factor: Во сколько раз p95 окна должен превысить базовый, чтобы считаться всплеском.
+        :param logger: Logger сканера для записи решений (или None).
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.maximum, max(self.minimum, initial))
+        self.window = max(1, window)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.logger = logger
+
+        self.baseline = None     # "нормальный" p95 задержки, секунд
+        self.increases = 0
+        self.decreases = 0
+
+        self._inflight = 0
+        self._samples = []       # задержки успешных запросов текущего окна
+        self._completed = 0      # запросов в текущем окне
+        self._cooldown = 0       # сколько ещё запросов игнорируем снижение
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Ждёт, пока число запросов "в полёте" станет меньше текущего лимита."""
+        with self._cond:
+            while self._inflight >= self.limit:
+                self._cond.wait()
+            self._inflight += 1
+
+    def release(self, elapsed=None, signal=None):
+        """
+        Освобождает слот и учитывает результат запроса.
+        :param elapsed: Время ответа сервера в секундах (None, если ответа не было).
+        :param signal: Причина для снижения ("timeout", "error", "HTTP 429", ...) или None.
+        """
+        with self._cond:
+            self._inflight -= 1
+            self._completed += 1
+            if self._cooldown > 0:
+                self._cooldown -= 1
+
+            if signal is not None:
+                self._back_off(signal)
+            else:
+                if elapsed is not None:
+                    self._samples.append(elapsed)
+                if self._completed >= self.window:
+                    self._close_window()
+            self._cond.notify_all()
+
+    def stats(self):
+        """Текущий лимит и счётчики решений."""
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "inflight": self._inflight,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "baseline_p95": round(self.baseline, 4) if self.baseline is not None else None
+            }
+
+    def _close_window(self):
+        # Окно закончилось без ошибок: смотрим на p95 задержки
+        samples = sorted(self._samples)
+        self._samples = []
+        self._completed = 0
+        if not samples:
+            return
+
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        if self.baseline is None:
+            self.baseline = p95
+
+        # Маленькие абсолютные колебания (миллисекунды) всплеском не считаем
+        if p95 > self.baseline * self.latency_factor and p95 - self.baseline > 0.05:
+            self._back_off(f"p95 latency {p95:.3f}s > {self.latency_factor:g}x baseline {self.baseline:.3f}s")
+            return
+
+        # Базовый уровень медленно следует за реальной задержкой
+        self.baseline = 0.8 * self.baseline + 0.2 * p95
+        if self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + self.increase)
+            self.increases += 1
+            self._log("debug", f"Adaptive concurrency: p95 {p95:.3f}s stable, limit raised to {self.limit}.")
+
+    def _back_off(self, reason):
+        # Начинаем новое окно в любом случае: старые замеры относятся к прежнему лимиту
+        self._samples = []
+        self._completed = 0
+        if self._cooldown > 0:
+            return
+
+        new_limit = max(self.minimum, int(self.limit * self.decrease))
+        self._cooldown = self.window
+        if new_limit == self.limit:
+            return
+        self.limit = new_limit
+        self.decreases += 1
+        self._log("info", f"Adaptive concurrency: {reason}, limit cut to {self.limit}.")
+
+    def _log(self, level, msg):
+        if self.logger is not None:
+            getattr(self.logger, level)(msg)
@@ -0,0 +1,231 @@
+# coding: utf-8
+"""
+Файл: connection_pool.py
+------------------------
+Назначение:
+Пул постоянных (keep-alive) HTTP/HTTPS-соединений для Requester.
+
+urllib.request.urlopen открывает новое TCP (и TLS) соединение на каждый запрос
+и сразу закрывает его. При сотнях пэйлоадов на каждый параметр большая часть
+времени скана уходит на рукопожатия. Пул держит открытые соединения по ключу
+(scheme, host, port) и отдаёт их повторно.
+
+Основные параметры:
+- max_per_host: сколько простаивающих соединений храним на один хост
+- idle_timeout: через сколько секунд простоя соединение считаем устаревшим и закрываем
+
+Статистика (stats()):
+- requests: сколько раз у пула брали соединение
+- reused: сколько раз отдали уже открытое соединение (сэкономленные рукопожатия)
+- created: сколько новых соединений пришлось открыть
+- hit_rate: доля reused от requests (в процентах)
+
+Пул потокобезопасен: все операции со словарём соединений идут под Lock.
+
+Фазы установки соединения:
+- Прямые соединения создаются классами TimedHTTPConnection/TimedHTTPSConnection,
+  которые при connect() отдельно замеряют DNS (getaddrinfo), TCP connect и
+  TLS-рукопожатие и кладут результат в conn.connect_timings. Requester забирает
+  эти замеры в фазы запроса.
+"""
+
+import http.client
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+
+class TimedHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTPConnection, который при установке соединения замеряет фазы:
+    connect_timings = {"dns", "connect", "tls"} (секунды, монотонные часы).
+    """
+    connect_timings = None
+
+    def connect(self):
+        start = time.perf_counter()
+        infos = socket.getaddrinfo(self.host, self.port, 0, socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+
+        # Как socket.create_connection: пробуем адреса по очереди
+        error = None
+        for family, socktype, proto, _, address in infos:
+            sock = socket.socket(family, socktype, proto)
+            try:
+                if self.timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+                    sock.settimeout(self.timeout)
+                if self.source_address:
+                    sock.bind(self.source_address)
+                sock.connect(address)
+                break
+            except OSError as e:
+                sock.close()
+                error = e
+        else:
+            raise error or OSError(f"getaddrinfo returned no addresses for {self.host}")
+
+        self.sock = sock
+        try:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+        connected = time.perf_counter()
+        self.connect_timings = {"dns": resolved - start, "connect": connected - resolved, "tls": 0.0}
+
+
+class TimedHTTPSConnection(TimedHTTPConnection):
+    """TimedHTTPConnection + TLS-рукопожатие (его длительность — в connect_timings["tls"])."""
+    default_port = http.client.HTTPS_PORT
+
+    def __init__(self, host, port=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, context=None):
+        super().__init__(host, port, timeout)
+        self._context = context or ssl.create_default_context()
+
+    def connect(self):
+        super().connect()
+        start = time.perf_counter()
+        self.sock = self._context.wrap_socket(self.sock, server_hostname=self.host)
+        self.connect_timings["tls"] = time.perf_counter() - start
+
+
+class ConnectionPool:
+    def __init__(self, max_per_host=10, idle_timeout=30.0, timeout=10.0):
+        """
+        :param max_per_host: Максимум простаивающих соединений на один хост.
+        :param idle_timeout: Время простоя (сек.), после которого соединение закрывается.
+        :param timeout: Таймаут сокета для новых соединений.
+        """
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        # key -> список (conn, last_used), последний элемент — самый "свежий"
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+        # Счётчики для отчёта о попаданиях в пул
+        self.requests = 0
+        self.reused = 0
+        self.created = 0
+
+    def acquire(self, scheme, host, port):
+        """
+        Возвращает (conn, reused):
+        conn — HTTPConnection/HTTPSConnection к нужному хосту,
+        reused — True, если соединение взято из пула (без нового рукопожатия).
+        """
+        key = (scheme, host, port)
+        now = time.monotonic()
+        expired = []
+        conn = None
+
+        with self._lock:
+            self.requests += 1
+            idle = self._idle.get(key, [])
+            while idle:
+                candidate, last_used = idle.pop()
+                if now - last_used > self.idle_timeout:
+                    expired.append(candidate)
+                    continue
+                conn = candidate
+                break
+            if conn is not None:
+                self.reused += 1
+            else:
+                self.created += 1
+
+        # Закрываем устаревшие соединения вне блокировки
+        for old in expired:
+            old.close()
+
+        if conn is not None:
+            return conn, True
+        return self._new_connection(scheme, host, port), False
+
+    def release(self, scheme, host, port, conn):
+        """
+        Возвращает соединение в пул. Если на хост уже хранится max_per_host
+        соединений, лишнее закрываем.
+        """
+        key = (scheme, host, port)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_per_host:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def discard(self, conn):
+        """Закрывает соединение, которое нельзя переиспользовать (ошибка, Connection: close)."""
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    def close_all(self):
+        """Закрывает все простаивающие соединения (например, в конце скана)."""
+        with self._lock:
+            idle_lists = list(self._idle.values())
+            self._idle = {}
+        for idle in idle_lists:
+            for conn, _ in idle:
+                self.discard(conn)
+
+    def stats(self):
+        """
+        Возвращает словарь со статистикой пула:
+        requests, reused, created, hit_rate (в процентах).
+        """
+        with self._lock:
+            requests = self.requests
+            reused = self.reused
+            created = self.created
+        hit_rate = (reused * 100.0 / requests) if requests else 0.0
+        return {
+            "requests": requests,
+            "reused": reused,
+            "created": created,
+            "hit_rate": round(hit_rate, 1)
+        }
+
+    def _new_connection(self, scheme, host, port):
+        """
+        Создаёт новое соединение. Учитываем прокси из переменных окружения
+        (http_proxy/https_proxy), как это делал urllib.request.urlopen.
+        """
+        proxy = self._proxy_for(scheme, host)
+        if proxy:
+            proxy_host, proxy_port = proxy
+            if scheme == "https":
+                # HTTPS через прокси — туннель CONNECT
+                conn = http.client.HTTPSConnection(
+                    proxy_host, proxy_port, timeout=self.timeout, context=self._ssl_context
+                )
+                conn.set_tunnel(host, port)
+            else:
+                conn = http.client.HTTPConnection(proxy_host, proxy_port, timeout=self.timeout)
+            # Помечаем, что запросы по http нужно слать с абсолютным URI
+            conn.via_proxy = scheme == "http"
+            return conn
+
+        if scheme == "https":
+            conn = TimedHTTPSConnection(host, port, timeout=self.timeout, context=self._ssl_context)
+        else:
+            conn = TimedHTTPConnection(host, port, timeout=self.timeout)
+        conn.via_proxy = False
+        return conn
+
+    def _proxy_for(self, scheme, host):
+        """Возвращает (proxy_host, proxy_port) или None, если прокси не задан/не нужен."""
+        proxies = urllib.request.getproxies()
+        proxy_url = proxies.get(scheme)
+        if not proxy_url or urllib.request.proxy_bypass(host):
+            return None
+        parsed = urllib.parse.urlsplit(proxy_url if "://" in proxy_url else "http://" + proxy_url)
+        if not parsed.hostname:
+            return None
+        return parsed.hostname, parsed.port or 8080
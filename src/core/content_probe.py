@@ -0,0 +1,127 @@
+# coding: utf-8
+"""
+Файл: content_probe.py
+----------------------
+Назначение:
+Краулер не скачивает то, что не является HTML.
+
+Раньше Crawler._fetch проверял Content-Type, когда ответ уже читался целиком:
+ссылки на PDF, картинки, архивы и видео скачивались (до --max-body-size)
+и выбрасывались. Теперь проверка дешевле:
+
+- ContentTypeFilter.skip(url) — до запроса, по расширению последнего
+  сегмента пути:
+  - расширения из NON_HTML_EXTENSIONS (картинки, медиа, архивы, документы,
+    шрифты, стили и скрипты) не запрашиваются вовсе;
+  - кэш по расширению: после min_samples ответов не-HTML (и ни одного HTML)
+    остальные URL с этим расширением тоже не запрашиваются
+    (/download.ashx?id=N). Для расширений страниц (DYNAMIC_EXTENSIONS — .php,
+    .aspx и т.п., а также URL без расширения) кэш не действует: один обработчик
+    отдаёт и HTML, и файлы;
+- HtmlOnlySink — sink для Requester.request: reset(content_type) возвращает
+  False для не-HTML ответа, и body_reader не читает его тело — это GET,
+  который останавливается после заголовков (один запрос вместо HEAD + GET,
+  и HEAD многие приложения обрабатывают не так, как GET).
+
+record(url, content_type) пополняет кэш; вызывается из потоков пула краулера.
+stats() — {"extension", "cached", "headers_only", "by_extension": [(расширение, n), ...]}.
+"""
+
+import posixpath
+import threading
+import urllib.parse
+from collections import Counter
+
+# Расширения, за которыми почти никогда не бывает HTML
+NON_HTML_EXTENSIONS = frozenset({
+    # картинки
+    "jpg", "jpeg", "png", "gif", "bmp", "webp", "svg", "ico", "tif", "tiff", "avif",
+    # аудио и видео
+    "mp3", "wav", "ogg", "flac", "m4a", "mp4", "m4v", "webm", "avi", "mov", "mkv", "wmv", "flv",
+    # архивы и бинарники
+    "zip", "gz", "tgz", "bz2", "xz", "7z", "rar", "tar", "iso", "dmg", "exe", "msi", "apk", "bin", "jar",
+    # документы
+    "pdf", "doc", "docx", "xls", "xlsx", "ppt", "pptx", "odt", "ods", "rtf", "epub",
+    # шрифты, стили, скрипты
+    "woff", "woff2", "ttf", "otf", "eot", "css", "js", "map"
+})
+
+# Расширения страниц: один обработчик может отдавать и HTML, и файлы
+DYNAMIC_EXTENSIONS = frozenset({
+    "", "html", "htm", "xhtml", "shtml", "php", "php3", "php5", "asp", "aspx", "jsp", "jspx",
+    "do", "action", "cgi", "pl", "py", "cfm"
+})
+
+
+def url_extension(url):
+    """Расширение последнего сегмента пути в нижнем регистре ("" — без расширения)."""
+    path = urllib.parse.urlsplit(url).path
+    return posixpath.splitext(path.rsplit(";", 1)[0])[1][1:].lower()
+
+
+def is_html(content_type):
+    return "text/html" in (content_type or "")
+
+
+class HtmlOnlySink:
+    """
+    Sink, который пропускает только HTML-ответы: тело не-HTML ответа не читается.
+    inner — получатель тела HTML-страницы (например, потоковый извлекатель ссылок) или None.
+    """
+
+    def __init__(self, inner=None):
+        self.inner = inner
+
+    def reset(self, content_type):
+        if self.inner is not None:
+            self.inner.reset(content_type)
+        return is_html(content_type)
+
+    def feed(self, data):
+        if self.inner is not None:
+            self.inner.feed(data)
+
+
+class ContentTypeFilter:
+    def __init__(self, min_samples=3):
+        """:param min_samples: После скольких не-HTML ответов (без HTML) расширение считается не-HTML."""
+        self.min_samples = min_samples
+        self._results = {}  # расширение -> [ответов HTML, ответов не-HTML]
+        self.skipped = Counter()  # "extension" / "cached" -> сколько URL не запрошено
+        self.headers_only = 0     # сколько не-HTML ответов прочитано только до заголовков
+        self._skipped_extensions = Counter()
+        self._lock = threading.Lock()
+
+    def skip(self, url):
+        """Причина не запрашивать url ("extension" или "cached") или None."""
+        extension = url_extension(url)
+        reason = None
+        with self._lock:
+            if extension in NON_HTML_EXTENSIONS:
+                reason = "extension"
+            elif extension not in DYNAMIC_EXTENSIONS:
+                html, other = self._results.get(extension, (0, 0))
+                if not html and other >= self.min_samples:
+                    reason = "cached"
+            if reason is not None:
+                self.skipped[reason] += 1
+                self._skipped_extensions[extension] += 1
+        return reason
+
+    def record(self, url, content_type, headers_only=False):
+        """Учитывает Content-Type ответа на url (headers_only — тело не читалось)."""
+        extension = url_extension(url)
+        with self._lock:
+            counts = self._results.setdefault(extension, [0, 0])
+            counts[0 if is_html(content_type) else 1] += 1
+            if headers_only:
+                self.headers_only += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "extension": self.skipped["extension"],
+                "cached": self.skipped["cached"],
+                "headers_only": self.headers_only,
+                "by_extension": self._skipped_extensions.most_common(5)
+            }
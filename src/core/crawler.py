@@ -1,88 +1,24 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import urllib.request
-import urllib.error
 import urllib.parse
 import logging
-import time
+import os
 import re
-from html.parser import HTMLParser
-from typing import Set, Optional, List, Dict
-from collections import deque
-
-
-class LinkAndFormExtractor(HTMLParser):
-    """
-    Парсер HTML, извлекающий:
-    1) Все ссылки (<a href="...">).
-    2) Формы (<form>) и их поля (<input>, <select>, <textarea> при желании).
-    """
+import threading
+import time
+from typing import Set, Optional, List, Dict, Iterator, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-    def __init__(self):
-        super().__init__()
-        self.links = []       # Ссылки, найденные в <a href="...">
-        self.forms = []       # Список форм, каждая — словарь с ключами: method, action, inputs, enctype
-        self._current_form = None  # Временное хранилище для данных о форме, пока не встретим следующий <form>
-
-    def handle_starttag(self, tag, attrs):
-        tag = tag.lower()
-
-        if tag == "a":
-            # Ищем href
-            for (attr, value) in attrs:
-                if attr.lower() == "href" and value:
-                    self.links.append(value)
-
-        elif tag == "form":
-            # Начало формы: создаём новую структуру
-            form_method = "get"
-            form_action = ""
-            form_enctype = ""   # <-- добавили ентайп
-
-            for (attr, value) in attrs:
-                attr_lower = attr.lower()
-                if attr_lower == "method" and value:
-                    form_method = value.lower()
-                elif attr_lower == "action" and value:
-                    form_action = value
-                elif attr_lower == "enctype" and value:
-                    form_enctype = value.lower()
-
-            self._current_form = {
-                "method": form_method,
-                "action": form_action,
-                "enctype": form_enctype,  # <-- сохраняем enctype
-                "inputs": []
-            }
-            self.forms.append(self._current_form)
-
-        elif tag == "input" and self._current_form is not None:
-            # Поле формы: name, type, value
-            input_name = ""
-            input_type = "text"
-            input_value = ""
-            for (attr, value) in attrs:
-                attr_lower = attr.lower()
-                if attr_lower == "name":
-                    input_name = value
-                elif attr_lower == "type" and value:
-                    input_type = value.lower()
-                elif attr_lower == "value":
-                    input_value = value
-
-            self._current_form["inputs"].append({
-                "name": input_name,
-                "type": input_type,
-                "value": input_value
-            })
-
-        # При желании можно обрабатывать <textarea>, <select> и т.д.
-
-    def handle_endtag(self, tag):
-        tag = tag.lower()
-        if tag == "form" and self._current_form is not None:
-            self._current_form = None
+from src.core.checkpoint import FoundUrlLog, found_urls_path, load_checkpoint, save_checkpoint
+from src.core.content_probe import HtmlOnlySink
+from src.core.form_index import FormIndex
+from src.core.frontier import MemoryFrontier
+from src.core.link_extractor import LinkAndFormExtractor, make_extractor
+from src.core.priority import SEED_SCORE
+from src.core.requester import Requester
+from src.core.simhash import simhash
+from src.core.visited import ExactVisitedSet
 
 
 class Crawler:
@@ -92,10 +28,121 @@ class Crawler:
     - depth: глубина обхода
     - scope_pattern: регекс для включения
     - exclude_pattern: регекс для исключения
-    - delay: задержка между запросами
+    - delay: минимальный интервал между запросами (для собственного Requester)
     - timeout: таймаут
     - user_agent: заголовок User-Agent
     - start_domain: выделяется из start_url, чтобы не уходить на другие домены
+    - requester: общий Requester сканера (пул соединений). Если не передан,
+      краулер создаёт собственный.
+
+    Если у requester есть хранилище артефактов (requester.artifacts), каждый
+    успешный ответ сохраняется туда вместе с заголовками — сканеры потом берут
+    тело страницы оттуда, не запрашивая её повторно.
+
+    Параллельный обход (workers > 1):
+    - страницы скачиваются и разбираются в пуле из workers потоков, главный
+      поток ведёт очередь (frontier) и множество visited;
+    - очередь отдаёт URL с наименьшей глубиной (см. frontier.py);
+    - URL глубины e отправляем в работу, только если все страницы "в полёте"
+      имеют глубину не меньше e - 1. Иначе незавершённая страница меньшей
+      глубины могла бы найти этот же URL "короче", и он получил бы лишнюю
+      глубину (а его ссылки — отсечены лимитом depth). Так множество найденных
+      URL и форм совпадает с последовательным BFS, отличается только порядок;
+    - частоту запросов по-прежнему ограничивает лимитер Requester.
+
+    Потоковый режим: crawl() — генератор, отдающий ("url", url) и ("form", form)
+    по мере обхода (так сканеры начинают работу, не дожидаясь конца обхода,
+    см. ScanPipeline); run() просто прогоняет его до конца.
+
+    Большие обходы (visited, frontier):
+    - visited — множество посещённых URL из visited.py; компактные варианты
+      (FingerprintSet, BloomVisitedSet) не хранят сами строки URL, поэтому
+      их нельзя перебрать — run() вернёт этот же объект, а URL приходят из crawl();
+    - frontier — очередь обхода из frontier.py (SQLiteFrontier держит её на диске);
+    - memory_stats() — сколько памяти занимает visited в расчёте на один URL.
+
+    Контрольные точки (checkpoint, checkpoint_interval, resume):
+    - каждые checkpoint_interval секунд и после stop() состояние обхода
+      сохраняется в файл checkpoint (см. checkpoint.py);
+    - resume=True продолжает обход из этого файла. URL, которые были "в полёте"
+      при сохранении, скачиваются заново; уже обработанные — не повторяются.
+      crawl() сначала отдаёт найденные ранее URL (из журнала checkpoint + ".urls" —
+      при любом режиме visited) и формы, чтобы сканеры проверили весь сайт;
+    - stop() (например, по SIGTERM) просит обход остановиться в ближайшей
+      согласованной точке и сохранить состояние.
+
+    Ловушки (traps — TrapDetector из url_traps.py):
+    - ссылки и action форм приводятся к каноническому виду (без параметров
+      сессии, параметры query отсортированы);
+    - перед постановкой в очередь ссылка проверяется traps.allow(): календари,
+      бесконечная пагинация и "растущие" пути не обходятся. При параллельном
+      обходе порядок находок другой, поэтому при срабатывании лимитов набор
+      принятых URL может немного отличаться от последовательного обхода.
+
+    Разбор HTML (html_parser — вариант из link_extractor.BACKENDS):
+    - "stream" (по умолчанию) и "lxml" разбирают страницу по кускам, пока
+      она скачивается (Requester.request(..., sink=...)); "selectolax" и
+      "html.parser" (прежний LinkAndFormExtractor) — после скачивания.
+
+    Формы (form_index — FormIndex из form_index.py):
+    - одна и та же форма из шаблона сайта (тот же метод, action и имена полей)
+      попадает в found_forms и отдаётся как ("form", form) один раз; число
+      страниц, где она встретилась, — form_index.page_count(form), первые из
+      них — form_index.pages(form). При параллельном обходе значения полей
+      берутся из первой скачанной копии.
+
+    Карты сайта (sitemaps — SitemapSeeder из sitemap.py):
+    - в начале обхода (не после --resume — эти URL уже в сохранённой очереди)
+      URL из robots.txt / sitemap.xml ставятся в очередь с глубиной depth:
+      лимит переходов по ссылкам на них не действует (их ограничивает бюджет
+      SitemapSeeder), страница скачивается и её формы собираются, но ссылки
+      с неё не обходятся;
+    - очередь отдаёт их после всех страниц меньшей глубины, так что URL,
+      найденные по ссылкам, не скачиваются повторно. С priority у них оценка
+      SEED_SCORE — ниже любой другой, иначе URL с параметрами из карты был бы
+      скачан раньше своей копии меньшей глубины и ссылки с него не обходились бы.
+
+    Не-HTML ресурсы (content_filter — ContentTypeFilter из content_probe.py):
+    - URL с расширением картинки, архива, документа и т.п. (или расширением,
+      которое уже несколько раз отдавало не HTML) не запрашивается — он
+      отдаётся как ("url", url), но страница не скачивается;
+    - остальные запрашиваются GET, который читает тело только у HTML-ответа
+      (HtmlOnlySink): у PDF или видео по ссылке без расширения скачиваются
+      одни заголовки. В requester.artifacts такой ответ попадает без тела
+      (truncated == "type").
+
+    Приоритет и бюджет (priority — UrlScorer из priority.py, max_pages):
+    - с priority каждый URL ставится в очередь с оценкой (параметры query,
+      новый шаблон URL, формы на родительской странице, глубина), и
+      PriorityFrontier отдаёт сначала самые "интересные" для сканеров URL;
+      порядок уже не BFS, поэтому URL может получить глубину длиннее
+      кратчайшей, и на границе depth набор URL может отличаться от BFS;
+    - max_pages — сколько страниц скачать. Когда бюджет исчерпан, обход
+      останавливается (budget_exhausted), оставшаяся очередь сохраняется
+      в контрольную точку. Скачанные страницы тоже сохраняются, и бюджет
+      после --resume общий с прошлыми запусками — чтобы продолжить, увеличьте
+      --max-pages.
+
+    Повторный обход (recrawl — RecrawlCache из recrawl_cache.py):
+    - страница, скачанная в прошлый раз, запрашивается условным GET
+      (If-None-Match / If-Modified-Since); на 304 берётся сохранённая страница;
+    - если тело не изменилось (304 или тот же хэш), ссылки и формы берутся
+      из кэша без разбора HTML, изменённые и новые страницы записываются в кэш.
+
+    Почти-дубликаты (near_duplicates — SimHashIndex из simhash.py):
+    - у каждой скачанной HTML-страницы считается SimHash (в потоке пула),
+      страница относится к кластеру в главном потоке;
+    - представитель кластера отдаётся как обычно, ("url", url), остальные
+      члены кластера — ("duplicate", (url, representative)): сканеры проверяют
+      один URL на кластер. Ссылки и формы дубликатов по-прежнему собираются —
+      они могут вести на уникальные страницы;
+    - при параллельном обходе представителем становится страница, скачанная
+      первой, поэтому он может отличаться от последовательного обхода.
+
+    Карта поверхности (surface — SurfaceMapWriter из surface_map.py, --crawl-only):
+    - каждое событие crawl() записывается в карту, у скачанных страниц
+      считается SimHash (как с near_duplicates) и записывается вместе с URL;
+      --scan-from потом сканирует карту без повторного обхода.
     """
 
     def __init__(self,
@@ -105,7 +152,24 @@ class Crawler:
                  exclude_pattern: Optional[str] = None,
                  delay: float = 0.0,
                  timeout: float = 10.0,
-                 user_agent: str = "WebVulnScanner/1.0"):
+                 user_agent: str = "WebVulnScanner/1.0",
+                 requester: Optional[Requester] = None,
+                 workers: int = 1,
+                 visited=None,
+                 frontier=None,
+                 checkpoint: Optional[str] = None,
+                 checkpoint_interval: float = 60.0,
+                 resume: bool = False,
+                 traps=None,
+                 near_duplicates=None,
+                 form_index=None,
+                 sitemaps=None,
+                 content_filter=None,
+                 priority=None,
+                 max_pages: int = 0,
+                 recrawl=None,
+                 surface=None,
+                 html_parser: str = "stream"):
 
         if not user_agent:
             user_agent = "WebVulnScanner/1.0"
@@ -117,83 +181,416 @@ class Crawler:
         self.timeout = timeout
         self.user_agent = user_agent
 
-        self.start_domain = urllib.parse.urlparse(self.start_url).netloc
-
-        self.queue = deque([(start_url, 0)])
-        self.visited = set()
+        # Частоту запросов ограничивает лимитер Requester (общий со сканерами)
+        self._own_requester = requester is None
+        self.requester = requester or Requester(timeout=timeout, delay=delay, user_agent=user_agent)
 
-        # Здесь будем хранить все формы, найденные во время обхода
-        self.found_forms = []
+        self.start_domain = urllib.parse.urlparse(self.start_url).netloc
+        # Сколько страниц скачиваем параллельно
+        self.workers = max(1, workers)
+
+        # Очередь обхода и множество посещённых URL (по умолчанию — в памяти,
+        # для больших сайтов — SQLiteFrontier и компактное множество из visited.py)
+        self.queue = frontier if frontier is not None else MemoryFrontier()
+        self.visited = visited if visited is not None else ExactVisitedSet()
+
+        # Формы без повторов (FormIndex из form_index.py); found_forms — их список
+        self.form_index = form_index if form_index is not None else FormIndex()
+        self.found_forms = self.form_index.forms
+
+        # Канонизация URL и отсечение ловушек (TrapDetector из url_traps.py) или None
+        self.traps = traps
+        # Кластеры почти одинаковых страниц (SimHashIndex из simhash.py) или None
+        self.near_duplicates = near_duplicates
+        # Затравка очереди из robots.txt / sitemap.xml (SitemapSeeder из sitemap.py) или None
+        self.sitemaps = sitemaps
+        self.seeded = 0
+        # Отсев не-HTML ресурсов до скачивания тела (ContentTypeFilter из content_probe.py) или None
+        self.content_filter = content_filter
+        # Чем разбираем HTML (ImportError сразу, если библиотека не установлена)
+        self.html_parser = html_parser
+        make_extractor(html_parser)
+
+        # Контрольные точки: URL, которые нужно скачать заново после --resume
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints_saved = 0
+        self.resumed = False
+        self.interrupted = False  # обход остановлен stop() до конца
+        self._redo = set()
+        self._stop_requested = threading.Event()
+        self._last_checkpoint = time.monotonic()
+        self._found_log = None  # журнал найденных URL для --resume (FoundUrlLog из checkpoint.py)
+
+        # Ссылки, формы и валидаторы страниц прошлого обхода (RecrawlCache из recrawl_cache.py) или None
+        self.recrawl = recrawl
+        # Приоритет URL в очереди (UrlScorer из priority.py, вместе с PriorityFrontier) или None
+        self.priority = priority
+        # Куда записать находки обхода для --scan-from (SurfaceMapWriter из surface_map.py) или None
+        self.surface = surface
+        # Сколько страниц скачать (0 — без ограничения)
+        self.max_pages = max_pages
+        self.pages_fetched = 0
+        self.budget_exhausted = False
+
+        # Очередь может остаться в файле от прошлого запуска — начинаем с чистой
+        self.queue.clear()
+        found_offset = None
+        if resume and checkpoint and os.path.exists(checkpoint):
+            state = load_checkpoint(checkpoint)
+            self._restore(state)
+            found_offset = state["found_offset"]
+        else:
+            self._enqueue(start_url, 0)
+        if checkpoint:
+            self._found_log = FoundUrlLog(found_urls_path(checkpoint), found_offset)
 
     def run(self) -> Set[str]:
         """
         Запускает процесс краулинга и возвращает множество всех найденных URL.
         Все найденные формы сохраняются в self.found_forms.
         """
-        logging.debug(f"Starting crawl from {self.start_url}")
+        for _ in self.crawl():
+            pass
+        return self.visited
 
-        while self.queue:
-            url, current_depth = self.queue.popleft()
-            if url in self.visited:
-                continue
-            self.visited.add(url)
+    def crawl(self) -> Iterator[Tuple[str, object]]:
+        """
+        Обходит сайт, отдавая находки по мере появления:
+        ("url", url) — URL из итогового множества (после скачивания страницы),
+        ("form", form) — форма со страницы,
+        ("duplicate", (url, representative)) — почти-дубликат уже найденной
+        страницы (только с near_duplicates).
+        По окончании self.visited и self.found_forms заполнены, как после run().
+        """
+        for kind, item in self._crawl():
+            if self.surface is not None:
+                self.surface.add(kind, item)
+            yield kind, item
 
-            if not self._check_url_scope(url):
-                logging.debug(f"Skipping {url}, not in domain/scope/exclude.")
-                continue
+    def _crawl(self):
+        logging.debug(f"Starting crawl from {self.start_url}")
 
-            logging.debug(f"Crawling {url} at depth {current_depth}")
+        if self.resumed:
+            # Находки прошлых запусков: сканеры должны увидеть и их
+            for url in self._found_log.resumed_urls():
+                yield self._url_event(url)
+            for form in self.found_forms:
+                yield "form", form
+
+        if self.sitemaps is not None and not self.resumed:
+            self._seed_from_sitemaps()
+
+        if self.workers > 1:
+            yield from self._crawl_concurrent()
+        else:
+            while self.queue and not self._budget_spent():
+                if self._checkpoint_due():
+                    self.save_checkpoint()
+                    if self._stop_requested.is_set():
+                        self.interrupted = True
+                        break
+                url, current_depth = self.queue.pop()
+                if self._seen(url):
+                    continue
+                page = None
+                if self._visit(url, current_depth):
+                    self.pages_fetched += 1
+                    page = self._crawl_page(url)
+                yield self._found(url, page)
+                yield from self._handle_page(url, page, current_depth)
+
+        self.budget_exhausted = self._budget_spent() and len(self.queue) > 0
+        if self.checkpoint and not self.interrupted:
+            # Обход завершён — сохраняем итог (пустая очередь): --resume ничего не повторит
+            self.save_checkpoint()
+        if self._found_log is not None:
+            self._found_log.close()
+
+        if self._own_requester:
+            self.requester.close()
 
-            if self.delay > 0:
-                time.sleep(self.delay)
+        logging.debug(f"Crawl finished. Found {len(self.visited)} URLs total.")
+        logging.debug(f"Found {len(self.found_forms)} forms total.")
 
-            html_content = self._fetch(url)
-            if html_content is None:
-                continue
+    def _crawl_concurrent(self):
+        """BFS с workers потоками (см. описание класса)."""
+        in_flight = {}  # future -> (url, depth)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while self.queue or in_flight:
+                if self._budget_spent() and not in_flight:
+                    break
+                if self._checkpoint_due():
+                    self.save_checkpoint(list(in_flight.values()))
+                    if self._stop_requested.is_set():
+                        # Незавершённые страницы попали в контрольную точку как redo
+                        self.interrupted = True
+                        break
+
+                while len(in_flight) < self.workers and not self._budget_spent():
+                    max_depth = min(d for _, d in in_flight.values()) + 1 if in_flight else None
+                    item = self.queue.pop(max_depth)
+                    if item is None:
+                        break
+                    url, current_depth = item
+                    if self._seen(url):
+                        continue
+                    if self._visit(url, current_depth):
+                        self.pages_fetched += 1
+                        in_flight[executor.submit(self._crawl_page, url)] = (url, current_depth)
+                    else:
+                        yield self._found(url)
+
+                if not in_flight:
+                    continue
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, current_depth = in_flight.pop(future)
+                    page = future.result()
+                    yield self._found(url, page)
+                    yield from self._handle_page(url, page, current_depth)
+
+    def stop(self):
+        """
+        Просит обход остановиться в ближайшей согласованной точке (можно звать
+        из обработчика сигнала). Если задан checkpoint, состояние будет сохранено.
+        """
+        self._stop_requested.set()
 
-            # Извлекаем ссылки и формы
-            found_links, found_forms = self._extract_links_and_forms(html_content, url)
-            self.found_forms.extend(found_forms)
+    def save_checkpoint(self, in_flight=()):
+        """
+        Сохраняет состояние обхода в self.checkpoint.
+        :param in_flight: [(url, depth)] страниц, обработка которых не закончена —
+                          после --resume они будут скачаны заново.
+        """
+        self._last_checkpoint = time.monotonic()
+        if not self.checkpoint:
+            return
+        in_flight = list(in_flight)
+        redo = self._redo | {url for url, _ in in_flight}
+        # Незавершённые страницы — в начало очереди (они не глубже остальных)
+        pending = sorted(in_flight, key=lambda item: item[1]) + self.queue.items()
+        size = save_checkpoint(self.checkpoint, {
+            "start_url": self.start_url,
+            "depth": self.depth,
+            "frontier": pending,
+            "redo": sorted(redo),
+            "visited": self.visited,
+            "forms": self.form_index,
+            "traps": self.traps,
+            "near_duplicates": self.near_duplicates,
+            "pages_fetched": self.pages_fetched,
+            "found_offset": self._found_log.offset()
+        })
+        self.checkpoints_saved += 1
+        logging.debug(f"Checkpoint saved to {self.checkpoint}: {len(self.visited)} visited, "
+                      f"{len(pending)} pending, {size} bytes.")
+
+    def memory_stats(self) -> Dict:
+        """
+        Память структур обхода: {"urls", "visited_bytes", "bytes_per_url", "frontier"},
+        где frontier — queue.stats() (backend, pending, peak, disk_bytes).
+        """
+        urls = len(self.visited)
+        visited_bytes = self.visited.memory_bytes()
+        return {
+            "urls": urls,
+            "visited_bytes": visited_bytes,
+            "bytes_per_url": round(visited_bytes / urls, 1) if urls else 0.0,
+            "frontier": self.queue.stats()
+        }
+
+    def _restore(self, state: Dict):
+        """Восстанавливает состояние из контрольной точки (см. checkpoint.py)."""
+        if state["start_url"] != self.start_url:
+            raise ValueError(f"Checkpoint was made for {state['start_url']}, not {self.start_url}")
+        self.visited = state["visited"]
+        self.form_index = state["forms"]
+        self.found_forms = self.form_index.forms
+        self._redo = set(state["redo"])
+        self.pages_fetched = state["pages_fetched"]
+        if state.get("traps") is not None and self.traps is not None:
+            self.traps = state["traps"]
+        if state.get("near_duplicates") is not None and self.near_duplicates is not None:
+            self.near_duplicates = state["near_duplicates"]
+        for item in state["frontier"]:
+            # (url, depth) или (url, depth, score) из PriorityFrontier
+            self.queue.push(*item)
+        self.resumed = True
+        logging.debug(f"Resuming crawl: {len(self.visited)} visited, {len(self.queue)} pending, "
+                      f"{len(self._redo)} to re-fetch.")
+
+    def _seed_from_sitemaps(self):
+        """Ставит в очередь URL из карт сайта (глубина depth — ссылки с них не обходятся)."""
+        queued = set()
+        for url in self.sitemaps.urls(self.requester, self.start_url):
+            url = self._normalize_url(url)
+            if not url or url in queued or url == self.start_url or not self._check_url_scope(url):
+                continue
+            queued.add(url)
+            self._enqueue(url, self.depth, seed=True)
+        self.seeded = len(queued)
+        logging.debug(f"Seeded {self.seeded} URLs from sitemaps.")
+
+    def _budget_spent(self) -> bool:
+        return bool(self.max_pages) and self.pages_fetched >= self.max_pages
+
+    def _enqueue(self, url: str, depth: int, parent_has_forms: bool = False, seed: bool = False):
+        if self.priority is None:
+            self.queue.push(url, depth)
+        elif seed:
+            # URL из карты сайта — после всех найденных по ссылкам, и шаблон он не "занимает"
+            self.queue.push(url, depth, SEED_SCORE)
+        else:
+            self.queue.push(url, depth, self.priority.score(url, depth, parent_has_forms))
+
+    def _checkpoint_due(self) -> bool:
+        if self._stop_requested.is_set():
+            return True
+        return bool(self.checkpoint) and time.monotonic() - self._last_checkpoint >= self.checkpoint_interval
+
+    def _seen(self, url: str) -> bool:
+        """URL уже обработан (и не ждёт повторного скачивания после --resume)."""
+        return url in self.visited and url not in self._redo
+
+    def _visit(self, url: str, current_depth: int) -> bool:
+        """Отмечает URL посещённым. False — URL вне области обхода (страницу не скачиваем)."""
+        self.visited.add(url)
+        self._redo.discard(url)
+
+        if not self._check_url_scope(url):
+            logging.debug(f"Skipping {url}, not in domain/scope/exclude.")
+            return False
 
-            if current_depth < self.depth:
-                for link in found_links:
-                    if link not in self.visited:
-                        self.queue.append((link, current_depth + 1))
+        if self.content_filter is not None and self.content_filter.skip(url):
+            logging.debug(f"Skipping {url}, not HTML judging by its extension.")
+            return False
 
-        logging.debug(f"Crawl finished. Found {len(self.visited)} URLs total.")
-        logging.debug(f"Found {len(self.found_forms)} forms total.")
+        logging.debug(f"Crawling {url} at depth {current_depth}")
+        return True
 
-        return self.visited
+    def _crawl_page(self, url: str):
+        """
+        Скачивает и разбирает страницу: (ссылки, формы, SimHash или None) или None.
+        Вызывается и из потоков пула.
+        """
+        parser = make_extractor(self.html_parser)
+        streaming = not isinstance(parser, LinkAndFormExtractor)
+        sink = parser if streaming else None
+        if self.content_filter is not None:
+            sink = HtmlOnlySink(sink)
+        previous = self.recrawl.get(url) if self.recrawl is not None else None
+        response = self._fetch(url, sink, previous)
+        if response is None:
+            return None
+        if previous is not None and self.recrawl.unchanged(previous, response):
+            # Страница не изменилась с прошлого обхода — разбор не нужен
+            links, forms = previous["links"], previous["forms"]
+        else:
+            if streaming:
+                # Куски уже разобраны по мере чтения; тело целиком — только если их не было
+                parser.finish(response.body)
+            else:
+                parser.feed(response.text)
+                parser.close()
+            links, forms = parser.links, parser.forms
+            if self.recrawl is not None:
+                self.recrawl.put(url, response, links, forms, previous)
+        found_links, found_forms = self._extract_links_and_forms(links, forms, url)
+        need_fingerprint = self.near_duplicates is not None or self.surface is not None
+        fingerprint = simhash(response.text) if need_fingerprint else None
+        return found_links, found_forms, fingerprint
+
+    def _found(self, url: str, page=None):
+        """Событие обработанного URL; URL записывается в журнал для --resume."""
+        if self._found_log is not None:
+            self._found_log.add(url)
+        return self._url_event(url, page)
+
+    def _url_event(self, url: str, page=None):
+        """("url", url) или ("duplicate", (url, representative)) для почти-дубликата."""
+        if self.surface is not None and page is not None:
+            self.surface.fingerprint(url, page[2])
+        if self.near_duplicates is None:
+            return "url", url
+        if page is not None and page[2] is not None:
+            representative = self.near_duplicates.add(url, page[2])
+        else:
+            # Страница без тела или найдена до --resume
+            representative = self.near_duplicates.duplicates.get(url, url)
+        if representative != url:
+            return "duplicate", (url, representative)
+        return "url", url
+
+    def _handle_page(self, url: str, page, current_depth: int):
+        """
+        Сохраняет формы разобранной страницы url и отдаёт ("form", form) для
+        каждой новой, ссылки следующего уровня ставит в self.queue.
+        """
+        if page is None:
+            return
+        found_links, found_forms, _ = page
+        for form in found_forms:
+            if self.form_index.add(form, url):
+                yield "form", form
+
+        if current_depth >= self.depth:
+            return
+        for link in found_links:
+            if link in self.visited:
+                continue
+            if self.traps is not None and not self.traps.allow(link):
+                logging.debug(f"Skipping {link}, looks like a crawler trap.")
+                continue
+            self._enqueue(link, current_depth + 1, bool(found_forms))
 
-    def _fetch(self, url: str) -> Optional[str]:
+    def _fetch(self, url: str, sink=None, previous=None):
         """
-        Выполняет GET-запрос и возвращает текст страницы или None при ошибке.
+        Выполняет GET-запрос и возвращает Response HTML-страницы или None
+        (ошибка или не HTML). sink получает куски тела по мере чтения.
+        previous — запись recrawl прошлого обхода: запрос становится условным,
+        и на 304 возвращается сохранённая страница.
+        Успешный ответ (любого типа) сохраняется в requester.artifacts, если оно есть.
         """
-        req = urllib.request.Request(url, headers={"User-Agent": self.user_agent})
-        try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                if "text/html" in response.getheader("Content-Type", ""):
-                    return response.read().decode("utf-8", errors="replace")
-                else:
-                    logging.debug(f"Skipping {url}, not HTML content.")
-                    return None
-        except (urllib.error.URLError, ValueError) as e:
-            logging.debug(f"Failed to fetch {url}: {e}")
+        # Кэш проб краулеру не нужен: каждую страницу он запрашивает один раз,
+        # а для повторного чтения есть хранилище артефактов
+        headers = self.recrawl.conditional_headers(previous) if previous is not None else None
+        response = self.requester.request("GET", url, module="crawler", use_cache=False, sink=sink,
+                                          headers=headers)
+        if response is not None and response.status == 304 and previous is not None:
+            response = self.recrawl.stored_response(previous, response.elapsed)
+        if response is None or not response.ok:
+            logging.debug(f"Failed to fetch {url}")
             return None
 
-    def _extract_links_and_forms(self, html_content: str, base_url: str):
-        parser = LinkAndFormExtractor()
-        parser.feed(html_content)
+        artifacts = getattr(self.requester, "artifacts", None)
+        if artifacts is not None:
+            artifacts.put(url, response)
+
+        content_type = response.headers.get("Content-Type", "")
+        if self.content_filter is not None:
+            self.content_filter.record(url, content_type, headers_only=response.truncated == "type")
+        if "text/html" in content_type:
+            return response
+        logging.debug(f"Skipping {url}, not HTML content.")
+        return None
 
+    def _extract_links_and_forms(self, links, forms, base_url: str):
+        """
+        Абсолютные ссылки (без повторов, отсортированы) и формы в области обхода
+        из результата разбора страницы. Порядок ссылок не зависит от хэшей строк:
+        от него зависят порядок в очереди и бонус за новый шаблон URL у priority.
+        """
         found_links = set()
-        for link in parser.links:
+        for link in links:
             full_link = urllib.parse.urljoin(base_url, link)
             full_link = self._normalize_url(full_link)
             if full_link and self._check_url_scope(full_link):
                 found_links.add(full_link)
 
         found_forms = []
-        for form in parser.forms:
+        for form in forms:
             action_abs = urllib.parse.urljoin(base_url, form["action"])
             action_abs = self._normalize_url(action_abs)
             if action_abs and self._check_url_scope(action_abs):
@@ -205,7 +602,7 @@ class Crawler:
                 }
                 found_forms.append(new_form)
 
-        return found_links, found_forms
+        return sorted(found_links), found_forms
 
     def _check_url_scope(self, url: str) -> bool:
         parsed = urllib.parse.urlparse(url)
@@ -225,6 +622,9 @@ class Crawler:
         if not parsed.scheme or not parsed.netloc:
             return None
         # Удаляем фрагмент
-        return urllib.parse.urlunparse(
+        url = urllib.parse.urlunparse(
             (parsed.scheme, parsed.netloc, parsed.path, parsed.params, parsed.query, "")
         )
+        if self.traps is not None:
+            url = self.traps.canonicalize(url)
+        return url
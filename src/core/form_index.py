@@ -0,0 +1,91 @@
+# coding: utf-8
+"""
+Файл: form_index.py
+-------------------
+Назначение:
+Индекс форм, найденных при обходе, без повторов.
+
+Форма входа или поиска из шаблона сайта есть на каждой странице. Раньше
+Crawler.found_forms получал по копии с каждой страницы, и каждый сканер форм
+атаковал один и тот же обработчик сотни раз. FormIndex хранит форму один раз:
+- ключ — form_signature(form): метод, абсолютный action и отсортированные
+  имена полей. Значения полей в ключ не входят (скрытый CSRF-токен меняется
+  от страницы к странице, а обработчик тот же) — сканеры берут значения
+  из первой найденной копии;
+- для каждой формы считается, на скольких страницах она встретилась
+  (page_count(form)), и запоминаются первые MAX_SAMPLE_PAGES из них
+  (pages(form)), — чтобы в отчёте было видно, откуда форма. Все страницы
+  не храним: форма поиска из шаблона есть на каждой странице сайта.
+
+dedupe=False — прежнее поведение (--no-form-dedup): каждая копия формы
+считается новой.
+Все методы вызываются из одного потока обхода.
+"""
+
+# Сколько страниц с формой запоминать для отчёта
+MAX_SAMPLE_PAGES = 5
+
+
+def form_signature(form):
+    """Ключ формы: (METHOD, action, (имена полей по алфавиту))."""
+    names = sorted({field["name"] or "" for field in form["inputs"]})
+    return form["method"].upper(), form["action"], tuple(names)
+
+
+class FormIndex:
+    def __init__(self, dedupe=True):
+        """:param dedupe: False — не объединять одинаковые формы (каждая копия — новая форма)."""
+        self.dedupe = dedupe
+        self.forms = []        # уникальные формы в порядке обнаружения
+        self._positions = {}   # сигнатура -> номер формы в self.forms
+        self._pages = []       # номер формы -> [страниц всего, последняя страница, [первые страницы]]
+        self.occurrences = 0   # сколько копий форм пришло всего
+
+    def __len__(self):
+        return len(self.forms)
+
+    def add(self, form, page=None):
+        """
+        Учитывает форму со страницы page. True — форма новая (её нужно
+        сканировать), False — такая форма уже есть, запомнена только страница.
+        """
+        self.occurrences += 1
+        signature = form_signature(form)
+        position = self._positions.get(signature) if self.dedupe else None
+        if position is not None:
+            self._add_page(self._pages[position], page)
+            return False
+        self._positions.setdefault(signature, len(self.forms))
+        self.forms.append(form)
+        self._pages.append([0, None, []])
+        self._add_page(self._pages[-1], page)
+        return True
+
+    def pages(self, form):
+        """Первые (до MAX_SAMPLE_PAGES) URL страниц, на которых встретилась форма."""
+        position = self._positions.get(form_signature(form))
+        return list(self._pages[position][2]) if position is not None else []
+
+    def page_count(self, form):
+        """На скольких страницах встретилась форма (с такой же сигнатурой)."""
+        position = self._positions.get(form_signature(form))
+        return self._pages[position][0] if position is not None else 0
+
+    def stats(self):
+        """{"forms" (уникальных), "occurrences" (копий со всех страниц), "duplicates"}"""
+        return {
+            "forms": len(self.forms),
+            "occurrences": self.occurrences,
+            "duplicates": self.occurrences - len(self.forms)
+        }
+
+    @staticmethod
+    def _add_page(entry, page):
+        # Формы страницы приходят подряд (страницы разбираются по одной),
+        # поэтому повтор формы на той же странице — это всегда последняя страница
+        if page is None or page == entry[1]:
+            return
+        entry[0] += 1
+        entry[1] = page
+        if len(entry[2]) < MAX_SAMPLE_PAGES:
+            entry[2].append(page)
@@ -0,0 +1,231 @@
+# coding: utf-8
+"""
+Файл: frontier.py
+-----------------
+Назначение:
+Очередь обхода краулера (frontier): URL, которые найдены, но ещё не скачаны.
+
+MemoryFrontier и SQLiteFrontier отдают URL в порядке BFS: сначала наименьшая
+глубина, внутри глубины — в порядке добавления. Интерфейс:
+- push(url, depth, score=0.0) — score учитывает только PriorityFrontier
+- pop(max_depth=None) -> (url, depth) или None (пусто или все URL глубже max_depth)
+- len(), stats(), close()
+- items() -> [(url, depth), ...] в порядке выдачи и clear() — для контрольных точек
+  (у PriorityFrontier — [(url, depth, score), ...]: push(*item) восстанавливает очередь)
+
+MemoryFrontier — словарь depth -> deque, как раньше, всё в памяти.
+SQLiteFrontier — очередь в SQLite-файле: в памяти держится только кэш страниц
+SQLite (cache_kib), поэтому обход в миллионы URL не упирается в RAM.
+Добавления копятся пачкой (до write_batch) и пишутся одним executemany;
+чтение идёт пачками по read_batch URL наименьшей глубины, удаления прочитанных
+строк тоже пишутся пачкой. Если добавлен URL меньшей глубины, чем в прочитанной
+пачке, пачка сбрасывается и перечитывается — порядок BFS не нарушается.
+Без path файл создаётся во временном каталоге и удаляется при close().
+
+PriorityFrontier — очередь в памяти по убыванию score (см. priority.py),
+при равном score — в порядке добавления. pop(max_depth) выбирает лучший URL
+среди URL не глубже max_depth (куча на каждую глубину).
+"""
+
+import heapq
+import itertools
+import os
+import sqlite3
+import tempfile
+from collections import deque
+
+
+class MemoryFrontier:
+    def __init__(self):
+        self._levels = {}  # depth -> deque URL
+        self._count = 0
+        self.peak = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, url, depth, score=0.0):
+        self._levels.setdefault(depth, deque()).append(url)
+        self._count += 1
+        self.peak = max(self.peak, self._count)
+
+    def pop(self, max_depth=None):
+        if not self._levels:
+            return None
+        depth = min(self._levels)
+        if max_depth is not None and depth > max_depth:
+            return None
+        level = self._levels[depth]
+        url = level.popleft()
+        if not level:
+            del self._levels[depth]
+        self._count -= 1
+        return url, depth
+
+    def items(self):
+        return [(url, depth) for depth in sorted(self._levels) for url in self._levels[depth]]
+
+    def clear(self):
+        self._levels = {}
+        self._count = 0
+
+    def stats(self):
+        return {"backend": "memory", "pending": self._count, "peak": self.peak, "disk_bytes": 0}
+
+    def close(self):
+        self.clear()
+
+
+class SQLiteFrontier:
+    def __init__(self, path=None, cache_kib=8192, write_batch=1000, read_batch=1000):
+        """
+        :param path: Файл очереди (None — временный файл, удаляется при close()).
+        :param cache_kib: Размер кэша страниц SQLite (предел памяти очереди), КиБ.
+        :param write_batch: Сколько добавлений копим перед записью в файл.
+        :param read_batch: Сколько URL читаем из файла за раз.
+        """
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="webscanner-frontier-", suffix=".sqlite")
+            os.close(fd)
+        self.path = path
+        self.write_batch = max(1, write_batch)
+        self.read_batch = max(1, read_batch)
+
+        # Краулер может работать в отдельном потоке (ScanPipeline) — но всегда в одном
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute(f"PRAGMA cache_size=-{int(cache_kib)}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS frontier ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, depth INTEGER NOT NULL, url TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS frontier_order ON frontier (depth, id)")
+
+        self._pending = []
+        self._buffer = deque()  # прочитанные (id, url, depth) одной глубины
+        self._deleted = []      # id отданных URL, ещё не удалённых из файла
+        self._count = self._db.execute("SELECT COUNT(*) FROM frontier").fetchone()[0]
+        self.peak = self._count
+
+    def __len__(self):
+        return self._count
+
+    def push(self, url, depth, score=0.0):
+        if self._buffer and depth < self._buffer[0][2]:
+            # Прочитанная пачка больше не самая "мелкая" — перечитаем
+            self._buffer.clear()
+        self._pending.append((depth, url))
+        self._count += 1
+        self.peak = max(self.peak, self._count)
+        if len(self._pending) >= self.write_batch:
+            self._flush()
+
+    def pop(self, max_depth=None):
+        if not self._count:
+            return None
+        if not self._buffer:
+            self._flush()
+            self._buffer.extend(self._db.execute(
+                "SELECT id, url, depth FROM frontier WHERE depth = (SELECT MIN(depth) FROM frontier) "
+                "ORDER BY id LIMIT ?", (self.read_batch,)
+            ))
+        if not self._buffer:
+            return None
+        row_id, url, depth = self._buffer[0]
+        if max_depth is not None and depth > max_depth:
+            return None
+        self._buffer.popleft()
+        self._deleted.append((row_id,))
+        self._count -= 1
+        return url, depth
+
+    def items(self):
+        self._flush()
+        return self._db.execute("SELECT url, depth FROM frontier ORDER BY depth, id").fetchall()
+
+    def clear(self):
+        self._pending = []
+        self._deleted = []
+        self._buffer.clear()
+        self._db.execute("DELETE FROM frontier")
+        self._count = 0
+
+    def stats(self):
+        self._flush()
+        return {
+            "backend": "sqlite",
+            "pending": self._count,
+            "peak": self.peak,
+            "disk_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        }
+
+    def close(self):
+        if self._db is None:
+            return
+        self._flush()
+        self._db.close()
+        self._db = None
+        if self._temporary:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _flush(self):
+        if not self._deleted and not self._pending:
+            return
+        # Одна транзакция на пачку, иначе SQLite фиксирует каждую строку отдельно
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("DELETE FROM frontier WHERE id = ?", self._deleted)
+            self._db.executemany("INSERT INTO frontier (depth, url) VALUES (?, ?)", self._pending)
+        self._deleted = []
+        self._pending = []
+
+
+class PriorityFrontier:
+    def __init__(self):
+        self._levels = {}  # depth -> куча (-score, номер добавления, url)
+        self._counter = itertools.count()
+        self._count = 0
+        self.peak = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, url, depth, score=0.0):
+        heapq.heappush(self._levels.setdefault(depth, []), (-score, next(self._counter), url))
+        self._count += 1
+        self.peak = max(self.peak, self._count)
+
+    def pop(self, max_depth=None):
+        best = None
+        for depth, heap in self._levels.items():
+            if max_depth is not None and depth > max_depth:
+                continue
+            if best is None or heap[0] < self._levels[best][0]:
+                best = depth
+        if best is None:
+            return None
+        heap = self._levels[best]
+        _, _, url = heapq.heappop(heap)
+        if not heap:
+            del self._levels[best]
+        self._count -= 1
+        return url, best
+
+    def items(self):
+        entries = sorted((entry, depth) for depth, heap in self._levels.items() for entry in heap)
+        return [(url, depth, -negative_score) for (negative_score, _, url), depth in entries]
+
+    def clear(self):
+        self._levels = {}
+        self._count = 0
+
+    def stats(self):
+        return {"backend": "priority", "pending": self._count, "peak": self.peak, "disk_bytes": 0}
+
+    def close(self):
+        self.clear()
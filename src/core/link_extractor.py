@@ -0,0 +1,493 @@
+# coding: utf-8
+"""
+Файл: link_extractor.py
+-----------------------
+Назначение:
+Извлечение ссылок и форм из HTML для краулера.
+
+LinkAndFormExtractor (html.parser.HTMLParser) — эталон: разбирает каждый тег
+и весь текст страницы на чистом Python и видит страницу только после того,
+как тело скачано и декодировано целиком. В профилях обхода он был на первом
+месте. Здесь же — более быстрые варианты с тем же результатом (links, forms):
+
+- StreamingLinkExtractor ("stream", по умолчанию): токенизатор, повторяющий
+  правила HTMLParser (те же регулярные выражения для тегов, комментариев,
+  <script>/<style>), но подробно разбирающий только <a>, <form>, <input>
+  и </form>. Текст между тегами пропускается через str.find("<"), для
+  остальных тегов ищется только их конец. Байты подаются кусками по мере
+  чтения тела (Requester.request(..., sink=extractor)), так что разбор идёт
+  параллельно со скачиванием, а не после него;
+- LxmlLinkExtractor ("lxml") — lxml.etree.HTMLPullParser, тоже потоковый;
+- SelectolaxLinkExtractor ("selectolax") — lexbor/modest из selectolax,
+  разбирает страницу целиком в finish().
+
+lxml и selectolax — необязательные зависимости. Они строят дерево по своим
+правилам восстановления HTML, поэтому на "битой" разметке (вложенные формы,
+повторяющиеся атрибуты, <form> внутри <table>) их результат может отличаться
+от эталона — сравнить на своих страницах можно бенчмарком
+(python -m benchmarks.link_extractors). Эталон — feed() всего тела и close():
+незаконченные в конце тела теги и комментарии HTMLParser закрывает на
+ближайшем ">" и разбирает дальше. "stream" совпадает с эталоном,
+кроме случаев, когда HTMLParser падает с AssertionError (неизвестная
+секция <![...]>), — такую секцию он пропускает как комментарий.
+
+Интерфейс потокового извлечения (sink для body_reader.read_body):
+- reset(content_type) — начало очередного ответа (редиректы и повторы
+  начинают тело заново); не-HTML ответы не разбираются;
+- feed(data) — очередной кусок распакованного тела (bytes);
+- finish(body) — итоговое тело ответа. Если поданные куски с ним не совпали
+  (ответ из кассеты, без потокового чтения), тело разбирается заново целиком.
+После finish() результат — в .links и .forms.
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser, unescape
+
+try:
+    from lxml import etree
+except ImportError:  # lxml — необязательная зависимость
+    etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:  # selectolax — необязательная зависимость
+        SelectolaxParser = None
+
+BACKENDS = ("stream", "lxml", "selectolax", "html.parser")
+
+# Регулярные выражения HTMLParser (html/parser.py, _markupbase.py)
+_TAG_NAME = re.compile(r"[a-zA-Z][^\t\n\r\f />\x00]*")
+_TAG_NAME_TOLERANT = re.compile(r"([a-zA-Z][^\t\n\r\f />\x00]*)(?:\s|/(?!>))*")
+_ATTR = re.compile(
+    r'((?<=[\'"\s/])[^\s/>][^\s/=>]*)(\s*=+\s*'
+    r'(\'[^\']*\'|"[^"]*"|(?![\'"])[^>\s]*))?(?:\s|/(?!>))*')
+_LOCATE_TAG_END = re.compile(r"""
+  <[a-zA-Z][^\t\n\r\f />\x00]*
+  (?:[\s/]*
+    (?:(?<=['"\s/])[^\s/>][^\s/=>]*
+      (?:\s*=+\s*
+        (?:'[^']*'
+          |"[^"]*"
+          |(?!['"])[^>\s]*
+         )
+        \s*
+       )?(?:\s|/(?!>))*
+     )*
+   )?
+  \s*
+""", re.VERBOSE)
+_END_TAG = re.compile(r"</\s*([a-zA-Z][-.a-zA-Z0-9:_]*)\s*>")
+_COMMENT_END = re.compile(r"--\s*>")
+_DECL_NAME = re.compile(r"[a-zA-Z][-_.a-zA-Z0-9]*\s*")
+_MARKED_SECTION_END = re.compile(r"]\s*]\s*>")
+_MS_MARKED_SECTION_END = re.compile(r"]\s*>")
+
+# Тег без кавычек и \x00 до первого ">": его конец — этот ">" (как у _LOCATE_TAG_END)
+_PLAIN_TAG_REST = re.compile(r"[^\"'\x00>]*>")
+
+# Одним вызовом пропускаем то, что на результат не влияет: текст, теги,
+# кроме _PARSED_TAGS (без кавычек или с обычными name="value" атрибутами),
+# закрывающие теги, кроме </form>, и комментарии. Остальное (и всё
+# незаконченное) разбирает _goahead по правилам HTMLParser
+_SKIP = re.compile(r"""(?:
+    [^<]+
+  | <(?!(?i:a|form|input|script|style)[\t\n\r\f\ />\x00])[a-zA-Z][^\t\n\r\f\ />\x00]*[^"'\x00>]*>
+  | <(?!(?i:a|form|input|script|style)[\t\n\r\f\ />\x00])[a-zA-Z][^\t\n\r\f\ />\x00]*
+    (?:\s+[a-zA-Z_:][-a-zA-Z0-9_:.]*(?:="[^"]*"|='[^']*'|=[^\s"'>]+)?)*\s*/?>
+  | </(?!\s*(?i:form))[^>]*>
+  | <!--.*?--\s*>
+)*""", re.VERBOSE | re.DOTALL)
+
+# Частый случай разбираемого тега: только name, name="value", name='value',
+# name=value через пробелы. Такой тег HTMLParser разбирает так же; остальные —
+# полным разбором _parse_starttag
+_SIMPLE_TAG = re.compile(r"""<([a-zA-Z]+)
+    ((?:[\t\n\r\f\ ]+[a-zA-Z_:][-a-zA-Z0-9_:.]*(?:="[^"]*"|='[^']*'|=[^\s"'>]+)?)*)
+    [\t\n\r\f\ ]*(/?)>""", re.VERBOSE)
+_SIMPLE_ATTR = re.compile(r"""[\t\n\r\f\ ]+([a-zA-Z_:][-a-zA-Z0-9_:.]*)(?:="([^"]*)"|='([^']*)'|=([^\s"'>]+))?""")
+
+# Теги, которые разбираем полностью: остальные только пропускаем
+_PARSED_TAGS = frozenset({"a", "form", "input", "script", "style"})
+_CDATA_TAGS = ("script", "style")
+
+
+class _LinkFormHandler:
+    """Сборщик ссылок и форм по событиям тегов (общий для всех вариантов)."""
+
+    def _reset_results(self):
+        self.links = []       # Ссылки, найденные в <a href="...">
+        self.forms = []       # Список форм, каждая — словарь с ключами: method, action, inputs, enctype
+        self._current_form = None  # Временное хранилище для данных о форме, пока не встретим следующий <form>
+
+    def handle_starttag(self, tag, attrs):
+        tag = tag.lower()
+
+        if tag == "a":
+            # Ищем href
+            for (attr, value) in attrs:
+                if attr.lower() == "href" and value:
+                    self.links.append(value)
+
+        elif tag == "form":
+            # Начало формы: создаём новую структуру
+            form_method = "get"
+            form_action = ""
+            form_enctype = ""   # <-- добавили ентайп
+
+            for (attr, value) in attrs:
+                attr_lower = attr.lower()
+                if attr_lower == "method" and value:
+                    form_method = value.lower()
+                elif attr_lower == "action" and value:
+                    form_action = value
+                elif attr_lower == "enctype" and value:
+                    form_enctype = value.lower()
+
+            self._current_form = {
+                "method": form_method,
+                "action": form_action,
+                "enctype": form_enctype,  # <-- сохраняем enctype
+                "inputs": []
+            }
+            self.forms.append(self._current_form)
+
+        elif tag == "input" and self._current_form is not None:
+            # Поле формы: name, type, value
+            input_name = ""
+            input_type = "text"
+            input_value = ""
+            for (attr, value) in attrs:
+                attr_lower = attr.lower()
+                if attr_lower == "name":
+                    input_name = value
+                elif attr_lower == "type" and value:
+                    input_type = value.lower()
+                elif attr_lower == "value":
+                    input_value = value
+
+            self._current_form["inputs"].append({
+                "name": input_name,
+                "type": input_type,
+                "value": input_value
+            })
+
+        # При желании можно обрабатывать <textarea>, <select> и т.д.
+
+    def handle_endtag(self, tag):
+        tag = tag.lower()
+        if tag == "form" and self._current_form is not None:
+            self._current_form = None
+
+
+class LinkAndFormExtractor(_LinkFormHandler, HTMLParser):
+    """
+    Парсер HTML, извлекающий:
+    1) Все ссылки (<a href="...">).
+    2) Формы (<form>) и их поля (<input>, <select>, <textarea> при желании).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._reset_results()
+
+
+class _ChunkedExtractor(_LinkFormHandler):
+    """Общая часть потоковых вариантов: reset/feed/finish (см. описание модуля)."""
+
+    def __init__(self):
+        self.reset("text/html")
+
+    def reset(self, content_type=None):
+        self._reset_results()
+        self.html = content_type is None or "text/html" in content_type
+        self.fed = 0
+        self._start()
+
+    def feed(self, data):
+        self.fed += len(data)
+        if self.html:
+            self._feed(data)
+
+    def finish(self, body):
+        if not self.html or self.fed != len(body):
+            # Куски не подавались (или подавались от другого ответа) — разбираем тело целиком
+            self.reset("text/html")
+            self.feed(body)
+        self._finish()
+
+    # Хуки вариантов: новый ответ, очередной кусок HTML, конец тела
+    def _start(self):
+        pass
+
+    def _feed(self, data):
+        pass
+
+    def _finish(self):
+        pass
+
+
+class StreamingLinkExtractor(_ChunkedExtractor):
+    def _start(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._rawdata = ""
+        self._cdata_end = None  # регекс конца <script>/<style>, пока мы внутри
+
+    def _feed(self, data):
+        self._rawdata += self._decoder.decode(data)
+        self._goahead()
+
+    def _finish(self):
+        # Как у response.text: неполная UTF-8 последовательность в конце — "�"
+        self._rawdata += self._decoder.decode(b"", final=True)
+        self._goahead(end=True)
+
+    def _goahead(self, end=False):
+        """
+        Аналог HTMLParser.goahead(end): разбирает всё, что уже можно разобрать.
+        end=True — конец тела (HTMLParser.close()): незаконченный тег, комментарий
+        или <!...>/<?...> заканчивается на ближайшем ">" (или перед "<"), и разбор
+        продолжается — так бывает у тела, обрезанного по --max-body-size.
+        """
+        rawdata = self._rawdata
+        n = len(rawdata)
+        i = 0
+        while i < n:
+            if self._cdata_end is not None:
+                match = self._cdata_end.search(rawdata, i)
+                if not match:
+                    # Конец </script> может начаться только с последнего "<" — текст
+                    # до него больше не нужен, следующий кусок не пересканирует его
+                    last = rawdata.rfind("<", i)
+                    i = last if last >= 0 else n
+                    break
+                i = match.end()
+                self._cdata_end = None
+                continue
+
+            i = _SKIP.match(rawdata, i).end()
+            if i >= n:
+                break
+            nxt = rawdata[i + 1:i + 2]
+            if nxt.isascii() and nxt.isalpha():
+                name = _TAG_NAME.match(rawdata, i + 1)
+                if name.group().lower() in _PARSED_TAGS:
+                    k = self._parse_starttag(i)
+                else:
+                    plain = _PLAIN_TAG_REST.match(rawdata, name.end())
+                    k = plain.end() if plain else self._check_for_whole_start_tag(i)
+            elif nxt == "/":
+                k = self._parse_endtag(i)
+            elif rawdata.startswith("<!--", i):
+                match = _COMMENT_END.search(rawdata, i + 4)
+                k = match.end() if match else -1
+            elif nxt == "?":
+                k = rawdata.find(">", i + 2)
+                k = k + 1 if k >= 0 else -1
+            elif nxt == "!":
+                k = self._parse_declaration(i)
+            elif i + 1 < n:
+                k = i + 1
+            else:
+                break
+            if k < 0:
+                if not end:
+                    # Конструкция не закончена — ждём следующий кусок
+                    break
+                # Конец тела: HTMLParser отдаёт её текстом до ">" или до следующего "<"
+                k = rawdata.find(">", i + 1)
+                if k < 0:
+                    k = rawdata.find("<", i + 1)
+                    if k < 0:
+                        k = i + 1
+                else:
+                    k += 1
+            i = k
+        self._rawdata = rawdata[i:]
+
+    def _check_for_whole_start_tag(self, i):
+        rawdata = self._rawdata
+        j = _LOCATE_TAG_END.match(rawdata, i).end()
+        nxt = rawdata[j:j + 1]
+        if nxt == ">":
+            return j + 1
+        if nxt == "/":
+            if rawdata.startswith("/>", j):
+                return j + 2
+            if rawdata.startswith("/", j):
+                return -1
+            return j if j > i else i + 1
+        if nxt == "":
+            return -1
+        if nxt in "abcdefghijklmnopqrstuvwxyz=/ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+            return -1
+        return j if j > i else i + 1
+
+    def _parse_starttag(self, i):
+        simple = _SIMPLE_TAG.match(self._rawdata, i)
+        if simple:
+            tag = simple.group(1).lower()
+            attrs = []
+            for attr in _SIMPLE_ATTR.finditer(simple.group(2)):
+                value = attr.group(attr.lastindex) if attr.lastindex > 1 else None
+                if value:
+                    value = unescape(value)
+                attrs.append((attr.group(1).lower(), value))
+            return self._starttag(tag, attrs, simple.group(3), simple.end())
+
+        endpos = self._check_for_whole_start_tag(i)
+        if endpos < 0:
+            return endpos
+        rawdata = self._rawdata
+
+        attrs = []
+        match = _TAG_NAME_TOLERANT.match(rawdata, i + 1)
+        k = match.end()
+        tag = match.group(1).lower()
+        while k < endpos:
+            m = _ATTR.match(rawdata, k)
+            if not m:
+                break
+            attrname, rest, attrvalue = m.group(1, 2, 3)
+            if not rest:
+                attrvalue = None
+            elif attrvalue[:1] == "'" == attrvalue[-1:] or attrvalue[:1] == '"' == attrvalue[-1:]:
+                attrvalue = attrvalue[1:-1]
+            if attrvalue:
+                attrvalue = unescape(attrvalue)
+            attrs.append((attrname.lower(), attrvalue))
+            k = m.end()
+
+        end = rawdata[k:endpos].strip()
+        if end not in (">", "/>"):
+            # Для HTMLParser это текст, а не тег
+            return endpos
+        return self._starttag(tag, attrs, end.endswith("/>"), endpos)
+
+    def _starttag(self, tag, attrs, self_closing, endpos):
+        self.handle_starttag(tag, attrs)
+        if self_closing:
+            self.handle_endtag(tag)
+        elif tag in _CDATA_TAGS:
+            self._cdata_end = re.compile(r"</\s*%s\s*>" % tag, re.I)
+        return endpos
+
+    def _parse_endtag(self, i):
+        rawdata = self._rawdata
+        gtpos = rawdata.find(">", i + 2)
+        if gtpos < 0:
+            return -1
+        match = _END_TAG.match(rawdata, i)
+        if match:
+            tag = match.group(1)
+        else:
+            match = _TAG_NAME.match(rawdata, i + 2)
+            # </> и "</мусор>" — пропускаем целиком
+            tag = match.group() if match else None
+        if tag is not None:
+            self.handle_endtag(tag)
+        return gtpos + 1
+
+    def _parse_declaration(self, i):
+        """<!DOCTYPE ...>, <![CDATA[...]]>, <![if ...]> и прочие <!...>."""
+        rawdata = self._rawdata
+        if rawdata.startswith("<![", i):
+            if i + 3 == len(rawdata):
+                return -1
+            name = _DECL_NAME.match(rawdata, i + 3)
+            if name and name.end() == len(rawdata):
+                return -1
+            keyword = name.group().strip().lower() if name else None
+            if keyword in ("temp", "cdata", "ignore", "include", "rcdata"):
+                match = _MARKED_SECTION_END.search(rawdata, i + 3)
+                return match.end() if match else -1
+            if keyword in ("if", "else", "endif"):
+                match = _MS_MARKED_SECTION_END.search(rawdata, i + 3)
+                return match.end() if match else -1
+            # HTMLParser здесь падает с AssertionError — пропускаем как комментарий
+        start = i + 9 if rawdata[i:i + 9].lower() == "<!doctype" else i + 2
+        gtpos = rawdata.find(">", start)
+        return gtpos + 1 if gtpos >= 0 else -1
+
+
+class LxmlLinkExtractor(_ChunkedExtractor):
+    def __init__(self):
+        if etree is None:
+            raise ImportError("lxml is not installed")
+        super().__init__()
+
+    def _start(self):
+        self._parser = etree.HTMLPullParser(events=("start", "end"), encoding="utf-8")
+
+    def _feed(self, data):
+        self._parser.feed(data)
+        self._read_events()
+
+    def _finish(self):
+        try:
+            self._parser.close()
+        except etree.LxmlError:
+            pass
+        self._read_events()
+
+    def _read_events(self):
+        for event, element in self._parser.read_events():
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue  # комментарии и инструкции
+            if event == "start":
+                if tag in ("a", "form", "input"):
+                    self.handle_starttag(tag, element.items())
+            elif tag == "form":
+                self.handle_endtag(tag)
+
+
+class SelectolaxLinkExtractor(_ChunkedExtractor):
+    def __init__(self):
+        if SelectolaxParser is None:
+            raise ImportError("selectolax is not installed")
+        super().__init__()
+
+    def _start(self):
+        self._chunks = []
+
+    def _feed(self, data):
+        self._chunks.append(data)
+
+    def _finish(self):
+        tree = SelectolaxParser(b"".join(self._chunks).decode("utf-8", errors="replace"))
+        forms = {}  # mem_id узла <form> -> словарь формы
+        for node in tree.css("a, form, input"):
+            tag = node.tag
+            if tag == "input":
+                # Поле относится к ближайшей объемлющей форме
+                parent = node.parent
+                while parent is not None and parent.tag != "form":
+                    parent = parent.parent
+                self._current_form = forms.get(parent.mem_id) if parent is not None else None
+            self.handle_starttag(tag, list(node.attributes.items()))
+            if tag == "form":
+                forms[node.mem_id] = self._current_form
+        self._current_form = None
+
+
+def make_extractor(backend="stream"):
+    """Новый извлекатель ссылок и форм (см. BACKENDS). ImportError — библиотека не установлена."""
+    if backend == "stream":
+        return StreamingLinkExtractor()
+    if backend == "lxml":
+        return LxmlLinkExtractor()
+    if backend == "selectolax":
+        return SelectolaxLinkExtractor()
+    if backend == "html.parser":
+        return LinkAndFormExtractor()
+    raise ValueError(f"Unknown HTML parser backend: {backend}")
+
+
+def available_backends():
+    """Варианты из BACKENDS, для которых установлены нужные библиотеки."""
+    missing = {"lxml": etree is None, "selectolax": SelectolaxParser is None}
+    return [backend for backend in BACKENDS if not missing.get(backend)]
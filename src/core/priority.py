@@ -0,0 +1,70 @@
+# coding: utf-8
+"""
+Файл: priority.py
+-----------------
+Назначение:
+Оценка "интересности" URL для очереди обхода с приоритетом (--frontier priority).
+
+BFS обходит статическую /about наравне с /search?q=..., и при ограничении
+числа страниц (--max-pages) то, что атакуют сканеры — URL с параметрами и
+страницы с формами, — может остаться в конце очереди. UrlScorer.score()
+складывает признаки с весами:
+- params: у URL есть параметры query;
+- template: шаблон URL (url_traps.url_template) встретился впервые —
+  /item?id=1 интересен, /item?id=2 уже почти ничего не добавляет;
+- form: на странице, где нашли ссылку, есть формы (рядом обработчики);
+- depth: штраф за каждый уровень глубины (мелкие страницы раньше).
+
+Веса задаются строкой "params=4,template=2,form=2,depth=1" (--priority-weights),
+неуказанные берутся из DEFAULT_WEIGHTS. Вызывается из одного потока обхода.
+"""
+
+import urllib.parse
+
+from src.core.url_traps import url_template
+
+DEFAULT_WEIGHTS = {"params": 4.0, "template": 2.0, "form": 2.0, "depth": 1.0}
+
+# Оценка URL из карт сайта (Crawler с sitemaps): ниже любой оценки score()
+SEED_SCORE = float("-inf")
+
+
+def parse_weights(text):
+    """
+    "params=4,depth=0.5" -> DEFAULT_WEIGHTS с заменёнными значениями.
+    ValueError при неизвестном признаке или нечисловом весе.
+    """
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in (text or "").split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_WEIGHTS:
+            raise ValueError(f"unknown priority feature '{name}' (expected: {', '.join(DEFAULT_WEIGHTS)})")
+        try:
+            weights[name] = float(value)
+        except ValueError:
+            raise ValueError(f"weight of '{name}' must be a number, got '{value.strip()}'")
+    return weights
+
+
+class UrlScorer:
+    def __init__(self, weights=None):
+        """:param weights: {"params", "template", "form", "depth"} (None — DEFAULT_WEIGHTS)."""
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self._templates = set()
+
+    def score(self, url, depth, parent_has_forms=False):
+        """Приоритет URL (больше — раньше в очереди)."""
+        weights = self.weights
+        score = -weights["depth"] * depth
+        if urllib.parse.urlsplit(url).query:
+            score += weights["params"]
+        template = url_template(url)
+        if template not in self._templates:
+            self._templates.add(template)
+            score += weights["template"]
+        if parent_has_forms:
+            score += weights["form"]
+        return score
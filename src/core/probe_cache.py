@@ -0,0 +1,135 @@
+# coding: utf-8
+"""
+Файл: probe_cache.py
+--------------------
+Назначение:
+Кэш проб на время одного скана, общий для всех модулей.
+
+ErrorBasedSQLiScanner, BooleanBasedSQLiScanner (TRUE-ветка) и TimeBasedSQLiScanner
+перебирают один и тот же sql_payloads.txt и отправляют побайтно одинаковые запросы.
+Кэш хранит ответ по ключу (method, url, body): одинаковая проба уходит в сеть
+один раз, а остальные детекторы получают тот же Response.
+
+Особенности:
+- Ограничение памяти: max_entries записей и max_bytes суммарного размера тел,
+  при переполнении вытесняем давно не использованные (LRU).
+- Одновременные одинаковые пробы (например, из параллельных модулей) не уходят
+  в сеть дважды: второй поток ждёт результат первого.
+- Счётчики попаданий/промахов ведутся отдельно для каждого модуля.
+- Кэшируем только идемпотентные запросы (CACHEABLE_METHODS): POST (вход,
+  отправка формы с CSRF-токеном) меняет состояние сервера, и его ответ нельзя
+  отдавать следующему модулю вместо нового запроса. Такие пробы идут мимо кэша.
+- Ошибки сети (None) и временные ошибки сервера (TRANSIENT_STATUSES: 408, 429,
+  5xx) не кэшируем — их стоит повторить, а не раздавать всем модулям.
+- Ответы, дочитанные только до сигнатуры (truncated == "match") или не
+  прочитанные вовсе (truncated == "type"), не кэшируем: другим нужно полное тело.
+"""
+
+import threading
+from collections import OrderedDict
+
+# Методы, ответ на которые можно отдать повторной пробе
+CACHEABLE_METHODS = ("GET", "HEAD")
+# Временные ошибки: ответ не кэшируем (плюс любые 5xx)
+TRANSIENT_STATUSES = (408, 429)
+
+
+def cacheable(response):
+    """Можно ли отдать этот ответ следующим одинаковым пробам."""
+    if response is None or response.truncated in ("match", "type"):
+        return False
+    return response.status < 500 and response.status not in TRANSIENT_STATUSES
+
+
+class ProbeCache:
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024):
+        """
+        :param max_entries: Максимум ответов в кэше.
+        :param max_bytes: Максимальный суммарный размер тел ответов (в байтах).
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()  # key -> Response
+        self._size = 0
+        self._inflight = {}            # key -> threading.Event
+        self._lock = threading.Lock()
+
+        # module -> {"hits": N, "misses": M}
+        self.module_stats = {}
+
+    def get_or_fetch(self, key, fetch, module=None):
+        """
+        Возвращает ответ из кэша или вызывает fetch() и кэширует результат.
+        :param key: (method, url, body)
+        :param fetch: функция без аргументов, возвращающая Response или None.
+        :param module: имя модуля-сканера (для счётчиков).
+        """
+        if key[0] not in CACHEABLE_METHODS:
+            # Неидемпотентный запрос: каждый раз в сеть, одновременные тоже не объединяем
+            return fetch()
+
+        while True:
+            with self._lock:
+                response = self._entries.get(key)
+                if response is not None:
+                    self._entries.move_to_end(key)
+                    self._count(module, "hits")
+                    return response
+
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    # Эту пробу в сеть отправляем мы
+                    self._inflight[key] = threading.Event()
+                    self._count(module, "misses")
+                    break
+
+            # Такая же проба уже в полёте — ждём её и смотрим в кэш ещё раз
+            waiter.wait()
+
+        try:
+            response = fetch()
+            if cacheable(response):
+                self._store(key, response)
+            return response
+        finally:
+            with self._lock:
+                event = self._inflight.pop(key)
+            event.set()
+
+    def stats(self):
+        """
+        Возвращает словарь:
+        {"hits": H, "misses": M, "entries": N, "bytes": B,
+         "modules": {module: {"hits", "misses"}}}
+        """
+        with self._lock:
+            modules = {m: dict(v) for m, v in self.module_stats.items()}
+            entries = len(self._entries)
+            size = self._size
+        return {
+            "hits": sum(v["hits"] for v in modules.values()),
+            "misses": sum(v["misses"] for v in modules.values()),
+            "entries": entries,
+            "bytes": size,
+            "modules": modules
+        }
+
+    def _store(self, key, response):
+        size = len(response.body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old.body)
+            self._entries[key] = response
+            self._size += size
+            # Вытесняем самые старые записи, пока не уложимся в лимиты
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+
+    def _count(self, module, field):
+        counters = self.module_stats.setdefault(module or "unknown", {"hits": 0, "misses": 0})
+        counters[field] += 1
@@ -0,0 +1,76 @@
+# coding: utf-8
+"""
+Файл: rate_limiter.py
+---------------------
+Назначение:
+Ограничитель частоты запросов (token bucket) отдельно для каждого хоста.
+
+Раньше и Crawler, и Requester делали time.sleep(delay) перед каждым запросом.
+Это работает только в одном потоке и всегда теряет всю задержку, даже если
+сервер готов принять больше. Token bucket даёт ровно оговорённую частоту:
+- rate: сколько запросов в секунду разрешено к одному хосту;
+- burst: сколько запросов можно отправить подряд без ожидания
+  (размер "ведра", накопленного за время простоя).
+
+Ожидание резервируется под блокировкой (токены могут уходить в минус —
+это очередь уже обещанных слотов), а спит уже вызывающий код, без блокировки.
+Поэтому лимитер можно вызывать из любого числа потоков (в том числе из потоков
+пула, в которых AsyncRequestEngine выполняет пробы) и из корутин.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    def __init__(self, rate, burst=1):
+        """
+        :param rate: Запросов в секунду на один хост (> 0).
+        :param burst: Сколько запросов подряд можно отправить без ожидания (>= 1).
+        """
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+
+        self._buckets = {}  # host -> [tokens, last_refill]
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._waited = 0.0
+
+    @classmethod
+    def from_options(cls, rate=0.0, burst=1, delay=0.0):
+        """
+        Создаёт лимитер по опциям командной строки или возвращает None,
+        если частота не ограничена. Старый --delay D означает rate = 1/D, burst = 1.
+        """
+        if rate and rate > 0:
+            return cls(rate, burst)
+        if delay and delay > 0:
+            return cls(1.0 / delay, 1)
+        return None
+
+    def reserve(self, host):
+        """
+        Забирает токен для host и возвращает, сколько секунд нужно подождать
+        перед запросом (0 — можно сразу). Ждёт вызывающий: поток — time.sleep(),
+        корутина — asyncio.sleep(), сам лимитер никогда не блокирует.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = [float(self.burst), now]
+
+            tokens, last = bucket
+            tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+            tokens -= 1.0
+            bucket[0], bucket[1] = tokens, now
+
+            wait = -tokens / self.rate if tokens < 0 else 0.0
+            self._requests += 1
+            self._waited += wait
+        return wait
+
+    def stats(self):
+        """Статистика: сколько запросов прошло через лимитер и сколько секунд суммарно ждали."""
+        with self._lock:
+            return {"requests": self._requests, "waited": round(self._waited, 3)}
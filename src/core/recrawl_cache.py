@@ -0,0 +1,157 @@
+# coding: utf-8
+"""
+Файл: recrawl_cache.py
+----------------------
+Назначение:
+Повторный обход без повторного скачивания неизменившихся страниц (--recrawl-cache).
+
+Одни и те же приложения сканируются каждую ночь, и Crawler каждый раз скачивал
+и разбирал все страницы заново. RecrawlCache — SQLite-файл, в котором после
+обхода остаются для каждой HTML-страницы:
+- ETag и Last-Modified ответа;
+- хэш тела (blake2b) и само тело (zlib) с заголовками и финальным URL;
+- ссылки и формы в том виде, в каком их вернул разбор (относительные ссылки,
+  action как в HTML): область обхода и канонизация применяются к ним заново,
+  поэтому другие --scope/--exclude на следующем запуске не мешают.
+
+На следующем обходе:
+- conditional_headers(entry) — If-None-Match / If-Modified-Since для GET;
+- ответ 304 превращается в сохранённый ответ (stored_response) — сканеры
+  и хранилище артефактов получают страницу, как будто она скачана;
+- если сервер условные запросы не поддерживает, но тело не изменилось
+  (тот же хэш), ссылки и формы тоже берутся из кэша — без разбора HTML;
+  новые ETag / Last-Modified такого ответа записываются (только они), иначе
+  следующий обход слал бы устаревшие If-None-Match и никогда не получал 304.
+
+Все методы потокобезопасны (вызываются из потоков пула краулера). Записи
+копятся пачкой и пишутся одной транзакцией (как в SQLiteFrontier).
+stats() — {"revalidated" (ответ 304), "reused" (ссылки и формы из кэша,
+включая 304), "changed", "new"}.
+"""
+
+import hashlib
+import http.client
+import json
+import sqlite3
+import threading
+import zlib
+
+from src.core.response import Response
+
+
+def content_hash(body):
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class RecrawlCache:
+    def __init__(self, path, write_batch=100):
+        """
+        :param path: SQLite-файл (создаётся, если его нет; дополняется после каждого обхода).
+        :param write_batch: Сколько изменённых страниц копим перед записью в файл.
+        """
+        self.path = path
+        self.write_batch = max(1, write_batch)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, hash TEXT NOT NULL, "
+            "final_url TEXT NOT NULL, headers TEXT NOT NULL, body BLOB NOT NULL, "
+            "links TEXT NOT NULL, forms TEXT NOT NULL)"
+        )
+        self._pending = []
+        self._validators = []  # (etag, last_modified, url) неизменившихся страниц с новыми валидаторами
+        self._counters = {"revalidated": 0, "reused": 0, "changed": 0, "new": 0}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            self._flush()
+            return self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def get(self, url):
+        """Запись прошлого обхода для url или None."""
+        with self._lock:
+            self._flush()
+            row = self._db.execute(
+                "SELECT etag, last_modified, hash, final_url, headers, body, links, forms "
+                "FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, digest, final_url, headers, body, links, forms = row
+        return {
+            "url": url, "etag": etag, "last_modified": last_modified, "hash": digest,
+            "final_url": final_url, "headers": json.loads(headers), "body": body,
+            "links": json.loads(links), "forms": json.loads(forms)
+        }
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Заголовки условного GET для записи прошлого обхода (пустой dict, если валидаторов нет)."""
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def stored_response(self, entry, elapsed=0.0):
+        """Response со страницей из кэша — вместо ответа 304 Not Modified."""
+        headers = http.client.HTTPMessage()
+        for name, value in entry["headers"]:
+            headers[name] = value
+        with self._lock:
+            self._counters["revalidated"] += 1
+        return Response(200, headers, entry["final_url"], elapsed, zlib.decompress(entry["body"]))
+
+    def unchanged(self, entry, response):
+        """
+        True — тело ответа то же, что в прошлый раз: ссылки и формы можно взять из entry.
+        Если при этом сменились ETag / Last-Modified, они обновляются в кэше.
+        """
+        same = content_hash(response.body) == entry["hash"]
+        if same:
+            validators = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            with self._lock:
+                self._counters["reused"] += 1
+                if validators != (entry["etag"], entry["last_modified"]):
+                    self._validators.append(validators + (entry["url"],))
+                    if len(self._validators) >= self.write_batch:
+                        self._flush()
+        return same
+
+    def put(self, url, response, links, forms, previous=None):
+        """Запоминает разобранную страницу (links, forms — результат разбора HTML)."""
+        row = (
+            url, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+            content_hash(response.body), response.url,
+            json.dumps(list(response.headers.items())), zlib.compress(response.body, 6),
+            json.dumps(list(links)), json.dumps(forms)
+        )
+        with self._lock:
+            self._counters["changed" if previous is not None else "new"] += 1
+            self._pending.append(row)
+            if len(self._pending) >= self.write_batch:
+                self._flush()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def close(self):
+        with self._lock:
+            if self._db is None:
+                return
+            self._flush()
+            self._db.close()
+            self._db = None
+
+    def _flush(self):
+        if not (self._pending or self._validators):
+            return
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self._pending)
+            self._db.executemany("UPDATE pages SET etag = ?, last_modified = ? WHERE url = ?", self._validators)
+        self._pending = []
+        self._validators = []
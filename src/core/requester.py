@@ -5,7 +5,7 @@
 Назначение:
 Этот модуль отвечает за отправку HTTP/HTTPS запросов с учётом:
 - Таймаута (--timeout)
-- Задержки между запросами (--delay)
+- Ограничения частоты запросов (--rate/--burst, старый --delay)
 - Пользовательского User-Agent (--user-agent)
 - Обработку редиректов, куки и прочих нюансов.
 
@@ -18,23 +18,180 @@
 - get/post: возвращаем текст ответа или None, как раньше
 - Если запрос прошёл, сохраняем self.last_url = response.geturl()
 - Если произошла ошибка/исключение, self.last_url = None
+
+Пул соединений (--pool-size, --pool-idle-timeout):
+- Вместо urllib.request.urlopen запросы идут через ConnectionPool (http.client),
+  соединения keep-alive переиспользуются между запросами к одному хосту.
+- Редиректы обрабатываем сами, повторяя поведение urllib (301/302/303 -> GET,
+  307/308 только для GET/HEAD, не более MAX_REDIRECTS переходов).
+- Ответ со статусом >= 400 по-прежнему превращается в None.
+- pool_stats() возвращает статистику пула (сколько рукопожатий сэкономили).
+
+Пакетный режим (--concurrency, --per-host-concurrency):
+- batch(probes) принимает список проб-словарей {"method", "url", "data", ...}
+  и отдаёт (probe, resp_text) по мере готовности.
+- При concurrency > 1 пробы выполняет AsyncRequestEngine (asyncio + пул потоков),
+  иначе — последовательно, как обычные get/post.
+- Синхронные get/post остаются для существующих вызовов.
+
+Объект ответа и потокобезопасность:
+- request(method, url, data) возвращает Response (status, headers, url, elapsed, body)
+  или None при сетевой ошибке. Общего изменяемого состояния у запроса нет,
+  поэтому request() можно вызывать из любого числа потоков.
+- batch() отдаёт (probe, Response) — как и get/post, None при ошибке или статусе >= 400.
+- self.last_url сохранён для старого кода, но хранится отдельно для каждого потока.
+
+Кэш проб (--probe-cache-size, --probe-cache-mb):
+- Одинаковые пробы GET/HEAD (method, url, body) от разных модулей уходят в сеть
+  один раз, остальные получают тот же Response (см. ProbeCache). POST и ответы
+  с временными ошибками (429, 5xx) не кэшируются.
+- scoped(module) возвращает "вид" Requester, помеченный именем модуля —
+  так кэш ведёт счётчики попаданий по модулям.
+- Запросы, результат которых зависит от предыдущих действий (проверка Stored XSS),
+  отправляются с use_cache=False.
+
+Хранилище артефактов краулера (--artifact-memory-mb, --artifact-disk-mb):
+- self.artifacts — ArtifactStore со страницами, скачанными краулером (или None).
+- crawled(url) отдаёт сохранённый Response без сетевого запроса; пассивные
+  проверки (поиск DOM-синков и т.п.) берут страницы оттуда.
+
+Ограничение частоты (--rate, --burst, --delay):
+- Вместо time.sleep(delay) перед каждым запросом — общий RateLimiter
+  (token bucket на каждый хост). Лимитер проверяется перед каждым реальным
+  обменом с сервером (включая переходы по редиректам), ответы из кэша его не тратят.
+- --delay D без --rate означает rate = 1/D запросов в секунду, burst = 1.
+- Краулер использует тот же Requester, а значит и тот же лимитер.
+
+Адаптивный параллелизм (--adaptive-concurrency, --min-concurrency):
+- AdaptiveConcurrency (AIMD) ограничивает число реальных сетевых запросов
+  "в полёте" сразу для всех модулей и пакетов; --concurrency становится потолком.
+- Каждый запрос сообщает контроллеру время ответа или причину для снижения:
+  таймаут, сетевую ошибку, статус 429/503.
+
+Потоковое чтение тела (--max-body-size):
+- Тело читается кусками (см. body_reader.read_body); больше max_body_size байт
+  не читаем, такой ответ помечен response.truncated = "size".
+- request(..., stop_when=regex) прекращает чтение, как только сигнатура
+  найдена (response.truncated = "match"). Такой ответ неполон для других
+  детекторов, поэтому в кэш проб он не попадает.
+- transfer_stats() — сколько ответов получено и сколько из них обрезано.
+- request(..., sink=obj) отдаёт куски распакованного тела obj.feed(data)
+  по мере чтения (obj.reset(content_type) — в начале каждого ответа, включая
+  редиректы и повторы). Так краулер разбирает HTML, пока тело ещё качается
+  (см. link_extractor.py). Ответ из кэша проб или кассеты в sink не попадает.
+  Если obj.reset() вернул False, тело не читается (response.truncated = "type"):
+  краулер так отказывается от не-HTML ответов сразу после заголовков.
+
+Сжатие (--no-compression):
+- По умолчанию отправляем Accept-Encoding (gzip, deflate и br, если есть brotli),
+  тело распаковывается потоково в body_reader; Response.body — уже распакованное,
+  заголовки (Content-Encoding, Content-Length) остаются как прислал сервер.
+- transfer_stats() дополнительно считает wire_bytes (пришло по сети)
+  и decoded_bytes (после распаковки).
+
+Повторы и circuit breaker (--retries, --retry-backoff, --breaker-threshold, --breaker-cooldown):
+- Временные сбои GET/HEAD (таймаут, сетевая ошибка, 429/502/503/504)
+  повторяются до retries раз с экспоненциальной задержкой со случайным
+  разбросом (full jitter), Retry-After сервера учитывается.
+- После всех повторов результат сообщается CircuitBreaker хоста. Пока breaker
+  открыт, get/post/request сразу возвращают None, не дожидаясь --timeout.
+- batch() не теряет такие пробы: fetch_probe() возвращает DEFERRED, пачка
+  откладывает пробу и повторяет её, когда breaker хоста разрешит пробный запрос
+  (не более MAX_DEFER_ROUNDS кругов, затем (probe, None)).
+
+Фазы запроса и гистограммы (--metrics-output):
+- Для каждого реального запроса замеряются фазы (perf_counter, монотонные часы):
+  dns, connect, tls (только для нового соединения, см. TimedHTTPConnection),
+  ttfb (от отправки запроса до заголовков ответа) и body (чтение тела);
+  при редиректах фазы суммируются по всем переходам.
+- Фазы доступны в response.timings и собираются в self.metrics (RequestMetrics)
+  по хостам и по модулям.
+
+Запись и воспроизведение трафика (--record, --replay, --replay-latency):
+- record=FILE: каждый итоговый ответ (после редиректов и повторов) дописывается
+  в кассету (см. cassette.py); краулер ходит через этот же Requester,
+  поэтому его трафик тоже попадает в запись.
+- replay=FILE: сеть не используется — ответы берутся из кассеты по
+  (method, url, body); запрос, которого нет в записи, возвращает None.
+  Лимитер, повторы, breaker и адаптивный лимит в этом режиме не участвуют.
+- replay_latency=True: перед выдачей ответа ждём записанное время ответа
+  (без него проверки по времени, например Time-Based SQLi, ничего не найдут).
 """
 
+import http.client
+import random
+import socket
+import string
+import threading
 import time
-import urllib.request
-import urllib.error
+import urllib.parse
+
+from src.core.async_engine import AsyncRequestEngine
+from src.core.body_reader import ACCEPT_ENCODING, read_body
+from src.core.cassette import CassetteReader, CassetteWriter
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.core.concurrency import AdaptiveConcurrency
+from src.core.connection_pool import ConnectionPool
+from src.core.probe_cache import ProbeCache
+from src.core.rate_limiter import RateLimiter
+from src.core.response import Response
+from src.utils.metrics import RequestMetrics
 
 
 class Requester:
-    def __init__(self, timeout=10.0, delay=0.0, user_agent=None):
+    # Сколько редиректов подряд готовы пройти (как max_redirections в urllib)
+    MAX_REDIRECTS = 10
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+    # Статусы временной перегрузки: повторяем (для RETRY_METHODS) и учитываем в breaker
+    RETRY_STATUSES = (429, 502, 503, 504)
+    # Что можно повторить: POST мог уже изменить данные на сервере
+    RETRY_METHODS = ("GET", "HEAD")
+    # Потолок задержки между повторами и учитываемого Retry-After, секунд
+    MAX_BACKOFF = 30.0
+    # Сколько раз batch() откладывает пробы к хосту с открытым breaker
+    MAX_DEFER_ROUNDS = 3
+    # fetch_probe() возвращает это значение, если проба отложена (breaker открыт)
+    DEFERRED = object()
+
+    def __init__(self, timeout=10.0, delay=0.0, user_agent=None, pool_size=10, pool_idle_timeout=30.0,
+                 concurrency=1, per_host_concurrency=4, probe_cache_size=10000,
+                 probe_cache_bytes=64 * 1024 * 1024, artifacts=None, rate=0.0, burst=1, limiter=None,
+                 adaptive_concurrency=False, min_concurrency=1, logger=None,
+                 max_body_size=10 * 1024 * 1024, compression=True, retries=2, retry_backoff=0.5,
+                 breaker_threshold=5, breaker_cooldown=10.0, record=None, replay=None,
+                 replay_latency=False):
         """
         Инициализация Requester.
 
         Параметры:
         timeout (float): Максимальное время ожидания ответа (в секундах).
-        delay (float): Задержка перед выполнением каждого запроса (в секундах).
+        delay (float): Минимальный интервал между запросами к хосту (в секундах),
+                       если rate не задан.
         user_agent (str): Строка, используемая в заголовке User-Agent.
                          Если None, используем дефолтный "WebVulnScanner/1.0".
+        pool_size (int): Сколько keep-alive соединений держим на один хост.
+        pool_idle_timeout (float): Через сколько секунд простоя закрываем соединение.
+        concurrency (int): Глобальный лимит параллельных запросов в batch().
+                           1 — пакеты выполняются последовательно.
+        per_host_concurrency (int): Лимит параллельных запросов к одному хосту в batch().
+        probe_cache_size (int): Сколько ответов хранит кэш проб (0 — кэш выключен).
+        probe_cache_bytes (int): Лимит памяти кэша проб (суммарный размер тел, байт).
+        artifacts (ArtifactStore): Хранилище страниц краулера (None — не сохраняем).
+        rate (float): Запросов в секунду к одному хосту (0 — без ограничения).
+        burst (int): Сколько запросов подряд можно отправить без ожидания.
+        limiter (RateLimiter): Готовый общий лимитер (имеет приоритет над rate/delay).
+        adaptive_concurrency (bool): Подбирать лимит параллельных запросов по ответам сервера.
+        min_concurrency (int): Нижняя граница адаптивного лимита.
+        logger (Logger): Логгер сканера для решений адаптивного контроллера.
+        max_body_size (int): Максимальный размер читаемого тела ответа в байтах (0 — без ограничения).
+        compression (bool): Просить у сервера сжатые ответы (Accept-Encoding).
+        retries (int): Сколько раз повторять запрос при временном сбое.
+        retry_backoff (float): Базовая задержка перед повтором (удваивается с каждой попыткой).
+        breaker_threshold (int): Сколько неудач подряд открывают breaker хоста (0 — breaker выключен).
+        breaker_cooldown (float): Сколько секунд не отправлять запросы к "упавшему" хосту.
+        record (str): Файл кассеты, в который записываются все ответы (None — не пишем).
+        replay (str): Файл кассеты, из которого берутся ответы вместо сети (None — сеть).
+        replay_latency (bool): При воспроизведении выдерживать записанное время ответа.
         """
         if not user_agent:
             user_agent = "WebVulnScanner/1.0"
@@ -45,10 +202,83 @@ class Requester:
         # Запомним user_agent (ещё раз, чтобы быть уверенными)
         self.user_agent = user_agent if user_agent else "WebVulnScanner/1.0"
 
-        # Новое поле: хранить конечный URL после 3xx-редиректов (если они были)
+        # Новое поле: хранить конечный URL после 3xx-редиректов (если они были).
+        # Значение своё у каждого потока (см. свойство last_url)
+        self._local = threading.local()
         self.last_url = None
 
-    def get(self, url):
+        # Ограничение частоты запросов (None — без ограничения)
+        self.limiter = limiter or RateLimiter.from_options(rate=rate, burst=burst, delay=delay)
+
+        # Пул постоянных соединений
+        self.pool = ConnectionPool(
+            max_per_host=pool_size,
+            idle_timeout=pool_idle_timeout,
+            timeout=timeout
+        )
+
+        # Общий для всех модулей кэш проб
+        self.cache = None
+        if probe_cache_size > 0 and probe_cache_bytes > 0:
+            self.cache = ProbeCache(max_entries=probe_cache_size, max_bytes=probe_cache_bytes)
+
+        # Страницы, скачанные краулером (заполняет Crawler)
+        self.artifacts = artifacts
+
+        # Потоковое чтение тела и статистика обрезанных ответов
+        self.max_body_size = max_body_size
+        self.compression = compression
+        self._transfer = {"responses": 0, "truncated_size": 0, "truncated_match": 0, "truncated_type": 0,
+                          "wire_bytes": 0, "decoded_bytes": 0}
+        self._transfer_lock = threading.Lock()
+
+        # Гистограммы фаз запросов по хостам и модулям
+        self.metrics = RequestMetrics()
+
+        # Повторы при временных сбоях и per-host circuit breaker
+        self.retries = max(0, retries)
+        self.retry_backoff = retry_backoff
+        self.breaker = None
+        if breaker_threshold > 0:
+            self.breaker = CircuitBreaker(
+                failure_threshold=breaker_threshold,
+                cooldown=breaker_cooldown,
+                logger=logger
+            )
+
+        # Кассеты: запись трафика и/или воспроизведение без сети
+        self.recorder = CassetteWriter(record) if record else None
+        self.replayer = CassetteReader(replay, latency=replay_latency) if replay else None
+
+        # Адаптивный лимит параллельных запросов; при concurrency=1 не нужен
+        self.controller = None
+        if adaptive_concurrency and concurrency > 1:
+            self.controller = AdaptiveConcurrency(
+                initial=max(min_concurrency, concurrency // 2),
+                minimum=min_concurrency,
+                maximum=concurrency,
+                logger=logger
+            )
+
+        # Асинхронный движок для batch(); при concurrency=1 не нужен
+        self.engine = None
+        if concurrency > 1:
+            self.engine = AsyncRequestEngine(
+                self,
+                concurrency=concurrency,
+                per_host=per_host_concurrency
+            )
+
+    @property
+    def last_url(self):
+        """Финальный URL последнего get/post, сделанного в текущем потоке."""
+        return getattr(self._local, "last_url", None)
+
+    @last_url.setter
+    def last_url(self, value):
+        self._local.last_url = value
+
+    def get(self, url, module=None, use_cache=True):
         """
         Выполняет GET-запрос к указанному URL.
 
@@ -58,26 +288,9 @@ class Requester:
         После успешного запроса self.last_url = финальный URL (после редиректов).
         Если ошибка, self.last_url = None.
         """
-        # Перед запросом учитываем задержку
-        if self.delay > 0:
-            time.sleep(self.delay)
+        return self._text_of(self.request("GET", url, module=module, use_cache=use_cache))
 
-        req = urllib.request.Request(url, headers={"User-Agent": self.user_agent})
-        try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                # Читаем ответ и декодируем
-                data = response.read().decode("utf-8", errors="replace")
-                # Сохраним финальный адрес
-                self.last_url = response.geturl()  # URL после возможного редиректа
-                return data
-        except urllib.error.HTTPError:
-            self.last_url = None
-            return None
-        except urllib.error.URLError:
-            self.last_url = None
-            return None
-
-    def post(self, url, data):
+    def post(self, url, data, module=None, use_cache=True):
         """
         Выполняет POST-запрос к указанному URL.
 
@@ -89,25 +302,424 @@ class Requester:
         None, если произошла ошибка.
         Аналогично, после успешного запроса self.last_url = финальный URL.
         """
-        # Перед запросом учитываем задержку
-        if self.delay > 0:
-            time.sleep(self.delay)
+        return self._text_of(self.request("POST", url, data, module=module, use_cache=use_cache))
+
+    def request(self, method, url, data=None, module=None, use_cache=True, stop_when=None, sink=None,
+                headers=None):
+        """
+        Выполняет запрос и возвращает Response (для любого HTTP-статуса)
+        или None, если произошла сетевая ошибка.
 
-        encoded_data = None
-        if data:
-            from urllib.parse import urlencode
-            encoded_data = urlencode(data).encode("utf-8")
+        Параметры:
+        method (str): "GET" или "POST" (регистр не важен).
+        data (dict): Данные формы для POST.
+        module (str): Имя модуля-сканера (для счётчиков кэша).
+        use_cache (bool): Можно ли отдать ответ из кэша проб.
+        stop_when (re.Pattern): Сигнатура, после которой тело можно не дочитывать.
+        sink: Получатель кусков тела по мере чтения (reset(content_type), feed(data)).
+        headers (dict): Дополнительные заголовки запроса (например, If-None-Match).
+                        Такой запрос не берётся из кэша проб и не кладётся в него.
 
-        req = urllib.request.Request(url, data=encoded_data, headers={"User-Agent": self.user_agent})
+        Метод не меняет состояние Requester, его можно вызывать из нескольких потоков.
+        Если breaker хоста открыт, сразу возвращает None.
+        """
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                data = response.read().decode("utf-8", errors="replace")
-                # Сохраним финальный адрес
-                self.last_url = response.geturl()
-                return data
-        except urllib.error.HTTPError:
-            self.last_url = None
+            return self._request(method, url, data, module, use_cache, stop_when, sink, headers)
+        except CircuitOpenError:
+            return None
+
+    def _request(self, method, url, data=None, module=None, use_cache=True, stop_when=None, sink=None,
+                 headers=None):
+        """Как request(), но при открытом breaker бросает CircuitOpenError."""
+        method = method.upper()
+        body = self._encode_data(data) if method == "POST" else None
+
+        if self.cache is None or not use_cache or headers:
+            return self._perform(method, url, body, stop_when, module, sink, headers)
+
+        key = (method, url, body)
+        return self.cache.get_or_fetch(
+            key, lambda: self._perform(method, url, body, stop_when, module, sink), module
+        )
+
+    def scoped(self, module):
+        """Возвращает ScopedRequester — этот же Requester, помеченный именем модуля."""
+        return ScopedRequester(self, module)
+
+    def fetch_probe(self, probe):
+        """
+        Выполняет одну пробу-словарь {"method", "url", "data"[, "stop_when"]}.
+        Возвращает Response или None (ошибка сети или статус >= 400), как get/post,
+        либо DEFERRED, если breaker хоста открыт и пробу нужно повторить позже.
+        Имя модуля для кэша берётся из probe["module"], если оно есть.
+        """
+        try:
+            response = self._request(
+                probe.get("method", "GET"),
+                probe["url"],
+                probe.get("data"),
+                module=probe.get("module"),
+                stop_when=probe.get("stop_when")
+            )
+        except CircuitOpenError:
+            return self.DEFERRED
+        if response is None or not response.ok:
+            return None
+        return response
+
+    def batch(self, probes):
+        """
+        Выполняет пачку проб и отдаёт (probe, response) по мере готовности.
+        Порядок ответов при concurrency > 1 не совпадает с порядком проб.
+        Пробы к хосту с открытым breaker откладываются и выполняются позже.
+        """
+        pending = list(probes)
+        for _ in range(self.MAX_DEFER_ROUNDS + 1):
+            deferred = []
+            for probe, response in self._run_batch(pending):
+                if response is self.DEFERRED:
+                    deferred.append(probe)
+                else:
+                    yield probe, response
+            if not deferred:
+                return
+
+            # Ждём, пока хотя бы один из "отдыхающих" хостов разрешит пробный запрос
+            # (пока идёт пробный запрос half-open, retry_after == 0 — ждём хотя бы retry_backoff)
+            waits = [self.breaker.retry_after(self._host_key(p["url"])) for p in deferred]
+            time.sleep(max(min(waits), self.retry_backoff))
+            pending = deferred
+
+        # Хост так и не поднялся — отдаём пробы как неудачные
+        for probe in pending:
+            yield probe, None
+
+    def _run_batch(self, probes):
+        if self.engine is not None:
+            yield from self.engine.run_batch(probes)
+            return
+        for probe in probes:
+            yield probe, self.fetch_probe(probe)
+
+    def crawled(self, url):
+        """
+        Возвращает Response страницы, сохранённой краулером, или None,
+        если хранилища нет или страница в нём не найдена.
+        """
+        if self.artifacts is None:
+            return None
+        return self.artifacts.get(url)
+
+    def pool_stats(self):
+        """Статистика пула соединений (requests, reused, created, hit_rate)."""
+        return self.pool.stats()
+
+    def transfer_stats(self):
+        """
+        Сколько ответов прочитано, сколько обрезано по размеру/сигнатуре
+        и сколько байт тел пришло по сети (wire_bytes) и после распаковки (decoded_bytes).
+        """
+        with self._transfer_lock:
+            return dict(self._transfer)
+
+    def cache_stats(self):
+        """Статистика кэша проб (см. ProbeCache.stats()) или None, если кэш выключен."""
+        if self.cache is None:
+            return None
+        return self.cache.stats()
+
+    def cassette_stats(self):
+        """
+        Статистика кассет: {"recorded": N} и/или {"replayed": {"records", "hits", "misses"}}.
+        Пустой словарь, если ни запись, ни воспроизведение не включены.
+        """
+        stats = {}
+        if self.recorder is not None:
+            stats["recorded"] = self.recorder.count
+        if self.replayer is not None:
+            stats["replayed"] = self.replayer.stats()
+        return stats
+
+    def close(self):
+        """Закрывает все keep-alive соединения, движок пакетного режима и кассету записи."""
+        if self.engine is not None:
+            self.engine.close()
+        self.pool.close_all()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def _perform(self, method, url, body, stop_when=None, module=None, sink=None, headers=None):
+        """
+        Реальный сетевой запрос с повторами: Response или None.
+        Бросает CircuitOpenError, если breaker хоста открыт.
+        В режиме воспроизведения ответ берётся из кассеты.
+        """
+        if self.replayer is not None:
+            return self._replay(method, url, body)
+
+        try:
+            host = self._host_key(url)
+        except ValueError:
+            return None
+
+        if self.breaker is not None and not self.breaker.allow(host):
+            raise CircuitOpenError(host)
+
+        failed = True
+        try:
+            for attempt in range(self.retries + 1):
+                response, failed, retryable = self._attempt(method, url, body, stop_when, module, host, sink, headers)
+                if not retryable or attempt == self.retries:
+                    break
+                time.sleep(self._backoff(attempt, response))
+        finally:
+            # Breaker получает один результат на запрос, после всех повторов. Исключение
+            # (например, из sink) — тоже результат: иначе пробный запрос half-open
+            # не освободит хост, и он останется закрытым для всех навсегда
+            if self.breaker is not None:
+                self.breaker.record(host, success=not failed)
+
+        if response is not None and self.recorder is not None:
+            self.recorder.record(method, url, body, response)
+        return response
+
+    def _replay(self, method, url, body):
+        """Ответ из кассеты (или None, если такой запрос не записан)."""
+        response = self.replayer.lookup(method, url, body)
+        if response is not None and self.replayer.latency:
+            time.sleep(response.elapsed)
+        return response
+
+    def _backoff(self, attempt, response):
+        """Задержка перед повтором: full jitter от retry_backoff * 2^attempt, не меньше Retry-After."""
+        delay = random.uniform(0, min(self.MAX_BACKOFF, self.retry_backoff * (2 ** attempt)))
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.strip().isdigit():
+                delay = max(delay, min(self.MAX_BACKOFF, float(retry_after)))
+        return delay
+
+    def _attempt(self, method, url, body, stop_when, module=None, host=None, sink=None, headers=None):
+        """
+        Одна попытка запроса (с учётом адаптивного лимита).
+        Возвращает (Response или None, failed, retryable): failed — хост не справился
+        (таймаут, сетевая ошибка, статус из RETRY_STATUSES), retryable — есть смысл
+        повторить (повторяем только RETRY_METHODS и не повторяем ошибку DNS).
+        """
+        controller = self.controller
+        if controller is not None:
+            controller.acquire()
+
+        elapsed, signal = None, None
+        try:
+            start = time.perf_counter()
+            try:
+                status, response_headers, final_url, raw, truncated, timings = self._send(
+                    method, url, body, stop_when, sink, headers
+                )
+            except (ValueError, http.client.InvalidURL):
+                # Неподдерживаемый URL/редирект — сервер тут ни при чём
+                return None, False, False
+            except socket.gaierror:
+                # Имя не резолвится — повтор через полсекунды не поможет
+                signal = "network error"
+                return None, True, False
+            except (OSError, http.client.HTTPException) as e:
+                signal = "timeout" if isinstance(e, TimeoutError) else "network error"
+                # POST мог дойти до сервера: повтор продублировал бы сохранённую отправку формы
+                return None, True, method in self.RETRY_METHODS
+            # Ожидание в лимитере — не время ответа сервера (важно для time-based проверок)
+            elapsed = time.perf_counter() - start - timings.pop("throttle")
+            timings["total"] = elapsed
+            self.metrics.record(host, module, timings)
+
+            if status in AdaptiveConcurrency.BACKOFF_STATUSES:
+                signal = f"HTTP {status}"
+            self._count_transfer(truncated)
+            response = Response(status, response_headers, final_url, elapsed, raw, truncated, timings)
+            failed = status in self.RETRY_STATUSES
+            return response, failed, failed and method in self.RETRY_METHODS
+        finally:
+            if controller is not None:
+                controller.release(elapsed, signal)
+
+    def _count_transfer(self, truncated):
+        with self._transfer_lock:
+            self._transfer["responses"] += 1
+            if truncated is not None:
+                self._transfer["truncated_" + truncated] += 1
+
+    def _count_bytes(self, wire, decoded):
+        with self._transfer_lock:
+            self._transfer["wire_bytes"] += wire
+            self._transfer["decoded_bytes"] += decoded
+
+    def _encode_data(self, data):
+        """Кодирует dict в application/x-www-form-urlencoded (или None, если данных нет)."""
+        if not data:
             return None
-        except urllib.error.URLError:
+        return urllib.parse.urlencode(data).encode("utf-8")
+
+    def _text_of(self, response):
+        """
+        Превращает Response в результат get/post: текст или None
+        (ошибка сети или статус >= 400), обновляя self.last_url текущего потока.
+        """
+        if response is None or not response.ok:
+            # Раньше urllib выбрасывал HTTPError, и мы возвращали None
             self.last_url = None
             return None
+
+        self.last_url = response.url
+        return response.text
+
+    def _send(self, method, url, body, stop_when=None, sink=None, extra_headers=None):
+        """
+        Отправляет запрос через пул, следуя редиректам.
+        Возвращает (status, headers, final_url, raw_body, truncated, timings), где
+        truncated — None/"size"/"match"/"type" (см. body_reader), timings — сумма фаз
+        всех переходов плюс "throttle" (сколько секунд запрос простоял в лимитере).
+        Бросает OSError/HTTPException/ValueError при сетевых ошибках.
+        """
+        timings = {"throttle": 0.0, "dns": 0.0, "connect": 0.0, "tls": 0.0, "ttfb": 0.0, "body": 0.0}
+        for _ in range(self.MAX_REDIRECTS + 1):
+            timings["throttle"] += self._throttle(url)
+            status, headers, raw, truncated, phases = self._send_once(
+                method, url, body, stop_when, sink, extra_headers
+            )
+            for phase, seconds in phases.items():
+                timings[phase] += seconds
+
+            location = headers.get("Location")
+            if status not in self.REDIRECT_CODES or not location:
+                return status, headers, url, raw, truncated, timings
+
+            if status in (307, 308) and method not in ("GET", "HEAD"):
+                # urllib не повторяет POST при 307/308 — считаем это ошибкой
+                return status, headers, url, raw, truncated, timings
+
+            # Как urllib: экранируем пробелы и прочие недопустимые символы в Location
+            location = urllib.parse.quote(location, encoding="iso-8859-1", safe=string.punctuation)
+            new_url = urllib.parse.urljoin(url, location)
+            if urllib.parse.urlsplit(new_url).scheme not in ("http", "https"):
+                # Редирект на javascript:, ftp: и т.п. urllib тоже не проходил
+                raise ValueError(f"Unsupported redirect scheme: {new_url}")
+
+            if status in (301, 302, 303) and method not in ("GET", "HEAD"):
+                method, body = "GET", None
+            url = new_url
+
+        raise ValueError(f"Too many redirects: {url}")
+
+    @staticmethod
+    def _host_key(url):
+        """Ключ хоста "host:port" для лимитера и breaker (ValueError при кривом порте)."""
+        parts = urllib.parse.urlsplit(url)
+        port = parts.port or (443 if parts.scheme.lower() == "https" else 80)
+        return f"{parts.hostname}:{port}"
+
+    def _throttle(self, url):
+        """Ждёт токен лимитера для хоста url; возвращает время ожидания в секундах."""
+        if self.limiter is None:
+            return 0.0
+        wait = self.limiter.reserve(self._host_key(url))
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def _send_once(self, method, url, body, stop_when=None, sink=None, extra_headers=None):
+        """
+        Один HTTP-обмен без редиректов. Берёт соединение из пула,
+        после полного чтения ответа возвращает его обратно
+        (если тело дочитано не до конца — закрывает).
+        Если переиспользованное соединение оказалось закрыто сервером,
+        повторяем запрос один раз на новом соединении.
+        Возвращает (status, headers, raw, truncated, phases), phases — фазы этого обмена.
+        """
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        headers = {"User-Agent": self.user_agent}
+        if self.compression:
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
+        if body is not None:
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        if extra_headers:
+            headers.update(extra_headers)
+
+        while True:
+            conn, reused = self.pool.acquire(scheme, host, port)
+            target = url.split("#", 1)[0] if conn.via_proxy else path
+            conn.connect_timings = None
+            try:
+                start = time.perf_counter()
+                conn.request(method, target, body=body, headers=headers)
+                sent = time.perf_counter()
+                response = conn.getresponse()
+                first_byte = time.perf_counter()
+                raw, truncated, reusable, wire = read_body(response, self.max_body_size, stop_when, sink)
+                done = time.perf_counter()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.pool.discard(conn)
+                if reused:
+                    # Сервер закрыл простаивающее соединение — пробуем новое
+                    continue
+                raise
+            except Exception:
+                self.pool.discard(conn)
+                raise
+
+            if response.will_close or not reusable:
+                self.pool.discard(conn)
+            else:
+                self.pool.release(scheme, host, port, conn)
+            self._count_bytes(wire, len(raw))
+
+            # conn.request() сам устанавливает соединение, если его ещё нет:
+            # DNS/connect/TLS вычитаем из времени отправки
+            phases = dict(conn.connect_timings or {"dns": 0.0, "connect": 0.0, "tls": 0.0})
+            setup = sum(phases.values())
+            if conn.connect_timings is None and not reused:
+                # Соединение через прокси: разбить установку на фазы нельзя
+                phases["connect"] = setup = sent - start
+            phases["ttfb"] = first_byte - start - setup
+            phases["body"] = done - first_byte
+            return response.status, response.headers, raw, truncated, phases
+
+
+class ScopedRequester:
+    """
+    "Вид" Requester для конкретного модуля: те же get/post/request/batch,
+    но каждый запрос помечен именем модуля (для счётчиков кэша проб).
+    Остальные атрибуты (timeout, last_url, ...) берутся у исходного Requester.
+    """
+
+    def __init__(self, requester, module):
+        self.requester = requester
+        self.module = module
+
+    def get(self, url, use_cache=True):
+        return self.requester.get(url, module=self.module, use_cache=use_cache)
+
+    def post(self, url, data, use_cache=True):
+        return self.requester.post(url, data, module=self.module, use_cache=use_cache)
+
+    def request(self, method, url, data=None, use_cache=True, stop_when=None, sink=None, headers=None):
+        return self.requester.request(method, url, data, module=self.module, use_cache=use_cache,
+                                      stop_when=stop_when, sink=sink, headers=headers)
+
+    def batch(self, probes):
+        for probe in probes:
+            probe.setdefault("module", self.module)
+        return self.requester.batch(probes)
+
+    def __getattr__(self, name):
+        return getattr(self.requester, name)
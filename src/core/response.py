@@ -0,0 +1,47 @@
+# coding: utf-8
+"""
+Файл: response.py
+-----------------
+Назначение:
+Объект ответа, который возвращает Requester.request().
+
+Раньше Requester возвращал только текст, а финальный URL клал в общее поле
+self.last_url. При запросах из нескольких потоков такие поля перетирают друг
+друга. Response несёт всё, что нужно сканеру, вместе с самим ответом:
+- status: HTTP-код ответа
+- headers: заголовки (http.client.HTTPMessage, доступ без учёта регистра)
+- url: финальный URL после редиректов
+- elapsed: время запроса в секундах (монотонные часы)
+- body: тело ответа (bytes)
+- text: тело, декодированное в строку (лениво, utf-8 с заменой ошибок)
+- truncated: None, если тело прочитано целиком; "size" — обрезано по --max-body-size;
+  "match" — чтение остановлено после найденной сигнатуры (stop_when)
+- timings: фазы запроса в секундах {"dns", "connect", "tls", "ttfb", "body", "total"}
+"""
+
+
+class Response:
+    def __init__(self, status, headers, url, elapsed, body, truncated=None, timings=None):
+        self.status = status
+        self.headers = headers
+        self.url = url
+        self.elapsed = elapsed
+        self.body = body
+        self.truncated = truncated
+        self.timings = timings or {}
+        self._text = None
+
+    @property
+    def ok(self):
+        """True, если статус < 400 (urllib в таких случаях не выбрасывал HTTPError)."""
+        return self.status < 400
+
+    @property
+    def text(self):
+        """Тело ответа как строка."""
+        if self._text is None:
+            self._text = self.body.decode("utf-8", errors="replace")
+        return self._text
+
+    def __repr__(self):
+        return f"<Response [{self.status}] {self.url}>"
@@ -0,0 +1,136 @@
+# coding: utf-8
+"""
+Файл: scan_pipeline.py
+----------------------
+Назначение:
+Потоковый скан: модули проверяют URL и формы по мере того, как краулер
+их находит, а не после окончания обхода.
+
+Раньше main() ждал crawler.run() целиком, и время скана было суммой
+обхода и проверок. ScanPipeline:
+- в отдельном потоке-производителе перебирает события краулера
+  (Crawler.crawl() отдаёт ("url", url) и ("form", form));
+- почти-дубликаты страниц (("duplicate", (url, representative))) модулям
+  не отдаются — их проверяет представитель кластера; они попадают в
+  urls и в duplicates для итогового лога;
+- главный поток собирает из очереди пачки (всё, что уже найдено,
+  но не больше batch_size событий) и отдаёт каждую пачку каждому модулю
+  (handler(requester, logger, urls, forms) — те же функции, что и раньше);
+- пачки выполняются в пуле из workers потоков (--module-workers), поэтому
+  даже при workers=1 проверки идут параллельно с обходом.
+
+Итог run() — найденные уязвимости в порядке модулей (внутри модуля —
+в порядке пачек), как при последовательном запуске. Как только пачка
+дала находки, это пишется в лог — первые результаты видны в начале скана.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Признак конца событий краулера в очереди
+_DONE = object()
+
+
+class ScanPipeline:
+    def __init__(self, handlers, requester, logger, workers=1, batch_size=20):
+        """
+        :param handlers: Список (имя модуля, функция handler(requester, logger, urls, forms)).
+        :param requester: Общий Requester.
+        :param logger: Logger сканера.
+        :param workers: Сколько пачек проверяется одновременно.
+        :param batch_size: Максимум событий (URL + форм) в одной пачке.
+        """
+        self.handlers = handlers
+        self.requester = requester
+        self.logger = logger
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+
+        # Всё, что нашёл краулер (для итогового лога)
+        self.urls = []
+        self.forms = []
+        self.duplicates = {}  # URL почти-дубликата -> URL представителя (не сканировался)
+
+        self._queue = queue.Queue()
+        self._error = None
+        self._started = None
+
+    def run(self, events):
+        """
+        Проверяет события events (итератор ("url", url) / ("form", form)),
+        пока они производятся. Возвращает список найденных уязвимостей.
+        """
+        self._started = time.monotonic()
+        producer = threading.Thread(target=self._produce, args=(events,), daemon=True)
+        producer.start()
+
+        futures = [[] for _ in self.handlers]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                urls, forms, done = self._next_batch()
+                if urls or forms:
+                    for i, (name, handler) in enumerate(self.handlers):
+                        future = executor.submit(self._scan, name, handler, urls, forms)
+                        futures[i].append(future)
+                if done:
+                    break
+
+        producer.join()
+        if self._error is not None:
+            raise self._error
+
+        results = []
+        for module_futures in futures:
+            for future in module_futures:
+                results.extend(future.result())
+        return results
+
+    def _produce(self, events):
+        try:
+            for event in events:
+                self._queue.put(event)
+        except Exception as e:  # ошибку краулера пробрасываем в run()
+            self._error = e
+        finally:
+            self._queue.put(_DONE)
+
+    def _next_batch(self):
+        """
+        Ждёт хотя бы одно событие и добирает то, что уже есть в очереди.
+        Возвращает (urls, forms, done): done — краулер закончил.
+        """
+        urls, forms = [], []
+        done = False
+        event = self._queue.get()
+        while True:
+            if event is _DONE:
+                done = True
+                break
+            kind, item = event
+            if kind == "duplicate":
+                url, representative = item
+                self.urls.append(url)
+                self.duplicates[url] = representative
+            else:
+                (urls if kind == "url" else forms).append(item)
+            if len(urls) + len(forms) >= self.batch_size:
+                break
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+        self.urls.extend(urls)
+        self.forms.extend(forms)
+        return urls, forms, done
+
+    def _scan(self, name, handler, urls, forms):
+        found = handler(self.requester, self.logger, urls, forms)
+        if found:
+            self.logger.info(
+                f"[{name}] {len(found)} finding(s) in {len(urls)} URLs / {len(forms)} forms "
+                f"({time.monotonic() - self._started:.1f}s into the scan)."
+            )
+        return found
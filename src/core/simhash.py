@@ -0,0 +1,131 @@
+# coding: utf-8
+"""
+Файл: simhash.py
+----------------
+Назначение:
+Поиск почти одинаковых страниц (near-duplicates) по SimHash.
+
+Один и тот же шаблон часто отдаётся под сотнями URL: варианты товара,
+локализованные зеркала, /item?id=N. Сканеры атакуют каждый такой URL, хотя
+за ними стоит один обработчик. Здесь:
+
+- simhash(text) — 64-битный отпечаток страницы: текст (вместе с именами тегов
+  и атрибутов) разбивается на слова, из слов — шинглы по SHINGLE подряд,
+  каждый шингл хэшируется blake2b. Бит отпечатка равен 1, если этот бит
+  равен 1 у большинства шинглов (с учётом числа повторов: разметка шаблона
+  повторяется часто и весит больше, чем уникальный текст страницы).
+  У похожих страниц отпечатки отличаются в немногих битах (расстояние Хэмминга);
+- SimHashIndex(distance) — кластеры страниц: первая страница кластера —
+  представитель, следующая страница попадает в кластер, если её отпечаток
+  отличается от отпечатка представителя не больше чем на distance бит.
+  Поиск — по принципу Дирихле: отпечаток режется на distance + 1 блоков,
+  и у отпечатков на расстоянии <= distance хотя бы один блок совпадает
+  целиком, поэтому сравниваем только с представителями из тех же корзин.
+
+Сравниваем только с представителями, а не со всеми членами кластера, — так
+кластер не "расползается" цепочкой похожих страниц.
+"""
+
+import hashlib
+import re
+from collections import Counter
+
+# Сколько слов в одном шингле
+SHINGLE = 3
+# Сколько символов страницы учитываем (хвост огромных страниц не меняет отпечаток)
+MAX_TEXT = 256 * 1024
+
+_WORD = re.compile(r"\w+")
+_SCRIPTS = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+
+def simhash(text):
+    """64-битный SimHash текста страницы (0 — в тексте нет слов)."""
+    words = _WORD.findall(_SCRIPTS.sub(" ", text[:MAX_TEXT]).lower())
+    if not words:
+        return 0
+    shingles = Counter(" ".join(words[i:i + SHINGLE]) for i in range(max(1, len(words) - SHINGLE + 1)))
+
+    # Шинглы с одинаковым весом считаем вместе: двоичные строки их хэшей подряд,
+    # срез [bit::64] — столбец одного бита, count("1") считает голоса на C-уровне
+    by_weight = {}
+    for shingle, weight in shingles.items():
+        by_weight.setdefault(weight, []).append(shingle)
+    votes = [0] * 64
+    for weight, group in by_weight.items():
+        bits = "".join(
+            format(int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big"), "064b")
+            for s in group
+        )
+        for bit in range(64):
+            votes[bit] += weight * bits[bit::64].count("1")
+
+    total = sum(shingles.values())
+    fingerprint = 0
+    for bit in range(64):
+        if votes[bit] * 2 > total:
+            fingerprint |= 1 << (63 - bit)
+    return fingerprint
+
+
+def hamming(a, b):
+    """Расстояние Хэмминга между двумя отпечатками."""
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    def __init__(self, distance=3):
+        """
+        :param distance: Максимальное расстояние Хэмминга до представителя кластера (0–31).
+        """
+        if not 0 <= distance < 32:
+            raise ValueError("distance must be between 0 and 31")
+        self.distance = distance
+
+        # Границы блоков для поиска по принципу Дирихле
+        blocks = distance + 1
+        edges = [64 * i // blocks for i in range(blocks + 1)]
+        self._blocks = [(edges[i], (1 << (edges[i + 1] - edges[i])) - 1) for i in range(blocks)]
+
+        self._buckets = {}      # (номер блока, значение блока) -> [(отпечаток, URL представителя)]
+        self.duplicates = {}    # URL почти-дубликата -> URL представителя
+        self.cluster_sizes = {}  # URL представителя -> сколько страниц в кластере
+
+    def add(self, url, fingerprint):
+        """
+        Относит страницу к кластеру. Возвращает URL представителя кластера
+        (сам url, если страница открывает новый кластер).
+        """
+        representative = self.find(fingerprint)
+        if representative is None:
+            self.cluster_sizes[url] = 1
+            for key in self._keys(fingerprint):
+                self._buckets.setdefault(key, []).append((fingerprint, url))
+            return url
+        if representative != url and url not in self.duplicates:
+            self.duplicates[url] = representative
+            self.cluster_sizes[representative] += 1
+        return representative
+
+    def find(self, fingerprint):
+        """URL ближайшего представителя в пределах distance или None."""
+        best, best_distance = None, self.distance + 1
+        for key in self._keys(fingerprint):
+            for other, url in self._buckets.get(key, ()):
+                d = hamming(fingerprint, other)
+                if d < best_distance:
+                    best, best_distance = url, d
+        return best
+
+    def stats(self):
+        """{"pages", "clusters", "duplicates", "largest": [(URL представителя, размер), ...]}"""
+        largest = sorted(self.cluster_sizes.items(), key=lambda item: -item[1])[:5]
+        return {
+            "pages": len(self.cluster_sizes) + len(self.duplicates),
+            "clusters": len(self.cluster_sizes),
+            "duplicates": len(self.duplicates),
+            "largest": [item for item in largest if item[1] > 1]
+        }
+
+    def _keys(self, fingerprint):
+        return [(i, (fingerprint >> shift) & mask) for i, (shift, mask) in enumerate(self._blocks)]
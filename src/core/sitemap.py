@@ -0,0 +1,201 @@
+# coding: utf-8
+"""
+Файл: sitemap.py
+----------------
+Назначение:
+Список URL сайта из robots.txt и sitemap.xml — "затравка" для очереди обхода.
+
+Краулер находит страницы только по ссылкам, уровень за уровнем до depth.
+На большом сайте карта сайта перечисляет те же страницы (и те, до которых
+по ссылкам дальше depth переходов) без скачивания промежуточных страниц.
+
+SitemapSeeder.urls(requester, start_url):
+- читает robots.txt (строки "Sitemap: ...") — если их нет, пробует /sitemap.xml;
+- скачивает карты по очереди: индекс карт (<sitemapindex>) добавляет в очередь
+  вложенные карты, набор URL (<urlset>) отдаёт URL из <loc>;
+- карты, сжатые целиком (sitemap.xml.gz — без Content-Encoding), распаковываются
+  по сигнатуре gzip;
+- XML разбирается потоково (xml.etree.ElementTree.XMLPullParser), пока тело
+  скачивается (sink для Requester.request), разобранные элементы сразу
+  удаляются из дерева — карта в 50 000 URL не строится в памяти целиком;
+- бюджет: не больше max_urls URL и max_sitemaps скачанных карт; карты с других
+  хостов не скачиваются (сканер не должен уходить с цели).
+
+stats() — {"sitemaps" (скачано), "failed", "urls" (отдано), "truncated" (бюджет исчерпан)}.
+"""
+
+import urllib.parse
+import xml.etree.ElementTree as ElementTree
+import zlib
+from collections import deque
+
+# Больше карта сайта быть не может (протокол sitemaps.org: 50 МБ без сжатия)
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+
+
+def _local_name(tag):
+    """Имя элемента без пространства имён ({http://...}loc -> loc)."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def robots_sitemaps(text, base_url):
+    """Абсолютные URL карт сайта из строк "Sitemap:" файла robots.txt."""
+    sitemaps = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "sitemap" and value.strip():
+            sitemaps.append(urllib.parse.urljoin(base_url, value.strip()))
+    return sitemaps
+
+
+class SitemapParser:
+    """
+    Потоковый разбор одной карты сайта (sink для body_reader.read_body:
+    reset(content_type), feed(data), finish(body)). После finish():
+    .urls — URL страниц (не больше limit), .sitemaps — вложенные карты,
+    .error — текст ошибки разбора или None (найденное до ошибки сохраняется).
+    """
+
+    def __init__(self, limit=0):
+        """:param limit: Сколько URL страниц собрать (0 — без ограничения)."""
+        self.limit = limit
+        self.reset("")
+
+    def reset(self, content_type):
+        self.urls = []
+        self.sitemaps = []
+        self.error = None
+        self.fed = 0
+        self._size = 0
+        self._gunzip = None
+        self._head = b""  # первые байты тела, пока не ясно, сжато ли оно
+        self._parser = ElementTree.XMLPullParser(("start", "end"))
+        self._root = None
+
+    def feed(self, data):
+        self.fed += len(data)
+        if self._parser is None:
+            return
+        if self._head is not None:
+            data = self._head + data
+            if len(data) < 2:
+                self._head = data
+                return
+            self._head = None
+            if data[:2] == b"\x1f\x8b":
+                # sitemap.xml.gz: файл сжат сам по себе, а не Content-Encoding ответа
+                self._gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            if self._gunzip is not None:
+                data = self._gunzip.decompress(data, max(1, MAX_SITEMAP_BYTES - self._size))
+            self._size += len(data)
+            if self._size > MAX_SITEMAP_BYTES:
+                raise ValueError(f"sitemap is larger than {MAX_SITEMAP_BYTES} bytes")
+            self._parser.feed(data)
+            self._read_events()
+        except (ElementTree.ParseError, zlib.error, ValueError) as e:
+            self._stop(str(e))
+
+    def finish(self, body):
+        if self.fed != len(body):
+            # Куски не подавались (например, ответ из кассеты) — разбираем тело целиком
+            self.reset("")
+            self.feed(body)
+        if self._parser is not None:
+            try:
+                self._parser.feed(self._head or b"")
+                self._parser.close()
+                self._read_events()
+            except ElementTree.ParseError as e:
+                self._stop(str(e))
+        self._parser = None
+
+    @property
+    def full(self):
+        return bool(self.limit) and len(self.urls) >= self.limit
+
+    def _read_events(self):
+        for event, element in self._parser.read_events():
+            if self._root is None:
+                self._root = element
+                continue
+            if event != "end":
+                continue
+            name = _local_name(element.tag)
+            if name == "loc":
+                location = (element.text or "").strip()
+                if not location:
+                    continue
+                if _local_name(self._root.tag) == "sitemapindex":
+                    self.sitemaps.append(location)
+                elif not self.full:
+                    self.urls.append(location)
+            elif name in ("url", "sitemap"):
+                # Запись разобрана — дерево карты не растёт
+                self._root.clear()
+        if self.full:
+            self._stop(None)
+
+    def _stop(self, error):
+        self.error = error
+        self._parser = None
+
+
+class SitemapSeeder:
+    def __init__(self, max_urls=10000, max_sitemaps=50):
+        """
+        :param max_urls: Сколько URL страниц взять из карт сайта всего.
+        :param max_sitemaps: Сколько файлов карт (включая вложенные) скачать.
+        """
+        self.max_urls = max_urls
+        self.max_sitemaps = max_sitemaps
+        self.fetched = 0
+        self.failed = 0
+        self.found = 0
+        self.truncated = False
+
+    def urls(self, requester, start_url):
+        """Генератор URL страниц из карт сайта start_url (в порядке карт)."""
+        parts = urllib.parse.urlsplit(start_url)
+        root = f"{parts.scheme}://{parts.netloc}/"
+
+        queue = deque(self._robots_sitemaps(requester, root) or [root + "sitemap.xml"])
+        seen = set(queue)
+        while queue:
+            if self.found >= self.max_urls or self.fetched >= self.max_sitemaps:
+                self.truncated = True
+                return
+            sitemap = queue.popleft()
+            if urllib.parse.urlsplit(sitemap).netloc != parts.netloc:
+                continue
+
+            parser = SitemapParser(self.max_urls - self.found)
+            response = requester.request("GET", sitemap, module="crawler", use_cache=False, sink=parser)
+            self.fetched += 1
+            if response is None or not response.ok:
+                self.failed += 1
+                continue
+            parser.finish(response.body)
+            if parser.error:
+                self.failed += 1
+            if parser.full:
+                self.truncated = True
+
+            for nested in parser.sitemaps:
+                nested = urllib.parse.urljoin(sitemap, nested)
+                if nested not in seen:
+                    seen.add(nested)
+                    queue.append(nested)
+            for url in parser.urls:
+                self.found += 1
+                yield urllib.parse.urljoin(sitemap, url)
+
+    def stats(self):
+        return {"sitemaps": self.fetched, "failed": self.failed, "urls": self.found, "truncated": self.truncated}
+
+    def _robots_sitemaps(self, requester, root):
+        response = requester.request("GET", root + "robots.txt", module="crawler", use_cache=False)
+        if response is None or not response.ok:
+            return []
+        return robots_sitemaps(response.text, root)
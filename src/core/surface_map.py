@@ -0,0 +1,191 @@
+# coding: utf-8
+"""
+Файл: surface_map.py
+--------------------
+Назначение:
+Обход и скан — отдельными запусками (--crawl-only FILE и --scan-from FILE).
+
+Раньше main.py всегда обходил сайт и сканировал его в одном процессе: чтобы
+прогнать другой набор --modules по той же поверхности атаки, сайт приходилось
+обходить заново. Теперь обход можно сохранить в карту поверхности — SQLite-файл
+с индексами:
+- urls — найденные URL в порядке обнаружения; у почти-дубликата — URL
+  представителя кластера (duplicate_of), у скачанных страниц — SimHash (hex);
+- forms — формы в том виде, в каком их отдал обход (без повторов, если не
+  --no-form-dedup), с сигнатурой form_signature из form_index.py;
+- injection_points — точки внедрения: параметры query у URL и имена полей форм
+  (kind "query"/"form", method, target — URL без query или action формы, param);
+  по ним можно выбирать цели запросом к файлу, не разбирая URL и формы;
+- meta — start_url, depth и версия формата.
+
+SurfaceMapWriter передаётся краулеру (Crawler(surface=...)): он получает
+события Crawler.crawl() (add(kind, item)) и SimHash скачанных страниц
+(fingerprint(url, value)) и пишет их пачками, одной транзакцией на пачку.
+SurfaceMapReader.events() отдаёт те же события ("url", "form", "duplicate")
+в исходном порядке — ScanPipeline сканирует их так же, как при обходе.
+"""
+
+import json
+import sqlite3
+import threading
+import urllib.parse
+
+from src.core.form_index import form_signature
+
+# Версия формата файла: другой — ValueError при чтении
+VERSION = 1
+
+_SCHEMA = (
+    "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE urls (seq INTEGER NOT NULL, url TEXT PRIMARY KEY, duplicate_of TEXT, fingerprint TEXT)",
+    "CREATE TABLE forms (seq INTEGER PRIMARY KEY, signature TEXT NOT NULL, form TEXT NOT NULL)",
+    "CREATE TABLE injection_points (kind TEXT NOT NULL, method TEXT NOT NULL, target TEXT NOT NULL, "
+    "param TEXT NOT NULL, PRIMARY KEY (kind, method, target, param))",
+    "CREATE INDEX injection_points_param ON injection_points (param)",
+    "CREATE INDEX urls_seq ON urls (seq)",
+    "CREATE INDEX forms_signature ON forms (signature)",
+)
+
+
+def injection_points(kind, item):
+    """Точки внедрения URL ("url"/"duplicate") или формы: [(kind, method, target, param), ...]."""
+    if kind == "form":
+        method = item["method"].upper()
+        names = sorted({field["name"] for field in item["inputs"] if field["name"]})
+        return [("form", method, item["action"], name) for name in names]
+    url = item[0] if kind == "duplicate" else item
+    parts = urllib.parse.urlsplit(url)
+    target = urllib.parse.urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+    names = sorted({name for name, _ in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)})
+    return [("query", "GET", target, name) for name in names]
+
+
+class SurfaceMapWriter:
+    def __init__(self, path, start_url, depth, write_batch=200):
+        """
+        :param path: SQLite-файл карты (создаётся; карта прошлого обхода в нём заменяется).
+        :param start_url: С какого URL начат обход.
+        :param depth: Глубина обхода.
+        :param write_batch: Сколько событий копим перед записью в файл.
+        """
+        self.path = path
+        self.write_batch = max(1, write_batch)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._db:
+            self._db.execute("BEGIN")
+            for table in ("meta", "urls", "forms", "injection_points"):
+                self._db.execute(f"DROP TABLE IF EXISTS {table}")
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+            self._db.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ("version", str(VERSION)), ("start_url", start_url), ("depth", str(depth))
+            ])
+        self._seq = 0
+        self._urls = []
+        self._forms = []
+        self._points = []
+        self._fingerprints = {}  # URL -> SimHash страницы, пока не пришло её событие
+        self._lock = threading.Lock()
+
+    def fingerprint(self, url, value):
+        """SimHash скачанной страницы url (записывается вместе с её событием)."""
+        with self._lock:
+            self._fingerprints[url] = value
+
+    def add(self, kind, item):
+        """Событие обхода: ("url", url), ("form", form) или ("duplicate", (url, representative))."""
+        with self._lock:
+            self._seq += 1
+            if kind == "form":
+                signature = json.dumps(form_signature(item))
+                self._forms.append((self._seq, signature, json.dumps(item)))
+            else:
+                url, representative = item if kind == "duplicate" else (item, None)
+                value = self._fingerprints.pop(url, None)
+                self._urls.append((self._seq, url, representative, None if value is None else f"{value:016x}"))
+            self._points.extend(injection_points(kind, item))
+            if len(self._urls) + len(self._forms) >= self.write_batch:
+                self._flush()
+
+    def close(self):
+        with self._lock:
+            if self._db is None:
+                return
+            self._flush()
+            self._db.close()
+            self._db = None
+
+    def _flush(self):
+        if not (self._urls or self._forms):
+            return
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT INTO urls VALUES (?, ?, ?, ?)", self._urls)
+            self._db.executemany("INSERT INTO forms VALUES (?, ?, ?)", self._forms)
+            # Одна точка внедрения встречается у многих URL и форм — хранится один раз
+            self._db.executemany("INSERT OR IGNORE INTO injection_points VALUES (?, ?, ?, ?)", self._points)
+        self._urls = []
+        self._forms = []
+        self._points = []
+
+
+class SurfaceMapReader:
+    def __init__(self, path):
+        """
+        :param path: Карта, записанная SurfaceMapWriter.
+        OSError — файла нет, ValueError — файл не карта поверхности или другой версии.
+        """
+        self.path = path
+        try:
+            # События читаются в потоке-производителе ScanPipeline
+            self._db = sqlite3.connect(f"file:{urllib.parse.quote(path)}?mode=ro", uri=True, check_same_thread=False)
+            meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        except sqlite3.Error as e:
+            raise OSError(f"{path}: {e}")
+        if meta.get("version") != str(VERSION):
+            self._db.close()
+            raise ValueError(f"{path}: unsupported surface map version {meta.get('version')} (expected {VERSION})")
+        self.start_url = meta["start_url"]
+        self.depth = int(meta["depth"])
+
+    def events(self):
+        """События обхода в исходном порядке (как Crawler.crawl())."""
+        rows = self._db.execute(
+            "SELECT seq, url, duplicate_of, NULL FROM urls "
+            "UNION ALL SELECT seq, NULL, NULL, form FROM forms ORDER BY seq"
+        )
+        for _, url, representative, form in rows:
+            if form is not None:
+                yield "form", json.loads(form)
+            elif representative is not None:
+                yield "duplicate", (url, representative)
+            else:
+                yield "url", url
+
+    def fingerprints(self):
+        """{URL: SimHash} скачанных страниц."""
+        rows = self._db.execute("SELECT url, fingerprint FROM urls WHERE fingerprint IS NOT NULL")
+        return {url: int(value, 16) for url, value in rows}
+
+    def injection_points(self, param=None):
+        """[(kind, method, target, param), ...] — все или только с именем param."""
+        query = "SELECT kind, method, target, param FROM injection_points"
+        if param is None:
+            return self._db.execute(query + " ORDER BY target, param").fetchall()
+        return self._db.execute(query + " WHERE param = ? ORDER BY target", (param,)).fetchall()
+
+    def stats(self):
+        """{"urls", "duplicates", "forms", "injection_points", "fingerprints"}"""
+        return {
+            "urls": self._count("SELECT COUNT(*) FROM urls"),
+            "duplicates": self._count("SELECT COUNT(*) FROM urls WHERE duplicate_of IS NOT NULL"),
+            "forms": self._count("SELECT COUNT(*) FROM forms"),
+            "injection_points": self._count("SELECT COUNT(*) FROM injection_points"),
+            "fingerprints": self._count("SELECT COUNT(*) FROM urls WHERE fingerprint IS NOT NULL")
+        }
+
+    def close(self):
+        self._db.close()
+
+    def _count(self, query):
+        return self._db.execute(query).fetchone()[0]
@@ -0,0 +1,183 @@
+# coding: utf-8
+"""
+Файл: url_traps.py
+------------------
+Назначение:
+Канонизация URL и обнаружение "ловушек" для краулера.
+
+Календари, ?page=N, идентификаторы сессий в query и перестановки параметров
+сортировки дают тысячи разных URL, ведущих на один и тот же обработчик.
+Раньше _normalize_url убирал только фрагмент.
+
+canonicalize_url(url):
+- удаляет известные параметры сессии (SESSION_PARAMS) из query и из
+  "матричной" части пути (/cart;jsessionid=...);
+- сортирует параметры query по имени (значения одного имени — в исходном
+  порядке). Кодировка параметров не меняется — строка только переставляется.
+
+TrapDetector.allow(url) решает, стоит ли ставить ссылку в очередь. Правила:
+- path_loop: один и тот же сегмент пути повторяется больше max_repeats раз
+  (/a/b/a/b/a/b/... — относительные ссылки, которые "растут" сами по себе);
+- param_values: шаблон URL — путь, где числа, даты и идентификаторы заменены
+  на {n}/{date}/{id}, плюс набор имён параметров. Для каждого параметра
+  шаблона запоминаем не больше max_values_per_param различных значений;
+  ссылка с новым значением сверх лимита — ловушка (календарь, ?page=N);
+- template: не больше max_urls_per_template различных URL на шаблон
+  (/calendar/2024/05/01, /calendar/2024/05/02, ...).
+
+stats() — сколько ссылок проверено, сколько различных URL отброшено
+(сэкономленные запросы; после max_rejected отброшенных URL повторная ссылка
+на отброшенный URL считается заново) по каждому правилу и сколько ссылок переписано
+канонизацией; top_templates — шаблоны, на которых отброшено больше всего URL.
+Все методы вызываются из одного потока обхода.
+"""
+
+import hashlib
+import re
+import urllib.parse
+from collections import Counter
+
+# Имена параметров сессии (без учёта регистра). Только однозначные имена платформ:
+# общие вроде "sid" или "session_id" часто несут данные приложения, и канонизация
+# прятала бы от сканеров параметр, который может быть уязвим
+SESSION_PARAMS = frozenset({"jsessionid", "phpsessid", "aspsessionid", "asp.net_sessionid"})
+
+_NUMBER = re.compile(r"^\d+$")
+_DATE = re.compile(r"^\d{4}-\d{1,2}(-\d{1,2})?$")
+_IDENTIFIER = re.compile(r"^(?=.*\d)[0-9a-fA-F-]{8,}$")
+
+
+def _strip_session_segments(path):
+    """Удаляет ;jsessionid=... и подобные параметры сессии из сегментов пути."""
+    if ";" not in path:
+        return path
+    segments = []
+    for segment in path.split("/"):
+        name, *params = segment.split(";")
+        kept = [p for p in params if p.split("=", 1)[0].lower() not in SESSION_PARAMS]
+        segments.append(";".join([name] + kept))
+    return "/".join(segments)
+
+
+def canonicalize_url(url):
+    """Канонический вид URL: без параметров сессии, параметры query отсортированы по имени."""
+    parts = urllib.parse.urlsplit(url)
+    path = _strip_session_segments(parts.path)
+    query = parts.query
+    if query:
+        pairs = [pair for pair in query.split("&") if pair]
+        pairs = [pair for pair in pairs
+                 if urllib.parse.unquote_plus(pair.split("=", 1)[0]).lower() not in SESSION_PARAMS]
+        # sorted() устойчива: значения одного параметра сохраняют порядок
+        query = "&".join(sorted(pairs, key=lambda pair: pair.split("=", 1)[0]))
+    return urllib.parse.urlunsplit((parts.scheme, parts.netloc, path, query, parts.fragment))
+
+
+def _segment_template(segment):
+    if _NUMBER.match(segment):
+        return "{n}"
+    if _DATE.match(segment):
+        return "{date}"
+    if _IDENTIFIER.match(segment):
+        return "{id}"
+    return segment
+
+
+def _template(netloc, segments, names):
+    return (netloc + "/" + "/".join(_segment_template(s) for s in segments)
+            + ("?" + ",".join(names) if names else ""))
+
+
+def url_template(url):
+    """Шаблон URL: путь с {n}/{date}/{id} вместо чисел, дат и идентификаторов плюс имена параметров."""
+    parts = urllib.parse.urlsplit(url)
+    segments = [s for s in parts.path.split("/") if s]
+    names = sorted({name for name, _ in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)})
+    return _template(parts.netloc, segments, names)
+
+
+class TrapDetector:
+    def __init__(self, max_values_per_param=50, max_urls_per_template=500, max_repeats=3, max_rejected=100000):
+        """
+        :param max_values_per_param: Сколько различных значений параметра шаблона обходим.
+        :param max_urls_per_template: Сколько различных URL одного шаблона обходим.
+        :param max_repeats: Сколько раз сегмент может повториться в пути.
+        :param max_rejected: Сколько отпечатков отброшенных URL помнить для подсчёта без повторов.
+        """
+        self.max_values_per_param = max_values_per_param
+        self.max_urls_per_template = max_urls_per_template
+        self.max_repeats = max_repeats
+        self.max_rejected = max_rejected
+
+        self._values = {}     # (template, param) -> set значений
+        self._urls = {}       # template -> set 8-байтных отпечатков URL
+        # Отпечатки отброшенных URL (считаем каждый один раз). Решение по URL от них
+        # не зависит — правила детерминированы, — поэтому множество ограничено
+        # max_rejected: на ловушке в миллионы URL оно не растёт без конца
+        self._rejected = set()
+        self.checked = 0
+        self.rewritten = 0
+        self.skipped = Counter()           # правило -> сколько ссылок отброшено
+        self._skipped_templates = Counter()  # шаблон -> сколько ссылок отброшено
+
+    def canonicalize(self, url):
+        """canonicalize_url() + учёт переписанных ссылок."""
+        canonical = canonicalize_url(url)
+        if canonical != url:
+            self.rewritten += 1
+        return canonical
+
+    def allow(self, url):
+        """True — ссылку стоит обойти, False — это ловушка (причина учитывается в stats())."""
+        self.checked += 1
+        fingerprint = int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big")
+        if fingerprint in self._rejected:
+            return False
+
+        parts = urllib.parse.urlsplit(url)
+        segments = [s for s in parts.path.split("/") if s]
+
+        if segments and max(Counter(segments).values()) > self.max_repeats:
+            return self._skip("path_loop", parts.path, fingerprint)
+
+        params = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        names = sorted({name for name, _ in params})
+        template = _template(parts.netloc, segments, names)
+
+        # Сначала проверяем все лимиты, запоминаем значения — только если URL принят
+        new_values = []
+        for name, value in params:
+            seen = self._values.setdefault((template, name), set())
+            if value not in seen:
+                if len(seen) >= self.max_values_per_param:
+                    return self._skip("param_values", template, fingerprint)
+                new_values.append((seen, value))
+
+        urls = self._urls.setdefault(template, set())
+        if fingerprint not in urls and len(urls) >= self.max_urls_per_template:
+            return self._skip("template", template, fingerprint)
+
+        urls.add(fingerprint)
+        for seen, value in new_values:
+            seen.add(value)
+        return True
+
+    def stats(self):
+        """
+        {"checked", "skipped" (всего), "by_rule": {правило: n}, "rewritten",
+         "top_templates": [(шаблон, n), ...]}
+        """
+        return {
+            "checked": self.checked,
+            "skipped": sum(self.skipped.values()),
+            "by_rule": dict(self.skipped),
+            "rewritten": self.rewritten,
+            "top_templates": self._skipped_templates.most_common(5)
+        }
+
+    def _skip(self, rule, template, fingerprint):
+        if len(self._rejected) < self.max_rejected:
+            self._rejected.add(fingerprint)
+        self.skipped[rule] += 1
+        self._skipped_templates[template] += 1
+        return False
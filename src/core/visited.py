@@ -0,0 +1,180 @@
+# coding: utf-8
+"""
+Файл: visited.py
+----------------
+Назначение:
+Компактное множество посещённых URL для больших обходов.
+
+Обычный set строк на обходе в миллионы URL съедает гигабайты: каждая строка
+URL — отдельный объект (~50 байт заголовка + сам URL) плюс слот в хэш-таблице.
+Здесь три реализации с одним интерфейсом (add, in, len, memory_bytes()):
+
+- ExactVisitedSet ("exact"): обычный set строк — как раньше; его можно
+  перебирать, поэтому Crawler.run() по-прежнему возвращает множество URL.
+- FingerprintSet ("fingerprint"): вместо строки храним 64-битный отпечаток
+  (blake2b) в открытой хэш-таблице на array('Q') — 16–32 байта на URL.
+  Вероятность коллизии для 1.5 млн URL ~ n^2 / 2^65, т.е. порядка 1e-7.
+- BloomVisitedSet ("bloom"): масштабируемый фильтр Блума с заданной долей
+  ложных срабатываний (error_rate): единицы байт на URL. Ложное срабатывание
+  означает, что новый URL сочтён посещённым и не будет обойдён.
+  Когда слой заполнен до capacity, добавляется новый слой вдвое больше
+  с вдвое меньшей долей ошибок, так что суммарная доля не превышает error_rate.
+
+Перебирать URL можно только у "exact"; в компактных режимах найденные URL
+приходят событиями Crawler.crawl(). После --resume URL прошлых запусков
+тоже не берутся из visited: Crawler читает их из журнала контрольной точки
+(checkpoint.FoundUrlLog), поэтому сканеры получают их в любом режиме.
+"""
+
+import hashlib
+import math
+import sys
+from array import array
+
+MODES = ("exact", "fingerprint", "bloom")
+
+
+def _digest(url, size):
+    return hashlib.blake2b(url.encode("utf-8", "surrogatepass"), digest_size=size).digest()
+
+
+class ExactVisitedSet(set):
+    """set строк URL + memory_bytes()."""
+
+    def memory_bytes(self):
+        # Оценка: таблица set и сами строки (обходит все элементы — вызывать в конце обхода)
+        return sys.getsizeof(self) + sum(sys.getsizeof(url) for url in self)
+
+
+class FingerprintSet:
+    # Максимальная заполненность таблицы перед увеличением
+    MAX_LOAD = 0.5
+
+    def __init__(self, initial_slots=1024):
+        self._slots = array("Q", bytes(8 * initial_slots))
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, url):
+        slots = self._slots
+        fp = self._fingerprint(url)
+        i = fp % len(slots)
+        while slots[i]:
+            if slots[i] == fp:
+                return True
+            i = (i + 1) % len(slots)
+        return False
+
+    def add(self, url):
+        if (self._count + 1) > len(self._slots) * self.MAX_LOAD:
+            self._grow()
+        if self._insert(self._slots, self._fingerprint(url)):
+            self._count += 1
+
+    def memory_bytes(self):
+        return self._slots.itemsize * len(self._slots)
+
+    @staticmethod
+    def _fingerprint(url):
+        # 0 — признак пустого слота
+        return int.from_bytes(_digest(url, 8), "big") or 1
+
+    @staticmethod
+    def _insert(slots, fp):
+        """Кладёт отпечаток в таблицу (линейное пробирование). False — он уже там был."""
+        i = fp % len(slots)
+        while slots[i]:
+            if slots[i] == fp:
+                return False
+            i = (i + 1) % len(slots)
+        slots[i] = fp
+        return True
+
+    def _grow(self):
+        old = self._slots
+        self._slots = array("Q", bytes(8 * len(old) * 2))
+        for fp in old:
+            if fp:
+                self._insert(self._slots, fp)
+
+
+class _BloomLayer:
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hashes = max(1, int(round(self.bits / capacity * math.log(2))))
+        self.array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def positions(self, h1, h2):
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def __contains__(self, hashes):
+        array_ = self.array
+        return all(array_[p >> 3] & (1 << (p & 7)) for p in self.positions(*hashes))
+
+    def add(self, hashes):
+        for p in self.positions(*hashes):
+            self.array[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class BloomVisitedSet:
+    # Во сколько раз растёт ёмкость и уменьшается доля ошибок нового слоя
+    GROWTH = 2
+    TIGHTENING = 0.5
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        """
+        :param capacity: Ожидаемое число URL (ёмкость первого слоя).
+        :param error_rate: Допустимая доля ложных срабатываний (0 < error_rate < 1).
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.error_rate = error_rate
+        # Сумма геометрической прогрессии ошибок слоёв не превышает error_rate
+        self._layers = [_BloomLayer(max(1, capacity), error_rate * (1 - self.TIGHTENING))]
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, url):
+        hashes = self._hashes(url)
+        return any(hashes in layer for layer in self._layers)
+
+    def add(self, url):
+        hashes = self._hashes(url)
+        if any(hashes in layer for layer in self._layers):
+            return
+        layer = self._layers[-1]
+        if layer.count >= layer.capacity:
+            layer = _BloomLayer(
+                layer.capacity * self.GROWTH,
+                self.error_rate * (1 - self.TIGHTENING) * self.TIGHTENING ** len(self._layers)
+            )
+            self._layers.append(layer)
+        layer.add(hashes)
+        self._count += 1
+
+    def memory_bytes(self):
+        return sum(len(layer.array) for layer in self._layers)
+
+    @staticmethod
+    def _hashes(url):
+        digest = _digest(url, 16)
+        # Двойное хэширование: k позиций из двух 64-битных хэшей (h2 нечётный)
+        return int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+
+
+def make_visited_set(mode="exact", capacity=1000000, error_rate=0.001):
+    """Создаёт множество посещённых URL для режима mode (см. MODES)."""
+    if mode == "exact":
+        return ExactVisitedSet()
+    if mode == "fingerprint":
+        return FingerprintSet()
+    if mode == "bloom":
+        return BloomVisitedSet(capacity=capacity, error_rate=error_rate)
+    raise ValueError(f"Unknown visited set mode: {mode}")
@@ -3,6 +3,19 @@
 # Общие функции для Directory Traversal:
 # генерация полезных путей, анализ ответа на сигнатуры (например, "root:x:0:0" в /etc/passwd).
 
+import re
+
+# Сигнатуры содержимого системных файлов:
+#   - root:x:0:0     (/etc/passwd)
+#   - [boot loader]  (boot.ini)
+#   - [extensions]   (win.ini)
+#   - root::         (shadow)
+# Регекс передаётся в пробы как stop_when: тело дочитывается только до совпадения.
+SUSPICIOUS_PATTERN = re.compile(
+    "|".join(re.escape(sig) for sig in ["root:x:0:0", "[boot loader]", "[extensions]", "root::"]),
+    re.IGNORECASE
+)
+
 def generate_traversal_payloads():
     """
     Генерирует набор базовых 'directory traversal' пэйлоадов:
@@ -41,14 +54,4 @@ def is_suspicious_response(response_text):
     """
     if not response_text:
         return False
-    signatures = [
-        "root:x:0:0",   # /etc/passwd
-        "[boot loader]",  # boot.ini
-        "[extensions]",   # win.ini
-        "root::",         # shadow
-    ]
-    lower_resp = response_text.lower()
-    for sig in signatures:
-        if sig.lower() in lower_resp:
-            return True
-    return False
+    return SUSPICIOUS_PATTERN.search(response_text) is not None
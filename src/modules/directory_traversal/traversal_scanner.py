@@ -3,7 +3,7 @@
 # Основной класс DirectoryTraversalScanner
 
 import urllib.parse
-from .traversal_helpers import generate_traversal_payloads, is_suspicious_response
+from .traversal_helpers import generate_traversal_payloads, is_suspicious_response, SUSPICIOUS_PATTERN
 
 class DirectoryTraversalScanner:
     """
@@ -22,6 +22,7 @@ class DirectoryTraversalScanner:
         подставляем payloads, проверяем ответ.
         """
         results = []
+        probes = []
         for url in urls:
             parsed = urllib.parse.urlparse(url)
             query_params = urllib.parse.parse_qs(parsed.query)
@@ -37,14 +38,18 @@ class DirectoryTraversalScanner:
                         (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
                     )
 
-                    resp_text = self.requester.get(new_url)
-                    if is_suspicious_response(resp_text):
-                        results.append({
-                            "module": "directory_traversal",
-                            "url": new_url,
-                            "param": param_name,
-                            "payload": payload
-                        })
+                    probes.append({"method": "GET", "url": new_url, "param": param_name, "payload": payload,
+                                   "stop_when": SUSPICIOUS_PATTERN})
+
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            if is_suspicious_response(resp_text):
+                results.append({
+                    "module": "directory_traversal",
+                    "url": probe["url"],
+                    "param": probe["param"],
+                    "payload": probe["payload"]
+                })
         return results
 
     def scan_forms(self, forms):
@@ -56,6 +61,7 @@ class DirectoryTraversalScanner:
         results = []
         import urllib
 
+        probes = []
         for form in forms:
             method = form["method"].lower()
             if method not in ("get", "post"):
@@ -70,16 +76,22 @@ class DirectoryTraversalScanner:
                         data[inp["name"]] = inp["value"]
 
                 if method == "post":
-                    resp_text = self.requester.post(form["action"], data)
+                    probes.append({"method": "POST", "url": form["action"], "data": data,
+                                   "form_action": form["action"], "payload": payload,
+                                   "stop_when": SUSPICIOUS_PATTERN})
                 else:
                     query_str = urllib.parse.urlencode(data)
                     new_url = form["action"] + "?" + query_str
-                    resp_text = self.requester.get(new_url)
+                    probes.append({"method": "GET", "url": new_url,
+                                   "form_action": form["action"], "payload": payload,
+                                   "stop_when": SUSPICIOUS_PATTERN})
 
-                if is_suspicious_response(resp_text):
-                    results.append({
-                        "module": "directory_traversal",
-                        "form_action": form["action"],
-                        "payload": payload
-                    })
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            if is_suspicious_response(resp_text):
+                results.append({
+                    "module": "directory_traversal",
+                    "form_action": probe["form_action"],
+                    "payload": probe["payload"]
+                })
         return results
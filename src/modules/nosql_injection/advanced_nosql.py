@@ -33,9 +33,10 @@ class AdvancedNoSQLiScanner(NoSQLiScanner):
                         (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
                     )
 
-                    start = time.time()
-                    resp_text = self.requester.get(new_url)
-                    elapsed = time.time() - start
+                    start = time.perf_counter()
+                    response = self.requester.request("GET", new_url)
+                    # Время из ответа (может прийти из кэша проб), иначе — по часам
+                    elapsed = response.elapsed if response is not None else time.perf_counter() - start
 
                     if elapsed > self.delay_threshold:
                         results.append({
@@ -14,6 +14,7 @@ class SimpleNoSQLiScanner(NoSQLiScanner):
         Если видим ошибки NoSQL — докладываем уязвимость.
         """
         results = []
+        probes = []
         for url in urls:
             parsed = urllib.parse.urlparse(url)
             query_params = urllib.parse.parse_qs(parsed.query)
@@ -29,21 +30,24 @@ class SimpleNoSQLiScanner(NoSQLiScanner):
                         (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
                     )
 
-                    resp_text = self.requester.get(new_url)
-                    # Проверяем ошибки/результат
-                    if self._contains_nosql_error(resp_text):
-                        results.append({
-                            "module": "nosql_injection",
-                            "type": "simple_nosql",
-                            "url": new_url,
-                            "param": param_name,
-                            "payload": payload,
-                            "issue": "NoSQL error found"
-                        })
-                    else:
-                        # Можно дополнительно смотреть, вернулось ли "много" данных
-                        # (e.g. как '1=1' в SQL). Но упрощённо только ищем ошибки.
-                        pass
+                    probes.append({"method": "GET", "url": new_url, "param": param_name, "payload": payload})
+
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            # Проверяем ошибки/результат
+            if self._contains_nosql_error(resp_text):
+                results.append({
+                    "module": "nosql_injection",
+                    "type": "simple_nosql",
+                    "url": probe["url"],
+                    "param": probe["param"],
+                    "payload": probe["payload"],
+                    "issue": "NoSQL error found"
+                })
+            else:
+                # Можно дополнительно смотреть, вернулось ли "много" данных
+                # (e.g. как '1=1' в SQL). Но упрощённо только ищем ошибки.
+                pass
         return results
 
     def scan_forms(self, forms):
@@ -52,6 +56,7 @@ class SimpleNoSQLiScanner(NoSQLiScanner):
         Если POST, отправляем data.
         """
         results = []
+        probes = []
         for form in forms:
             method = form["method"].lower()
             if method not in ("get", "post"):
@@ -67,19 +72,23 @@ class SimpleNoSQLiScanner(NoSQLiScanner):
                         data[inp["name"]] = inp["value"]
 
                 if method == "post":
-                    resp_text = self.requester.post(form["action"], data)
+                    probes.append({"method": "POST", "url": form["action"], "data": data,
+                                   "form_action": form["action"], "payload": payload})
                 else:
                     query = urllib.parse.urlencode(data)
                     new_url = form["action"] + "?" + query
-                    resp_text = self.requester.get(new_url)
+                    probes.append({"method": "GET", "url": new_url,
+                                   "form_action": form["action"], "payload": payload})
 
-                if self._contains_nosql_error(resp_text):
-                    results.append({
-                        "module": "nosql_injection",
-                        "type": "simple_nosql",
-                        "form_action": form["action"],
-                        "payload": payload,
-                        "issue": "NoSQL error found"
-                    })
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            if self._contains_nosql_error(resp_text):
+                results.append({
+                    "module": "nosql_injection",
+                    "type": "simple_nosql",
+                    "form_action": probe["form_action"],
+                    "payload": probe["payload"],
+                    "issue": "NoSQL error found"
+                })
 
         return results
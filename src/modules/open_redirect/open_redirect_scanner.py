@@ -6,8 +6,11 @@ open_redirect_scanner.py
 1) Ищет в URL/формах "подозрительные" параметры: next, url, redirect, ...
 2) Подставляет payload (например, http://evil.com)
 3) Делает запрос через Requester
-4) Смотрит, если final_url (self.requester.last_url) указывает на внешний сайт,
-   считаем это уязвимостью.
+4) Смотрит, если final_url (response.url — финальный адрес после редиректов)
+   указывает на внешний сайт, считаем это уязвимостью.
+
+Финальный URL берём из объекта ответа, а не из общего requester.last_url,
+поэтому пробы можно отправлять пачкой и из нескольких потоков.
 """
 
 import urllib.parse
@@ -26,9 +29,10 @@ class OpenRedirectScanner:
         """
         Обходит все URL (в виде set или list), ищет подозрительные параметры
         и подставляет open-redirect-пэйлоады (например, http://evil.com).
-        Если Requester сохраняет финальный URL (last_url), проверяем, внешний ли он.
+        Финальный URL (response.url) проверяем: внешний ли он.
         """
         results = []
+        probes = []
 
         # Преобразуем urls к списку (иначе urls[0] упадёт при set)
         url_list = list(urls)
@@ -59,21 +63,21 @@ class OpenRedirectScanner:
                         (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
                     )
 
-                    # Делаем GET-запрос
-                    resp_text = self.requester.get(new_url)
+                    probes.append({"method": "GET", "url": new_url, "param": param_name, "payload": payload})
 
-                    # Забираем конечный URL (например, после 3xx)
-                    final_url = self.requester.last_url
+        for probe, response in self.requester.batch(probes):
+            # Забираем конечный URL (например, после 3xx)
+            final_url = response.url if response else None
 
-                    # Если есть final_url и оно внешнее — уязвимость
-                    if final_url and is_external_url(final_url, domain):
-                        results.append({
-                            "module": "open_redirect",
-                            "url": new_url,
-                            "param": param_name,
-                            "payload": payload,
-                            "redirect_to": final_url
-                        })
+            # Если есть final_url и оно внешнее — уязвимость
+            if final_url and is_external_url(final_url, domain):
+                results.append({
+                    "module": "open_redirect",
+                    "url": probe["url"],
+                    "param": probe["param"],
+                    "payload": probe["payload"],
+                    "redirect_to": final_url
+                })
 
         return results
 
@@ -81,9 +85,10 @@ class OpenRedirectScanner:
         """
         Аналогично scan_urls, но для HTML-форм.
         Ищем поля с name=next/url/redirect..., подставляем payload,
-        делаем запрос, берём self.requester.last_url, проверяем внешний ли домен.
+        делаем запрос, берём response.url, проверяем внешний ли домен.
         """
         results = []
+        probes = []
 
         # (Если нужен домен исходного сайта, можно передавать отдельно; здесь упрощённо)
         domain = None  # Или динамически брать из form["action"]
@@ -119,21 +124,24 @@ class OpenRedirectScanner:
                             data[inp["name"]] = inp["value"]
 
                     if method == "post":
-                        resp_text = self.requester.post(action, data)
+                        probes.append({"method": "POST", "url": action, "data": data,
+                                       "form_action": action, "param": param_name, "payload": payload})
                     else:
                         from urllib.parse import urlencode
                         query_str = urlencode(data)
                         new_url = action + "?" + query_str
-                        resp_text = self.requester.get(new_url)
-
-                    final_url = self.requester.last_url
-                    if final_url and domain and is_external_url(final_url, domain):
-                        results.append({
-                            "module": "open_redirect",
-                            "form_action": action,
-                            "param": param_name,
-                            "payload": payload,
-                            "redirect_to": final_url
-                        })
+                        probes.append({"method": "GET", "url": new_url,
+                                       "form_action": action, "param": param_name, "payload": payload})
+
+        for probe, response in self.requester.batch(probes):
+            final_url = response.url if response else None
+            if final_url and domain and is_external_url(final_url, domain):
+                results.append({
+                    "module": "open_redirect",
+                    "form_action": probe["form_action"],
+                    "param": probe["param"],
+                    "payload": probe["payload"],
+                    "redirect_to": final_url
+                })
 
         return results
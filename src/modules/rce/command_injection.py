@@ -13,6 +13,7 @@ class CommandInjectionScanner(RCEScanner):
 
     def scan_urls(self, urls):
         results = []
+        probes = []
         for url in urls:
             parsed = urllib.parse.urlparse(url)
             query_params = urllib.parse.parse_qs(parsed.query)
@@ -28,20 +29,24 @@ class CommandInjectionScanner(RCEScanner):
                         (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
                     )
 
-                    resp_text = self.requester.get(new_url)
-                    if self._check_rce_response(resp_text):
-                        results.append({
-                            "module": "rce_command_injection",
-                            "url": new_url,
-                            "param": param_name,
-                            "payload": payload
-                        })
+                    probes.append({"method": "GET", "url": new_url, "param": param_name, "payload": payload})
+
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            if self._check_rce_response(resp_text):
+                results.append({
+                    "module": "rce_command_injection",
+                    "url": probe["url"],
+                    "param": probe["param"],
+                    "payload": probe["payload"]
+                })
         return results
 
     def scan_forms(self, forms):
         results = []
         import urllib
 
+        probes = []
         for form in forms:
             method = form["method"].lower()
             if method not in ("get", "post"):
@@ -56,16 +61,20 @@ class CommandInjectionScanner(RCEScanner):
                         data[inp["name"]] = inp["value"]
 
                 if method == "post":
-                    resp_text = self.requester.post(form["action"], data)
+                    probes.append({"method": "POST", "url": form["action"], "data": data,
+                                   "form_action": form["action"], "payload": payload})
                 else:
                     query_str = urllib.parse.urlencode(data)
                     new_url = form["action"] + "?" + query_str
-                    resp_text = self.requester.get(new_url)
+                    probes.append({"method": "GET", "url": new_url,
+                                   "form_action": form["action"], "payload": payload})
 
-                if self._check_rce_response(resp_text):
-                    results.append({
-                        "module": "rce_command_injection",
-                        "form_action": form["action"],
-                        "payload": payload
-                    })
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            if self._check_rce_response(resp_text):
+                results.append({
+                    "module": "rce_command_injection",
+                    "form_action": probe["form_action"],
+                    "payload": probe["payload"]
+                })
         return results
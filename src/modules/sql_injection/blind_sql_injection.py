@@ -40,9 +40,10 @@ class BlindSQLiScanner(SQLiScanner):
                         (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
                     )
 
-                    start_time = time.time()
-                    response_text = self.requester.get(new_url)
-                    elapsed = time.time() - start_time
+                    start_time = time.perf_counter()
+                    response = self.requester.request("GET", new_url)
+                    # Время из ответа (может прийти из кэша проб), иначе — по часам
+                    elapsed = response.elapsed if response is not None else time.perf_counter() - start_time
 
                     # Логика: если ответ задержался > self.time_threshold, считаем это признаком Blind SQLi
                     if elapsed > self.time_threshold:
@@ -70,16 +71,16 @@ class BlindSQLiScanner(SQLiScanner):
                     else:
                         input_data[inp["name"]] = inp["value"]
 
-                start_time = time.time()
+                start_time = time.perf_counter()
 
                 if method == "post":
-                    resp_text = self.requester.post(form["action"], input_data)
+                    response = self.requester.request("POST", form["action"], input_data)
                 else:
                     query = urllib.parse.urlencode(input_data)
                     new_url = form["action"] + "?" + query
-                    resp_text = self.requester.get(new_url)
+                    response = self.requester.request("GET", new_url)
 
-                elapsed = time.time() - start_time
+                elapsed = response.elapsed if response is not None else time.perf_counter() - start_time
 
                 if elapsed > self.time_threshold:
                     results.append({
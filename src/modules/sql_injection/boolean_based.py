@@ -24,6 +24,7 @@ class BooleanBasedSQLiScanner(SQLiScanner):
         results = []
         # Порог разницы в длине (или контенте), при котором считаем, что поведение отличилось
         length_threshold = 50
+        probes = []
 
         for url in urls:
             parsed = urllib.parse.urlparse(url)
@@ -45,8 +46,6 @@ class BooleanBasedSQLiScanner(SQLiScanner):
                     new_url_true = urllib.parse.urlunparse(
                         (parsed.scheme, parsed.netloc, parsed.path, parsed.params, query_true, parsed.fragment)
                     )
-                    resp_true = self.requester.get(new_url_true) or ""
-                    len_true = len(resp_true)
 
                     # Запрос 2 (false)
                     new_params_false = dict(query_params)
@@ -55,29 +54,38 @@ class BooleanBasedSQLiScanner(SQLiScanner):
                     new_url_false = urllib.parse.urlunparse(
                         (parsed.scheme, parsed.netloc, parsed.path, parsed.params, query_false, parsed.fragment)
                     )
-                    resp_false = self.requester.get(new_url_false) or ""
-                    len_false = len(resp_false)
-
-                    # Сравниваем длины
-                    diff = abs(len_true - len_false)
-
-                    if diff >= length_threshold:
-                        # Значит поведение "true" и "false" отличается существенно
-                        results.append({
-                            "module": "boolean_based_sqli",
-                            "url_true": new_url_true,
-                            "url_false": new_url_false,
-                            "param": param_name,
-                            "payload_true": payload_true,
-                            "payload_false": payload_false,
-                            "len_true": len_true,
-                            "len_false": len_false
-                        })
+
+                    pair = {
+                        "module": "boolean_based_sqli",
+                        "url_true": new_url_true,
+                        "url_false": new_url_false,
+                        "param": param_name,
+                        "payload_true": payload_true,
+                        "payload_false": payload_false
+                    }
+                    probes.append({"method": "GET", "url": new_url_true, "pair": pair, "branch": "len_true"})
+                    probes.append({"method": "GET", "url": new_url_false, "pair": pair, "branch": "len_false"})
+
+        # Ответы приходят в произвольном порядке: сравниваем, когда готовы обе половины пары
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            pair = probe["pair"]
+            pair[probe["branch"]] = len(resp_text or "")
+            if "len_true" not in pair or "len_false" not in pair:
+                continue
+
+            # Сравниваем длины
+            diff = abs(pair["len_true"] - pair["len_false"])
+
+            if diff >= length_threshold:
+                # Значит поведение "true" и "false" отличается существенно
+                results.append(pair)
         return results
 
     def scan_forms(self, forms):
         results = []
         length_threshold = 50
+        probes = []
 
         for form in forms:
             method = form["method"].lower()
@@ -99,32 +107,36 @@ class BooleanBasedSQLiScanner(SQLiScanner):
                         data_true[inp["name"]] = inp["value"]
                         data_false[inp["name"]] = inp["value"]
 
+                pair = {
+                    "module": "boolean_based_sqli",
+                    "form_action": form["action"],
+                    "payload_true": payload_true,
+                    "payload_false": payload_false
+                }
                 if method == "post":
-                    resp_true = self.requester.post(form["action"], data_true) or ""
-                    len_true = len(resp_true)
-                    resp_false = self.requester.post(form["action"], data_false) or ""
-                    len_false = len(resp_false)
+                    probes.append({"method": "POST", "url": form["action"], "data": data_true,
+                                   "pair": pair, "branch": "len_true"})
+                    probes.append({"method": "POST", "url": form["action"], "data": data_false,
+                                   "pair": pair, "branch": "len_false"})
                 else:
                     # GET-форма
                     query_true = urllib.parse.urlencode(data_true)
                     new_url_true = form["action"] + "?" + query_true
-                    resp_true = self.requester.get(new_url_true) or ""
-                    len_true = len(resp_true)
+                    probes.append({"method": "GET", "url": new_url_true, "pair": pair, "branch": "len_true"})
 
                     query_false = urllib.parse.urlencode(data_false)
                     new_url_false = form["action"] + "?" + query_false
-                    resp_false = self.requester.get(new_url_false) or ""
-                    len_false = len(resp_false)
+                    probes.append({"method": "GET", "url": new_url_false, "pair": pair, "branch": "len_false"})
 
-                diff = abs(len_true - len_false)
-                if diff >= length_threshold:
-                    results.append({
-                        "module": "boolean_based_sqli",
-                        "form_action": form["action"],
-                        "payload_true": payload_true,
-                        "payload_false": payload_false,
-                        "len_true": len_true,
-                        "len_false": len_false
-                    })
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            pair = probe["pair"]
+            pair[probe["branch"]] = len(resp_text or "")
+            if "len_true" not in pair or "len_false" not in pair:
+                continue
+
+            diff = abs(pair["len_true"] - pair["len_false"])
+            if diff >= length_threshold:
+                results.append(pair)
 
         return results
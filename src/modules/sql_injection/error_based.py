@@ -5,14 +5,16 @@ error_based.py
 Модуль для проверки Error-based SQL Injection:
 - Подставляет пэйлоады
 - Ищет в ответе типичные SQL-ошибки.
+  Тело читается только до первой найденной сигнатуры (stop_when).
 """
 
 import urllib.parse
-from .sqli_helpers import SQLiScanner
+from .sqli_helpers import SQLiScanner, SQL_ERROR_PATTERN
 
 class ErrorBasedSQLiScanner(SQLiScanner):
     def scan_urls(self, urls):
         results = []
+        probes = []
         for url in urls:
             parsed = urllib.parse.urlparse(url)
             query_params = urllib.parse.parse_qs(parsed.query)
@@ -30,18 +32,24 @@ class ErrorBasedSQLiScanner(SQLiScanner):
                     )
 
                     self.logger.debug(f"[ErrorBasedSQLi] Testing {param_name} with payload '{payload}' at {new_url}")
-                    response_text = self.requester.get(new_url)
-                    if self._check_sql_error_signatures(response_text):
-                        results.append({
-                            "module": "error_based_sqli",
-                            "url": new_url,
-                            "param": param_name,
-                            "payload": payload
-                        })
+                    probes.append({"method": "GET", "url": new_url, "param": param_name, "payload": payload,
+                                   "stop_when": SQL_ERROR_PATTERN})
+
+        # Отправляем все пробы пачкой, ответы приходят по мере готовности
+        for probe, response in self.requester.batch(probes):
+            response_text = response.text if response else None
+            if self._check_sql_error_signatures(response_text):
+                results.append({
+                    "module": "error_based_sqli",
+                    "url": probe["url"],
+                    "param": probe["param"],
+                    "payload": probe["payload"]
+                })
         return results
 
     def scan_forms(self, forms):
         results = []
+        probes = []
         for form in forms:
             method = form["method"].lower()
             if method not in ("post", "get"):
@@ -59,19 +67,25 @@ class ErrorBasedSQLiScanner(SQLiScanner):
 
                 if method == "post":
                     self.logger.debug(f"[ErrorBasedSQLi] Testing form POST {form['action']} with payload '{payload}'")
-                    resp_text = self.requester.post(form["action"], input_data)
+                    probes.append({"method": "POST", "url": form["action"], "data": input_data,
+                                   "form_action": form["action"], "payload": payload,
+                                   "stop_when": SQL_ERROR_PATTERN})
                 else:
                     # GET-форма
                     query_str = urllib.parse.urlencode(input_data)
                     new_url = form["action"] + "?" + query_str
                     self.logger.debug(f"[ErrorBasedSQLi] Testing form GET {new_url} with payload '{payload}'")
-                    resp_text = self.requester.get(new_url)
+                    probes.append({"method": "GET", "url": new_url,
+                                   "form_action": form["action"], "payload": payload,
+                                   "stop_when": SQL_ERROR_PATTERN})
 
-                if self._check_sql_error_signatures(resp_text):
-                    results.append({
-                        "module": "error_based_sqli",
-                        "form_action": form["action"],
-                        "payload": payload
-                    })
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            if self._check_sql_error_signatures(resp_text):
+                results.append({
+                    "module": "error_based_sqli",
+                    "form_action": probe["form_action"],
+                    "payload": probe["payload"]
+                })
 
         return results
@@ -8,6 +8,27 @@ sqli_helpers.py
 import os
 import re
 
+# Типичные сигнатуры SQL-ошибок.
+# Можно расширять под разные СУБД (MySQL, SQLite, PostgreSQL, MSSQL, Oracle и т.д.).
+# Скомпилированный регекс передаётся в пробы как stop_when: Requester перестаёт
+# читать тело, как только сигнатура найдена.
+SQL_ERROR_PATTERN = re.compile("|".join([
+    r"you have an error in your sql syntax",
+    r"sql syntax.*?error",
+    r"warning:\s*mysql",
+    r"unclosed quotation mark after the character string",
+    r"quoted string not properly terminated",
+    r"microsoft oledb provider for odbc drivers error",
+    r"syntax error.*sqlite",
+    r"database error",
+    r"db error",
+    r"sqlstate",
+    r"sqlite3::exception",
+    r"Fatal error",
+    r"PG::SyntaxError"
+]), re.IGNORECASE)
+
+
 class SQLiScanner:
     """
     Базовый класс для всех типов SQL Injection сканеров.
@@ -77,27 +98,8 @@ class SQLiScanner:
 
     def _check_sql_error_signatures(self, response_text):
         """
-        Ищем типичные сигнатуры SQL-ошибок в тексте ответа.
-        Можно расширять под разные СУБД (MySQL, SQLite, PostgreSQL, MSSQL, Oracle и т.д.).
+        Ищем типичные сигнатуры SQL-ошибок (SQL_ERROR_PATTERN) в тексте ответа.
         """
         if not response_text:
             return False
-        error_patterns = [
-            r"you have an error in your sql syntax",
-            r"sql syntax.*?error",
-            r"warning:\s*mysql",
-            r"unclosed quotation mark after the character string",
-            r"quoted string not properly terminated",
-            r"microsoft oledb provider for odbc drivers error",
-            r"syntax error.*sqlite",
-            r"database error",
-            r"db error",
-            r"sqlstate",
-            r"sqlite3::exception",
-            r"Fatal error",
-            r"PG::SyntaxError"
-        ]
-        combined_pattern = re.compile("|".join(error_patterns), re.IGNORECASE)
-        if combined_pattern.search(response_text):
-            return True
-        return False
+        return SQL_ERROR_PATTERN.search(response_text) is not None
@@ -5,6 +5,9 @@ time_based.py
 Time-based Blind SQL Injection:
 - Подставляем SLEEP(...) или WAITFOR DELAY, замеряем задержку
 - Если ответ приходит спустя N секунд, считаем, что SQLi сработала
+
+Задержку берём из response.elapsed: если такую же пробу уже отправил другой
+модуль (кэш проб), время относится к исходному сетевому запросу.
 """
 
 import urllib.parse
@@ -37,9 +40,9 @@ class TimeBasedSQLiScanner(SQLiScanner):
                         (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
                     )
 
-                    start = time.time()
-                    resp_text = self.requester.get(new_url)
-                    elapsed = time.time() - start
+                    start = time.perf_counter()
+                    response = self.requester.request("GET", new_url)
+                    elapsed = self._elapsed(response, start)
 
                     if elapsed >= self.delay_threshold:
                         results.append({
@@ -66,14 +69,14 @@ class TimeBasedSQLiScanner(SQLiScanner):
                     else:
                         post_data[inp["name"]] = inp["value"]
 
-                start = time.time()
+                start = time.perf_counter()
                 if method == "post":
-                    resp_text = self.requester.post(form["action"], post_data)
+                    response = self.requester.request("POST", form["action"], post_data)
                 else:
                     query = urllib.parse.urlencode(post_data)
                     new_url = form["action"] + "?" + query
-                    resp_text = self.requester.get(new_url)
-                elapsed = time.time() - start
+                    response = self.requester.request("GET", new_url)
+                elapsed = self._elapsed(response, start)
 
                 if elapsed >= self.delay_threshold:
                     results.append({
@@ -83,3 +86,12 @@ class TimeBasedSQLiScanner(SQLiScanner):
                         "observed_delay": round(elapsed, 2)
                     })
         return results
+
+    def _elapsed(self, response, start):
+        """
+        Время ответа: из Response (в том числе закэшированного),
+        а если ответа нет (таймаут, обрыв) — по часам с момента start, как раньше.
+        """
+        if response is not None:
+            return response.elapsed
+        return time.perf_counter() - start
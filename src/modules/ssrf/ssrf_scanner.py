@@ -15,6 +15,7 @@ class SSRFScanner:
 
     def scan_urls(self, urls):
         results = []
+        probes = []
         for url in urls:
             parsed = urllib.parse.urlparse(url)
             query_params = urllib.parse.parse_qs(parsed.query)
@@ -32,15 +33,18 @@ class SSRFScanner:
                             (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
                         )
 
-                        resp_text = self.requester.get(new_url)
-                        if resp_text and is_ssrf_suspicious_response(resp_text):
-                            results.append({
-                                "module": "ssrf",
-                                "url": new_url,
-                                "param": param_name,
-                                "payload": payload,
-                                "issue": "Possible SSRF"
-                            })
+                        probes.append({"method": "GET", "url": new_url, "param": param_name, "payload": payload})
+
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            if resp_text and is_ssrf_suspicious_response(resp_text):
+                results.append({
+                    "module": "ssrf",
+                    "url": probe["url"],
+                    "param": probe["param"],
+                    "payload": probe["payload"],
+                    "issue": "Possible SSRF"
+                })
         return results
 
     def scan_forms(self, forms):
@@ -49,6 +53,7 @@ class SSRFScanner:
         """
         results = []
         import urllib
+        probes = []
         for form in forms:
             method = form["method"].lower()
             action = form["action"]
@@ -64,19 +69,23 @@ class SSRFScanner:
                         new_data[param_name] = payload
 
                         if method == "post":
-                            resp_text = self.requester.post(action, new_data)
+                            probes.append({"method": "POST", "url": action, "data": new_data,
+                                           "form_action": action, "param": param_name, "payload": payload})
                         else:
                             from urllib.parse import urlencode
                             new_query = urlencode(new_data)
                             new_url = action + "?" + new_query
-                            resp_text = self.requester.get(new_url)
+                            probes.append({"method": "GET", "url": new_url,
+                                           "form_action": action, "param": param_name, "payload": payload})
 
-                        if resp_text and is_ssrf_suspicious_response(resp_text):
-                            results.append({
-                                "module": "ssrf",
-                                "form_action": action,
-                                "param": param_name,
-                                "payload": payload,
-                                "issue": "Possible SSRF"
-                            })
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            if resp_text and is_ssrf_suspicious_response(resp_text):
+                results.append({
+                    "module": "ssrf",
+                    "form_action": probe["form_action"],
+                    "param": probe["param"],
+                    "payload": probe["payload"],
+                    "issue": "Possible SSRF"
+                })
         return results
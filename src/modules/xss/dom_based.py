@@ -3,6 +3,9 @@
 # Упрощённый сканер DOM-based XSS:
 # Ищем "document.write(location.hash)" в HTML,
 # пробуем вставить "#<script>alert(1)</script>"
+#
+# Страницу для поиска синков берём из хранилища краулера (requester.crawled),
+# в сеть идём только если краулер её не сохранил.
 
 import re
 import urllib.parse
@@ -19,22 +22,30 @@ class DomBasedXSSScanner(XSSScanner):
         )
 
         for url in urls:
-            # Получаем HTML
-            resp_text = self.requester.get(url)
+            # Получаем HTML: сначала из хранилища краулера, затем из сети
+            response = self.requester.crawled(url)
+            if response is not None:
+                resp_text = response.text
+            else:
+                resp_text = self.requester.get(url)
             if not resp_text:
                 continue
             # Проверяем, есть ли синки
             if sink_pattern.search(resp_text):
                 # Пробуем fragment-based payload
+                probes = []
                 for payload in self.payloads:
                     # fragment = #<script>alert(1)</script>
                     new_url = url + "#" + urllib.parse.quote(payload)
-                    resp_text2 = self.requester.get(new_url)
-                    if self._search_payload_in_response(resp_text2, payload):
+                    probes.append({"method": "GET", "url": new_url, "payload": payload})
+
+                for probe, response in self.requester.batch(probes):
+                    resp_text2 = response.text if response else None
+                    if self._search_payload_in_response(resp_text2, probe["payload"]):
                         results.append({
                             "module": "dom_based_xss",
-                            "url": new_url,
-                            "payload": payload
+                            "url": probe["url"],
+                            "payload": probe["payload"]
                         })
         return results
 
@@ -12,6 +12,7 @@ class ReflectedXSSScanner(XSSScanner):
         payload (или его часть) в ответе.
         """
         results = []
+        probes = []
         for url in urls:
             parsed = urllib.parse.urlparse(url)
             query_params = urllib.parse.parse_qs(parsed.query)
@@ -29,14 +30,18 @@ class ReflectedXSSScanner(XSSScanner):
                         (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
                     )
 
-                    resp_text = self.requester.get(new_url)
-                    if self._search_payload_in_response(resp_text, payload):
-                        results.append({
-                            "module": "reflected_xss",
-                            "url": new_url,
-                            "param": param_name,
-                            "payload": payload
-                        })
+                    probes.append({"method": "GET", "url": new_url, "param": param_name, "payload": payload})
+
+        # Пробы уходят пачкой, ответы проверяем по мере готовности
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            if self._search_payload_in_response(resp_text, probe["payload"]):
+                results.append({
+                    "module": "reflected_xss",
+                    "url": probe["url"],
+                    "param": probe["param"],
+                    "payload": probe["payload"]
+                })
         return results
 
     def scan_forms(self, forms):
@@ -46,6 +51,7 @@ class ReflectedXSSScanner(XSSScanner):
         Проверяем ответ на появление payload
         """
         results = []
+        probes = []
         for form in forms:
             method = form["method"].lower()
             if method not in ("get", "post"):
@@ -62,16 +68,20 @@ class ReflectedXSSScanner(XSSScanner):
                         data[inp["name"]] = inp["value"]
 
                 if method == "post":
-                    resp_text = self.requester.post(form["action"], data)
+                    probes.append({"method": "POST", "url": form["action"], "data": data,
+                                   "form_action": form["action"], "payload": payload})
                 else:
                     query = urllib.parse.urlencode(data)
                     new_url = form["action"] + "?" + query
-                    resp_text = self.requester.get(new_url)
+                    probes.append({"method": "GET", "url": new_url,
+                                   "form_action": form["action"], "payload": payload})
 
-                if self._search_payload_in_response(resp_text, payload):
-                    results.append({
-                        "module": "reflected_xss",
-                        "form_action": form["action"],
-                        "payload": payload
-                    })
+        for probe, response in self.requester.batch(probes):
+            resp_text = response.text if response else None
+            if self._search_payload_in_response(resp_text, probe["payload"]):
+                results.append({
+                    "module": "reflected_xss",
+                    "form_action": probe["form_action"],
+                    "payload": probe["payload"]
+                })
         return results
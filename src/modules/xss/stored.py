@@ -50,11 +50,12 @@ class StoredXSSScanner(XSSScanner):
                         post_data[inp["name"]] = inp["value"]
 
                 # Отправляем POST
-                self.requester.post(form["action"], post_data)
+                self.requester.post(form["action"], post_data, use_cache=False)
 
-                # Далее, если self.verify_url задан, делаем GET
+                # Далее, если self.verify_url задан, делаем GET.
+                # Страница меняется после каждого POST, поэтому кэш проб не используем
                 if self.verify_url:
-                    resp_text = self.requester.get(self.verify_url)
+                    resp_text = self.requester.get(self.verify_url, use_cache=False)
                     if self._search_payload_in_response(resp_text, payload):
                         results.append({
                             "module": "stored_xss",
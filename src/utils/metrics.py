@@ -0,0 +1,132 @@
+# coding: utf-8
+"""
+Файл: metrics.py
+----------------
+Назначение:
+Гистограммы задержек запросов по фазам — чтобы понять, откуда берётся
+медленный скан: DNS, установка TCP, TLS, "думание" сервера (TTFB) или передача тела.
+
+Requester для каждого реального запроса записывает словарь фаз (секунды):
+    {"dns", "connect", "tls", "ttfb", "body", "total"}
+(для переиспользованного keep-alive соединения dns/connect/tls = 0).
+RequestMetrics раскладывает их по гистограммам в двух разрезах:
+- по хосту ("host:port")
+- по модулю-сканеру (имя из requester.scoped(...), "crawler" и т.д.)
+
+Гистограмма хранит счётчики по логарифмическим корзинам (BUCKETS_MS), поэтому
+память не растёт с числом запросов; перцентили оцениваются по границам корзин.
+
+to_dict() — машиночитаемый вид (для --metrics-output), summary_lines() — для лога.
+"""
+
+import bisect
+import json
+import threading
+
+# Верхние границы корзин в миллисекундах (последняя корзина — "больше 30 с")
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000]
+
+# Фазы запроса в порядке их наступления
+PHASES = ("dns", "connect", "tls", "ttfb", "body", "total")
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, seconds):
+        ms = seconds * 1000.0
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+
+    def percentile(self, q):
+        """Оценка перцентиля q (0..100) в мс — верхняя граница корзины (не больше max)."""
+        if not self.count:
+            return None
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                bound = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "min_ms": round(self.min, 3) if self.min is not None else None,
+            "max_ms": round(self.max, 3) if self.max is not None else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets_ms": BUCKETS_MS + ["inf"],
+            "counts": list(self.counts)
+        }
+
+
+class RequestMetrics:
+    def __init__(self):
+        # scope ("host" / "module") -> key -> phase -> LatencyHistogram
+        self._data = {"host": {}, "module": {}}
+        self._lock = threading.Lock()
+
+    def record(self, host, module, timings):
+        """
+        Добавляет фазы одного запроса.
+        :param host: "host:port"
+        :param module: имя модуля (None -> "unknown")
+        :param timings: {"dns", "connect", "tls", "ttfb", "body", "total"} в секундах
+        """
+        with self._lock:
+            for scope, key in (("host", host), ("module", module or "unknown")):
+                phases = self._data[scope].setdefault(key, {})
+                for phase in PHASES:
+                    if phase in timings:
+                        phases.setdefault(phase, LatencyHistogram()).add(timings[phase])
+
+    def to_dict(self):
+        """{"by_host": {host: {phase: hist}}, "by_module": {...}}"""
+        with self._lock:
+            return {
+                "by_" + scope: {
+                    key: {phase: hist.to_dict() for phase, hist in phases.items()}
+                    for key, phases in sorted(keys.items())
+                }
+                for scope, keys in self._data.items()
+            }
+
+    def write_json(self, path):
+        """Сохраняет метрики в JSON-файл."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def summary_lines(self):
+        """
+        Строки для лога: на каждый хост и модуль — число запросов, p50/p95 общего
+        времени и средние по фазам.
+        """
+        lines = []
+        data = self.to_dict()
+        for scope in ("by_host", "by_module"):
+            for key, phases in data[scope].items():
+                total = phases.get("total")
+                if not total:
+                    continue
+                means = ", ".join(
+                    f"{phase} {phases[phase]['mean_ms']:.1f}"
+                    for phase in PHASES[:-1] if phase in phases
+                )
+                lines.append(
+                    f"[{scope[3:]}] {key}: {total['count']} requests, "
+                    f"p50 {total['p50_ms']:.0f} ms, p95 {total['p95_ms']:.0f} ms (mean ms: {means})"
+                )
+        return lines
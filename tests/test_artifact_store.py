@@ -0,0 +1,41 @@
+import os
+import unittest
+import http.client
+
+from src.core.artifact_store import ArtifactStore
+from src.core.response import Response
+
+
+def _response(url, body):
+    headers = http.client.HTTPMessage()
+    headers["Content-Type"] = "text/html"
+    return Response(200, headers, url, 0.01, body)
+
+
+class TestArtifactStore(unittest.TestCase):
+    def test_round_trip_keeps_body_and_headers(self):
+        store = ArtifactStore()
+        store.put("http://t/a", _response("http://t/final", b"<script>document.write(1)</script>"))
+        response = store.get("http://t/a")
+        store.close()
+        self.assertEqual(response.text, "<script>document.write(1)</script>")
+        self.assertEqual(response.url, "http://t/final")
+        self.assertEqual(response.headers["content-type"], "text/html")
+        self.assertIsNone(store.get("http://t/missing"))
+
+    def test_spills_to_disk_over_memory_limit(self):
+        store = ArtifactStore(max_memory_bytes=1)
+        for i in range(3):
+            store.put(f"http://t/{i}", _response(f"http://t/{i}", os.urandom(512)))
+        stats = store.stats()
+        spill_dir = store.spill_dir
+        first = store.get("http://t/0")
+        store.close()
+        self.assertEqual(stats["entries"], 3)
+        self.assertGreaterEqual(stats["disk_entries"], 2)
+        self.assertEqual(len(first.body), 512)
+        self.assertFalse(os.path.exists(spill_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
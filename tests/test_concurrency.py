@@ -0,0 +1,31 @@
+import unittest
+
+from src.core.concurrency import AdaptiveConcurrency
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def _run_window(self, controller, elapsed=0.01, signal=None):
+        for _ in range(controller.window):
+            controller.acquire()
+            controller.release(elapsed, signal)
+
+    def test_stable_latency_raises_limit(self):
+        controller = AdaptiveConcurrency(initial=2, maximum=4, window=5)
+        for _ in range(5):
+            self._run_window(controller)
+        self.assertEqual(controller.limit, 4)
+        self.assertEqual(controller.decreases, 0)
+
+    def test_throttling_and_latency_spike_cut_limit_once_per_window(self):
+        controller = AdaptiveConcurrency(initial=8, maximum=8, window=5)
+        self._run_window(controller, signal="HTTP 429")
+        self.assertEqual(controller.limit, 4)
+
+        self._run_window(controller, elapsed=0.01)
+        self._run_window(controller, elapsed=1.0)
+        self.assertEqual(controller.limit, 2)
+        self.assertEqual(controller.decreases, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import collections
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src.core.content_probe import ContentTypeFilter
+from src.core.crawler import Crawler
+from src.core.requester import Requester
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """
+    Главная страница ссылается на картинку, на PDF без расширения в URL и на
+    десять вложений /files/N.ashx (тоже не HTML).
+    """
+    protocol_version = "HTTP/1.1"
+    hits = collections.Counter()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        _SiteHandler.hits[self.path] += 1
+        if self.path == "/":
+            links = ["/logo.PNG", "/report"] + [f"/files/{n}.ashx" for n in range(10)]
+            body = "".join(f'<a href="{link}">x</a>' for link in links).encode("utf-8")
+            content_type = "text/html; charset=utf-8"
+        else:
+            body, content_type = b"%PDF-1.4" + b"0" * 200000, "application/pdf"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestContentProbe(unittest.TestCase):
+    def setUp(self):
+        self.httpd = ThreadingHTTPServer(("localhost", 0), _SiteHandler)
+        self.base = f"http://localhost:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        _SiteHandler.hits.clear()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def test_non_html_resources_are_not_downloaded(self):
+        requester = Requester(timeout=5)
+        content_filter = ContentTypeFilter(min_samples=3)
+        crawler = Crawler(self.base + "/", depth=1, requester=requester, content_filter=content_filter)
+        urls = {item for kind, item in crawler.crawl() if kind == "url"}
+        transfer = requester.transfer_stats()
+        requester.close()
+
+        # Все URL найдены, но картинка и 7 из 10 вложений не запрашивались
+        self.assertEqual(len(urls), 13)
+        self.assertNotIn("/logo.PNG", _SiteHandler.hits)
+        self.assertEqual(sum(1 for path in _SiteHandler.hits if path.endswith(".ashx")), 3)
+        self.assertEqual(content_filter.stats()["extension"], 1)
+        self.assertEqual(content_filter.stats()["cached"], 7)
+        # PDF по ссылке без расширения: прочитаны только заголовки
+        self.assertEqual(transfer["truncated_type"], 4)
+        self.assertLess(transfer["wire_bytes"], 10000)
+
+
+if __name__ == "__main__":
+    unittest.main()
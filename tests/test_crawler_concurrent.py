@@ -0,0 +1,160 @@
+import collections
+import os
+import tempfile
+import unittest
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src.core.crawler import Crawler
+from src.core.frontier import SQLiteFrontier
+from src.core.requester import Requester
+from src.core.simhash import SimHashIndex
+from src.core.visited import BloomVisitedSet, FingerprintSet
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """
+    Сайт-граф: страница /p/N ссылается на /p/2N и /p/2N+1 (двоичное дерево),
+    на /p/N+3 ("короткие" пути к более глубоким страницам) и на /private/N.
+    У всех страниц общий "шаблон" — подвал (FOOTER) и форма входа с токеном страницы.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    # Сколько раз запрашивали каждый путь
+    hits = collections.Counter()
+    FOOTER = "".join(f"<p>Shipping, returns and warranty, section {i}.</p>" for i in range(20))
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        _SiteHandler.hits[self.path] += 1
+        n = int(self.path.rsplit("/", 1)[-1] or 1) if self.path.startswith("/p/") else 0
+        links = "".join(f'<a href="/p/{m}">{m}</a>' for m in (2 * n, 2 * n + 1, n + 3))
+        form = f'<form action="/submit/{n}" method="post"><input name="q"></form>' if n % 3 == 0 else ""
+        form += (f'<form action="/login" method="post"><input name="user"><input name="password">'
+                 f'<input type="hidden" name="token" value="{n}"></form>')
+        body = f"<html><body>{links}<a href='/private/{n}'>x</a>{form}{self.FOOTER}</body></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestConcurrentCrawler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.httpd = ThreadingHTTPServer(("localhost", 0), _SiteHandler)
+        cls.start_url = f"http://localhost:{cls.httpd.server_address[1]}/p/1"
+        cls.server_thread = threading.Thread(target=cls.httpd.serve_forever, daemon=True)
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+
+    def _crawl(self, workers, **kwargs):
+        requester = Requester(timeout=5)
+        crawler = Crawler(self.start_url, depth=4, exclude_pattern="/private/",
+                          requester=requester, workers=workers, **kwargs)
+        urls = {item for kind, item in crawler.crawl() if kind == "url"}
+        requester.close()
+        forms = sorted(form["action"] for form in crawler.found_forms)
+        return urls, forms
+
+    def test_workers_find_the_same_urls_and_forms(self):
+        sequential_urls, sequential_forms = self._crawl(workers=1)
+        for workers in (2, 8):
+            urls, forms = self._crawl(workers=workers)
+            self.assertEqual(urls, sequential_urls)
+            self.assertEqual(forms, sequential_forms)
+        self.assertIn(self.start_url.replace("/p/1", "/p/16"), sequential_urls)
+        # Форма входа есть на каждой странице, но сканируется один раз
+        self.assertEqual(sequential_forms.count(self.start_url.replace("/p/1", "/login")), 1)
+        # Прежний разбор после скачивания даёт тот же результат
+        self.assertEqual(self._crawl(workers=1, html_parser="html.parser"), (sequential_urls, sequential_forms))
+
+    def test_compact_visited_and_disk_frontier_find_the_same_urls(self):
+        expected = self._crawl(workers=1)
+        for workers in (1, 4):
+            frontier = SQLiteFrontier()
+            self.assertEqual(self._crawl(workers, visited=FingerprintSet(), frontier=frontier), expected)
+            frontier.close()
+
+    def test_near_duplicates_are_reported_once_per_cluster(self):
+        expected_urls, expected_forms = self._crawl(workers=1)
+        requester = Requester(timeout=5)
+        crawler = Crawler(self.start_url, depth=4, exclude_pattern="/private/", requester=requester,
+                          near_duplicates=SimHashIndex(distance=6))
+        events = list(crawler.crawl())
+        requester.close()
+        urls = {item for kind, item in events if kind == "url"}
+        duplicates = dict(item for kind, item in events if kind == "duplicate")
+        # Страницы-шаблоны /p/N почти одинаковы: сканировать нужно немногие
+        self.assertTrue(duplicates)
+        self.assertEqual(urls | set(duplicates), expected_urls)
+        self.assertTrue(set(duplicates.values()) <= urls)
+        self.assertEqual(sorted(form["action"] for form in crawler.found_forms), expected_forms)
+
+    def test_resume_continues_from_checkpoint(self):
+        expected_urls, expected_forms = self._crawl(workers=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "crawl.checkpoint")
+            # Компактные visited не хранят строки URL — найденное до остановки берётся из журнала
+            modes = [(1, set), (4, set), (1, FingerprintSet), (4, lambda: BloomVisitedSet(1000))]
+            for workers, make_visited in modes:
+                requester = Requester(timeout=5)
+                first = Crawler(self.start_url, depth=4, exclude_pattern="/private/", requester=requester,
+                                workers=workers, checkpoint=path, visited=make_visited())
+                _SiteHandler.hits.clear()
+                seen = []
+                for kind, item in first.crawl():
+                    if kind == "url":
+                        seen.append(item)
+                        if len(seen) == 7:
+                            first.stop()
+                self.assertTrue(first.interrupted)
+
+                second = Crawler(self.start_url, depth=4, exclude_pattern="/private/", requester=requester,
+                                 workers=workers, checkpoint=path, resume=True, visited=make_visited())
+                self.assertTrue(second.resumed)
+                urls = [item for kind, item in second.crawl() if kind == "url"]
+                requester.close()
+
+                self.assertEqual(set(urls), expected_urls)
+                self.assertEqual(len(urls), len(expected_urls))
+                self.assertEqual(sorted(form["action"] for form in second.found_forms), expected_forms)
+                if workers == 1:
+                    # Без параллельных страниц "в полёте" ни одна страница не скачана дважды
+                    self.assertEqual(max(_SiteHandler.hits.values()), 1)
+
+    def test_page_budget_survives_resume(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "crawl.checkpoint")
+            requester = Requester(timeout=5)
+            first = Crawler(self.start_url, depth=4, exclude_pattern="/private/", requester=requester,
+                            checkpoint=path, max_pages=5)
+            first.run()
+            self.assertTrue(first.budget_exhausted)
+
+            _SiteHandler.hits.clear()
+            second = Crawler(self.start_url, depth=4, exclude_pattern="/private/", requester=requester,
+                             checkpoint=path, resume=True, max_pages=5)
+            urls = [item for kind, item in second.crawl() if kind == "url"]
+            self.assertEqual(second.pages_fetched, 5)
+            self.assertFalse(_SiteHandler.hits)
+            self.assertEqual(len(urls), 5)
+
+            # Больший бюджет продолжает обход с того же места
+            third = Crawler(self.start_url, depth=4, exclude_pattern="/private/", requester=requester,
+                            checkpoint=path, resume=True, max_pages=8)
+            third.run()
+            requester.close()
+            self.assertEqual(third.pages_fetched, 8)
+            self.assertEqual(sum(_SiteHandler.hits.values()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
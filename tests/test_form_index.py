@@ -0,0 +1,39 @@
+import unittest
+
+from src.core.form_index import MAX_SAMPLE_PAGES, FormIndex
+
+
+def _form(action, *names, method="post", token=""):
+    inputs = [{"name": name, "type": "text", "value": token} for name in names]
+    return {"method": method, "action": action, "inputs": inputs, "enctype": ""}
+
+
+class TestFormIndex(unittest.TestCase):
+    def test_template_form_is_kept_once_with_its_pages(self):
+        index = FormIndex()
+        added = [index.add(_form("http://a/login", "user", "password", token=str(n)), f"http://a/p/{n}")
+                 for n in range(100)]
+        self.assertEqual(sum(added), 1)
+        # Порядок полей не важен, метод и action — важны
+        self.assertFalse(index.add(_form("http://a/login", "password", "user", method="POST"), "http://a/x"))
+        self.assertTrue(index.add(_form("http://a/login", "user", "password", method="get"), "http://a/x"))
+        self.assertTrue(index.add(_form("http://a/login", "user"), "http://a/x"))
+
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.forms[0]["inputs"][0]["value"], "0")  # значения — из первой копии
+        self.assertEqual(index.page_count(index.forms[0]), 101)
+        self.assertEqual(index.pages(index.forms[0]), [f"http://a/p/{n}" for n in range(MAX_SAMPLE_PAGES)])
+        self.assertEqual(index.stats(), {"forms": 3, "occurrences": 103, "duplicates": 100})
+        # Та же форма ещё раз на той же странице — страница не считается заново
+        index.add(_form("http://a/login", "user"), "http://a/x")
+        self.assertEqual(index.page_count(index.forms[2]), 1)
+
+    def test_dedupe_can_be_disabled(self):
+        index = FormIndex(dedupe=False)
+        self.assertTrue(index.add(_form("http://a/login", "user"), "http://a/1"))
+        self.assertTrue(index.add(_form("http://a/login", "user"), "http://a/2"))
+        self.assertEqual(index.stats()["duplicates"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
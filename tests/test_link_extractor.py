@@ -0,0 +1,114 @@
+import random
+import unittest
+
+from src.core.link_extractor import LinkAndFormExtractor, available_backends, make_extractor
+
+# Разметка, на которой легко разойтись с HTMLParser
+_TRICKY = (
+    '<!DOCTYPE html><a href="/x?a=1&amp;b=2">x</a><A HREF=/up>up</A><a href=\'/q\'/><a href>'
+    '<a\vhref=/not-a-link><a href="/a" href="/b"><div title="<a href=/in-attr>"><a href=x/>'
+    '<form action="/f" method=POST enctype="Multipart/Form-Data"><input name=q><input name>'
+    '<input type="HIDDEN" value="&lt;x&gt;" name="t"/></ form ><input name="orphan">'
+    '<script>var s = "<a href=/in-script>";</script><style>a{}</style >'
+    '<!-- <a href=/in-comment> --><![CDATA[<a href=/in-cdata>]]><?php "<a href=/pi>" ?>'
+    '<textarea><a href="/in-textarea"></textarea><form/><input name="after-empty-form">'
+    '<a href="/é">é</a> x < y <a title="x"href="/nospace"><span\x00><a href=/after-nul>'
+)
+# Обычная страница: на ней все варианты обязаны совпадать
+_PAGE = (
+    "<html><head><title>Shop</title><script>var a = '<a href=/no>';</script></head><body>"
+    + "".join(f'<div class="item"><a href="/item?id={i}&amp;ref=list">Item {i}</a></div>' for i in range(50))
+    + '<form action="/search" method="get"><input type="text" name="q" value="">'
+      '<input type="submit" value="Go"></form><!-- <a href="/old"> --></body></html>'
+)
+
+
+def _reference(html):
+    parser = LinkAndFormExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.links, parser.forms
+
+
+def _extract(backend, body, cuts):
+    extractor = make_extractor(backend)
+    extractor.reset("text/html; charset=utf-8")
+    start = 0
+    for end in cuts + [len(body)]:
+        extractor.feed(body[start:end])
+        start = end
+    extractor.finish(body)
+    return extractor.links, extractor.forms
+
+
+class TestLinkExtractor(unittest.TestCase):
+    def test_stream_matches_html_parser_at_any_chunk_boundary(self):
+        expected = _reference(_TRICKY)
+        self.assertIn("/x?a=1&b=2", expected[0])
+        body = _TRICKY.encode("utf-8")
+        # По одному байту (разрезаем и UTF-8 символы) и случайными кусками
+        self.assertEqual(_extract("stream", body, list(range(1, len(body)))), expected)
+        rng = random.Random(1)
+        for _ in range(200):
+            cuts = sorted(rng.sample(range(len(body)), rng.randint(1, 8)))
+            self.assertEqual(_extract("stream", body, cuts), expected, cuts)
+
+    def test_stream_matches_html_parser_on_random_markup(self):
+        # Дифференциальная проверка: случайная (в том числе незаконченная) разметка,
+        # случайные куски; эталон — HTMLParser с close()
+        tokens = [
+            '<a href="x">', "<a href=y>", "<a href='z'", "<!--", "-->", "--!>", "<!---", ">", "<", "</",
+            "</a>", "</form>", '<form action="/f">', "<input name=q>", "<script>", "</script>", "<style>",
+            "</style >", "<!DOCTYPE html>", "<!", "<?", "<?x ?>", "<![CDATA[", "]]>", "<![if x]>",
+            "<![endif]>", "text ", "&amp;", '"', "'", " ", "=", "/", "<p", "<p>", '<a href="w"/>',
+            "<A HREF=u>", "\n", "</ script>", '<b class="c d"', "<form", "<input"
+        ]
+        rng = random.Random(2)
+        for _ in range(2000):
+            html = "".join(rng.choice(tokens) for _ in range(rng.randint(1, 15)))
+            try:
+                expected = _reference(html)
+            except AssertionError:
+                # Неизвестная секция <![...]> — HTMLParser падает (см. описание модуля)
+                continue
+            body = html.encode("utf-8")
+            cuts = sorted(rng.sample(range(len(body) + 1), min(len(body) + 1, rng.randint(0, 6))))
+            self.assertEqual(_extract("stream", body, cuts), expected, (html, cuts))
+
+    def test_unfinished_constructs_at_end_of_body(self):
+        # Тело обрезано по --max-body-size внутри комментария или тега
+        for html, links in (('<p><!---><a href="x">', ["x"]), ("<?php <a href=w>", []),
+                            ('<a href="u"', []), ('<!DOCTYPE x <a href="v">', [])):
+            self.assertEqual(_reference(html)[0], links, html)
+            self.assertEqual(_extract("stream", html.encode("utf-8"), [3])[0], links, html)
+
+    def test_long_inline_script_is_not_rescanned(self):
+        extractor = make_extractor("stream")
+        extractor.reset("text/html")
+        extractor.feed(b"<script>")
+        for _ in range(1000):
+            extractor.feed(b"var a = 1; if (a < 2) { a++; }\n" * 32)
+            # Буферизуется только хвост от последнего "<", а не весь скрипт
+            self.assertLess(len(extractor._rawdata), 1024)
+        extractor.feed(b'</script><a href="/after">')
+        self.assertEqual(extractor.links, ["/after"])
+
+    def test_body_is_parsed_whole_if_chunks_were_not_fed(self):
+        # Например, ответ из кассеты: куски не подавались, finish() разбирает тело целиком
+        extractor = make_extractor("stream")
+        extractor.reset("application/pdf")
+        extractor.feed(b"%PDF")
+        extractor.finish(_PAGE.encode("utf-8"))
+        self.assertEqual((extractor.links, extractor.forms), _reference(_PAGE))
+
+    def test_all_installed_backends_agree_on_regular_pages(self):
+        expected = _reference(_PAGE)
+        body = _PAGE.encode("utf-8")
+        for backend in available_backends():
+            if backend == "html.parser":
+                continue
+            self.assertEqual(_extract(backend, body, [100, 1000, 1001]), expected, backend)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src.core.crawler import Crawler
+from src.core.frontier import PriorityFrontier
+from src.core.priority import UrlScorer, parse_weights
+from src.core.requester import Requester
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """
+    Главная ссылается на 20 статических страниц /about/N и на /catalog;
+    только /catalog ведёт к странице с параметрами /search?q=x, а на ней — форма.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/":
+            links = [f"/about/{n}" for n in range(20)] + ["/catalog"]
+        elif self.path == "/catalog":
+            links = ["/search?q=x"]
+        else:
+            links = []
+        body = "".join(f'<a href="{link}">x</a>' for link in links)
+        if self.path.startswith("/search"):
+            body += '<form action="/search" method="get"><input name="q"></form>'
+        body = f"<html><body>{body}</body></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestPriorityFrontier(unittest.TestCase):
+    def test_order_and_depth_limit(self):
+        frontier = PriorityFrontier()
+        frontier.push("a", 1, 1.0)
+        frontier.push("b", 2, 5.0)
+        frontier.push("c", 1, 1.0)
+        self.assertEqual(frontier.items(), [("b", 2, 5.0), ("a", 1, 1.0), ("c", 1, 1.0)])
+        self.assertEqual(frontier.pop(max_depth=1), ("a", 1))
+        self.assertEqual(frontier.pop(), ("b", 2))
+        self.assertEqual(frontier.pop(max_depth=0), None)
+        self.assertEqual(len(frontier), 1)
+
+    def test_scores_and_weights(self):
+        scorer = UrlScorer(parse_weights("depth=0.5"))
+        self.assertEqual(scorer.score("http://a/search?q=1", 2, parent_has_forms=True), 4 + 2 + 2 - 1)
+        # Тот же шаблон второй раз — без бонуса за новизну
+        self.assertEqual(scorer.score("http://a/search?q=2", 2), 4 - 1)
+        with self.assertRaises(ValueError):
+            parse_weights("speed=1")
+
+
+class TestPriorityCrawl(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.httpd = ThreadingHTTPServer(("localhost", 0), _SiteHandler)
+        cls.base = f"http://localhost:{cls.httpd.server_address[1]}"
+        threading.Thread(target=cls.httpd.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+
+    def _crawl(self, **kwargs):
+        requester = Requester(timeout=5)
+        crawler = Crawler(self.base + "/", depth=3, requester=requester, max_pages=5, **kwargs)
+        urls = [item for kind, item in crawler.crawl() if kind == "url"]
+        requester.close()
+        return crawler, urls
+
+    def test_budget_reaches_parameters_and_forms_first(self):
+        crawler, urls = self._crawl(workers=1)
+        self.assertTrue(crawler.budget_exhausted)
+        self.assertEqual(urls, [self.base + path for path in ("/", "/about/0", "/about/1", "/about/10", "/about/11")])
+
+        # /catalog — новый шаблон, а /about/N после первого — уже нет
+        crawler, urls = self._crawl(workers=1, frontier=PriorityFrontier(), priority=UrlScorer())
+        self.assertEqual(crawler.pages_fetched, 5)
+        self.assertEqual(urls, [self.base + path for path in ("/", "/about/0", "/catalog", "/search?q=x", "/about/1")])
+        self.assertEqual(len(crawler.found_forms), 1)
+
+    def test_budget_with_workers(self):
+        # Порядок завершения страниц зависит от потоков: проверяем только то, что от него не зависит.
+        # /about/0 и /catalog берутся вместе сразу после главной (отдаются — по завершении)
+        crawler, urls = self._crawl(workers=2)
+        self.assertTrue(crawler.budget_exhausted)
+        self.assertEqual(len(urls), 5)
+        self.assertNotIn(self.base + "/catalog", urls)
+
+        crawler, urls = self._crawl(workers=2, frontier=PriorityFrontier(), priority=UrlScorer())
+        self.assertEqual(crawler.pages_fetched, 5)
+        self.assertLessEqual({self.base + path for path in ("/", "/about/0", "/catalog")}, set(urls))
+
+
+if __name__ == "__main__":
+    unittest.main()
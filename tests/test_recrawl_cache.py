@@ -0,0 +1,109 @@
+import collections
+import http.client
+import os
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src.core.crawler import Crawler
+from src.core.recrawl_cache import RecrawlCache
+from src.core.requester import Requester
+from src.core.response import Response
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """
+    /etag/N отдаёт ETag и отвечает 304 на If-None-Match, /plain/N валидаторов не шлёт.
+    Тело /etag/3 меняется, если version > 1.
+    """
+    protocol_version = "HTTP/1.1"
+    version = 1
+    bodies = collections.Counter()  # путь -> сколько раз отдали тело
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        kind, n = self.path.strip("/").split("/")
+        n = int(n)
+        links = "".join(f'<a href="/{k}/{m}">x</a>' for k in ("etag", "plain") for m in range(6) if m != n)
+        extra = f"v{self.version}" if self.path == "/etag/3" and self.version > 1 else ""
+        body = f'<html>{links}<form action="/f/{kind}{n}{extra}"><input name="q"></form></html>'.encode("utf-8")
+        etag = f'"{n}{extra}"'
+        if kind == "etag" and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        _SiteHandler.bodies[self.path] += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        if kind == "etag":
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestRecrawlCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.httpd = ThreadingHTTPServer(("localhost", 0), _SiteHandler)
+        cls.base = f"http://localhost:{cls.httpd.server_address[1]}"
+        threading.Thread(target=cls.httpd.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+
+    def _crawl(self, path):
+        requester = Requester(timeout=5)
+        recrawl = RecrawlCache(path)
+        crawler = Crawler(self.base + "/etag/0", depth=2, requester=requester, recrawl=recrawl, workers=2)
+        urls = {item for kind, item in crawler.crawl() if kind == "url"}
+        requester.close()
+        stats = recrawl.stats()
+        recrawl.close()
+        return urls, sorted(form["action"] for form in crawler.found_forms), stats
+
+    def test_second_crawl_reuses_unchanged_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "recrawl.sqlite")
+            _SiteHandler.version = 1
+            first = self._crawl(path)
+            self.assertEqual(first[2], {"revalidated": 0, "reused": 0, "changed": 0, "new": 12})
+
+            _SiteHandler.version = 2
+            _SiteHandler.bodies.clear()
+            urls, forms, stats = self._crawl(path)
+            self.assertEqual(urls, first[0])
+            self.assertEqual(forms, sorted(f.replace("/f/etag3", "/f/etag3v2") for f in first[1]))
+            # 5 страниц с ETag — 304, 6 без валидаторов скачаны, но не разобраны, /etag/3 изменилась
+            self.assertEqual(stats, {"revalidated": 5, "reused": 11, "changed": 1, "new": 0})
+            self.assertEqual(sorted(p for p in _SiteHandler.bodies if p.startswith("/etag/")), ["/etag/3"])
+
+    def test_unchanged_body_refreshes_validators(self):
+        def response(etag):
+            headers = http.client.HTTPMessage()
+            headers["ETag"] = etag
+            return Response(200, headers, "http://h/", 0.0, b"<html></html>")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            recrawl = RecrawlCache(os.path.join(tmp, "recrawl.sqlite"))
+            recrawl.put("http://h/", response('"a"'), [], [])
+            # Запись ещё в пачке — get() её видит
+            entry = recrawl.get("http://h/")
+            self.assertEqual(entry["etag"], '"a"')
+
+            # Тело то же, ETag новый: следующий обход должен слать новый If-None-Match
+            self.assertTrue(recrawl.unchanged(entry, response('"b"')))
+            entry = recrawl.get("http://h/")
+            self.assertEqual(recrawl.conditional_headers(entry), {"If-None-Match": '"b"'})
+            recrawl.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
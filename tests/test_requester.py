@@ -0,0 +1,373 @@
+import unittest
+import gzip
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src.core.body_reader import CHUNK_SIZE, read_body
+from src.core.requester import Requester
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Сколько GET-запросов реально дошло до сервера
+    hits = 0
+    flaky = 0
+    dropped = 0  # POST-запросы на /drop, оборванные без ответа
+    posts = 0
+
+    # HTTP/1.1, чтобы сервер держал keep-alive соединения
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body, headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        _Handler.hits += 1
+        if self.path.startswith("/gzip") and "gzip" in self.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(("compressible " * 1000).encode("utf-8"))
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        elif self.path.startswith("/big"):
+            # Большое тело с сигнатурой в самом начале
+            self._reply(200, "Warning: mysql_fetch_array()" + "x" * 1024 * 1024)
+        elif self.path.startswith("/flaky"):
+            # Первые два запроса — 503, дальше 200
+            _Handler.flaky += 1
+            if _Handler.flaky <= 2:
+                self._reply(503, "busy")
+            else:
+                self._reply(200, "recovered")
+        elif self.path.startswith("/redirect"):
+            self._reply(302, "", {"Location": "/final"})
+        elif self.path.startswith("/busy"):
+            self._reply(503, "busy")
+        elif self.path.startswith("/missing"):
+            self._reply(404, "not found")
+        else:
+            self._reply(200, f"path={self.path}")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("utf-8")
+        _Handler.posts += 1
+        if self.path.startswith("/drop"):
+            # Запрос получен, но соединение рвётся без ответа
+            _Handler.dropped += 1
+            self.close_connection = True
+            return
+        self._reply(200, f"posted={body}")
+
+
+class _SlowResponse:
+    """Ответ, который отдаёт тело из сети по одному байту."""
+
+    def __init__(self, body, encoding):
+        self._body = body
+        self._headers = {"Content-Encoding": encoding}
+        self.length = len(body)
+
+    def getheader(self, name, default=None):
+        return self._headers.get(name, default)
+
+    def read(self, amount=None):
+        data, self._body = self._body[:1], self._body[1:]
+        self.length = len(self._body)
+        return data
+
+
+class TestRequester(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Локальный сервер на свободном порту
+        cls.httpd = ThreadingHTTPServer(("localhost", 0), _Handler)
+        # Оборванные клиентом ответы (/big) — ожидаемое поведение, не шумим в stderr
+        cls.httpd.handle_error = lambda request, client_address: None
+        cls.base = f"http://localhost:{cls.httpd.server_address[1]}"
+        cls.server_thread = threading.Thread(target=cls.httpd.serve_forever, daemon=True)
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+
+    def test_keep_alive_reuses_connections(self):
+        requester = Requester(timeout=5)
+        for i in range(5):
+            self.assertEqual(requester.get(f"{self.base}/page?i={i}"), f"path=/page?i={i}")
+        stats = requester.pool_stats()
+        requester.close()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(stats["reused"], 4)
+
+    def test_redirect_updates_last_url(self):
+        requester = Requester(timeout=5)
+        self.assertEqual(requester.get(f"{self.base}/redirect"), "path=/final")
+        self.assertEqual(requester.last_url, f"{self.base}/final")
+        requester.close()
+
+    def test_error_status_returns_none(self):
+        requester = Requester(timeout=5)
+        self.assertIsNone(requester.get(f"{self.base}/missing"))
+        self.assertIsNone(requester.last_url)
+        requester.close()
+
+    def test_request_returns_response_object(self):
+        requester = Requester(timeout=5)
+        response = requester.request("GET", f"{self.base}/redirect")
+        missing = requester.request("GET", f"{self.base}/missing")
+        requester.close()
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.url, f"{self.base}/final")
+        self.assertEqual(response.text, "path=/final")
+        self.assertGreaterEqual(response.elapsed, 0)
+        self.assertEqual(missing.status, 404)
+        self.assertFalse(missing.ok)
+
+    def test_last_url_is_per_thread(self):
+        requester = Requester(timeout=5)
+        requester.get(f"{self.base}/redirect")
+        seen = []
+        worker = threading.Thread(target=lambda: seen.append(requester.last_url))
+        worker.start()
+        worker.join()
+        requester.close()
+        self.assertEqual(seen, [None])
+        self.assertEqual(requester.last_url, f"{self.base}/final")
+
+    def test_batch_returns_every_probe(self):
+        requester = Requester(timeout=5, concurrency=4, per_host_concurrency=2)
+        probes = [{"method": "GET", "url": f"{self.base}/p?i={i}", "i": i} for i in range(10)]
+        probes.append({"method": "POST", "url": f"{self.base}/form", "data": {"x": "y"}, "i": 10})
+        answers = {probe["i"]: response.text for probe, response in requester.batch(probes)}
+        requester.close()
+        self.assertEqual(len(answers), 11)
+        self.assertEqual(answers[3], "path=/p?i=3")
+        self.assertEqual(answers[10], "posted=x=y")
+
+    def test_probe_cache_shares_identical_probes(self):
+        requester = Requester(timeout=5)
+        before = _Handler.hits
+        first = requester.scoped("error_based_sqli").get(f"{self.base}/cached?q=1")
+        second = requester.scoped("time_based_sqli").request("GET", f"{self.base}/cached?q=1")
+        fresh = requester.get(f"{self.base}/cached?q=1", use_cache=False)
+        stats = requester.cache_stats()
+        requester.close()
+        self.assertEqual(first, second.text)
+        self.assertEqual(first, fresh)
+        self.assertEqual(_Handler.hits - before, 2)
+        self.assertEqual(stats["modules"]["error_based_sqli"], {"hits": 0, "misses": 1})
+        self.assertEqual(stats["modules"]["time_based_sqli"], {"hits": 1, "misses": 0})
+
+    def test_probe_cache_skips_posts_and_transient_errors(self):
+        requester = Requester(timeout=5, retries=0)
+        posts, hits = _Handler.posts, _Handler.hits
+        for _ in range(2):
+            self.assertEqual(requester.post(f"{self.base}/login", {"user": "a"}), "posted=user=a")
+            self.assertEqual(requester.request("GET", f"{self.base}/busy").status, 503)
+        stats = requester.cache_stats()
+        requester.close()
+        # Каждая отправка формы и каждый повтор после 503 дошли до сервера
+        self.assertEqual(_Handler.posts - posts, 2)
+        self.assertEqual(_Handler.hits - hits, 2)
+        self.assertEqual(stats["entries"], 0)
+
+    def test_rate_limit_spaces_requests_without_inflating_elapsed(self):
+        requester = Requester(timeout=5, rate=20, burst=1, probe_cache_size=0)
+        start = time.perf_counter()
+        responses = [requester.request("GET", f"{self.base}/rate?i={i}") for i in range(5)]
+        total = time.perf_counter() - start
+        requester.close()
+        # Первый запрос бесплатный, остальные 4 — по 1/20 секунды
+        self.assertGreaterEqual(total, 0.19)
+        self.assertTrue(all(r.elapsed < 0.05 for r in responses))
+
+    def test_streamed_read_honours_size_cap_and_stop_when(self):
+        requester = Requester(timeout=5, max_body_size=256 * 1024)
+        capped = requester.request("GET", f"{self.base}/big?a=1")
+        matched = requester.request("GET", f"{self.base}/big?a=2", stop_when=re.compile("mysql"))
+        again = requester.request("GET", f"{self.base}/big?a=2")
+        stats = requester.transfer_stats()
+        requester.close()
+        self.assertEqual((len(capped.body), capped.truncated), (256 * 1024, "size"))
+        self.assertEqual(matched.truncated, "match")
+        self.assertLessEqual(len(matched.body), CHUNK_SIZE)
+        # Ответ, оборванный на сигнатуре, не кэшируется — следующий запрос уходит в сеть
+        self.assertEqual(again.truncated, "size")
+        self.assertEqual((stats["responses"], stats["truncated_size"], stats["truncated_match"]), (3, 2, 1))
+
+    def test_gzip_body_is_decoded_and_counted(self):
+        requester = Requester(timeout=5)
+        text = requester.get(f"{self.base}/gzip")
+        stats = requester.transfer_stats()
+        requester.close()
+        self.assertEqual(text, "compressible " * 1000)
+        self.assertEqual(stats["decoded_bytes"], len(text))
+        self.assertLess(stats["wire_bytes"], stats["decoded_bytes"] // 10)
+
+    def test_compressed_body_at_the_size_cap_is_complete(self):
+        text = "compressible " * 1000
+        exact = Requester(timeout=5, max_body_size=len(text))
+        response = exact.request("GET", f"{self.base}/gzip?exact")
+        exact.close()
+        # Распакованное тело ровно в лимит; трейлер gzip — не обрезка
+        self.assertEqual((response.text, response.truncated), (text, None))
+
+        short = Requester(timeout=5, max_body_size=len(text) - 1)
+        response = short.request("GET", f"{self.base}/gzip?short")
+        short.close()
+        self.assertEqual((len(response.body), response.truncated), (len(text) - 1, "size"))
+
+    def test_deflate_arriving_byte_by_byte(self):
+        text = b"deflated " * 100
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        for body in (zlib.compress(text), raw.compress(text) + raw.flush()):
+            for max_size, truncated in ((0, None), (len(text), None), (len(text) - 1, "size")):
+                with self.subTest(zlib_header=body[:2] == zlib.compress(b"")[:2], max_size=max_size):
+                    data, cut, _, wire = read_body(_SlowResponse(body, "deflate"), max_size=max_size)
+                    self.assertEqual((data, cut), (text[:max_size or None], truncated))
+                    if truncated is None:
+                        self.assertEqual(wire, len(body))
+
+    def test_sink_receives_the_final_body_while_reading(self):
+        class _Sink:
+            def __init__(self):
+                self.resets, self.data = [], b""
+
+            def reset(self, content_type):
+                self.resets.append(content_type)
+                self.data = b""
+
+            def feed(self, data):
+                self.data += data
+
+        sink = _Sink()
+        requester = Requester(timeout=5)
+        response = requester.request("GET", f"{self.base}/redirect", sink=sink)
+        requester.close()
+        # Тело редиректа и итоговое тело — отдельные ответы
+        self.assertEqual(sink.resets, ["text/html", "text/html"])
+        self.assertEqual(sink.data, response.body)
+
+    def test_transient_errors_are_retried(self):
+        requester = Requester(timeout=5, retries=2, retry_backoff=0.01)
+        text = requester.get(f"{self.base}/flaky")
+        requester.close()
+        self.assertEqual(text, "recovered")
+
+    def test_open_breaker_defers_batch_probes(self):
+        requester = Requester(timeout=1, retries=0, retry_backoff=0.01,
+                              breaker_threshold=1, breaker_cooldown=0.2)
+        dead = "http://127.0.0.1:9/"  # порт discard — соединение отклоняется
+        self.assertIsNone(requester.get(dead))
+        # Breaker открыт: запрос не уходит в сеть, а проба откладывается
+        self.assertIs(requester.fetch_probe({"method": "GET", "url": dead}), Requester.DEFERRED)
+        probes = [{"method": "GET", "url": dead, "i": i} for i in range(3)]
+        answers = list(requester.batch(probes))
+        stats = requester.breaker.stats()
+        requester.close()
+        self.assertEqual(sorted(p["i"] for p, _ in answers), [0, 1, 2])
+        self.assertTrue(all(response is None for _, response in answers))
+        self.assertGreater(stats["fast_failed"], 0)
+
+    def test_breaker_counts_one_failure_per_request(self):
+        requester = Requester(timeout=1, retries=2, retry_backoff=0.01, breaker_threshold=2)
+        dead = "http://127.0.0.1:9/"
+        self.assertIsNone(requester.get(dead))
+        # Три попытки одного запроса — одна неудача для breaker
+        self.assertEqual(requester.breaker.stats()["opened"], 0)
+        self.assertIsNone(requester.get(dead))
+        self.assertEqual(requester.breaker.stats()["opened"], 1)
+        requester.close()
+
+    def test_half_open_trial_is_released_when_sink_raises(self):
+        class _BrokenSink:
+            def reset(self, content_type):
+                return True
+
+            def feed(self, data):
+                raise RuntimeError("sink failed")
+
+        requester = Requester(timeout=5, retries=0, breaker_threshold=1, breaker_cooldown=0.05)
+        host = requester._host_key(self.base + "/")
+        requester.breaker.record(host, success=False)
+        time.sleep(0.06)
+        with self.assertRaises(RuntimeError):
+            requester.request("GET", f"{self.base}/page", sink=_BrokenSink())
+        # Пробный запрос завершился неудачей — хост снова получит пробу после cooldown,
+        # а не останется в half-open навсегда
+        time.sleep(0.11)
+        self.assertEqual(requester.get(f"{self.base}/page"), "path=/page")
+        requester.close()
+
+    def test_post_is_not_retried_after_network_error(self):
+        _Handler.dropped = 0
+        requester = Requester(timeout=5, retries=2, retry_backoff=0.01)
+        self.assertIsNone(requester.post(f"{self.base}/drop", {"comment": "x"}))
+        requester.close()
+        self.assertEqual(_Handler.dropped, 1)
+
+    def test_phase_timings_feed_histograms(self):
+        requester = Requester(timeout=5)
+        first = requester.scoped("error_based_sqli").request("GET", f"{self.base}/timed?i=1")
+        second = requester.scoped("crawler").request("GET", f"{self.base}/timed?i=2")
+        metrics = requester.metrics.to_dict()
+        requester.close()
+        self.assertEqual(set(first.timings), {"dns", "connect", "tls", "ttfb", "body", "total"})
+        # Второй запрос идёт по keep-alive соединению — без DNS и connect
+        self.assertEqual((second.timings["dns"], second.timings["connect"]), (0.0, 0.0))
+        host = f"localhost:{self.httpd.server_address[1]}"
+        self.assertEqual(metrics["by_host"][host]["total"]["count"], 2)
+        self.assertEqual(metrics["by_module"]["crawler"]["ttfb"]["count"], 1)
+
+    def test_post_sends_form_data(self):
+        requester = Requester(timeout=5)
+        self.assertEqual(requester.post(f"{self.base}/form", {"a": "1"}), "posted=a=1")
+        requester.close()
+
+    def test_record_and_replay_cassette(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "traffic.cassette")
+            recorder = Requester(timeout=5, record=path)
+            recorder.get(f"{self.base}/redirect")
+            recorder.post(f"{self.base}/form", {"a": "1"})
+            recorder.close()
+
+            hits = _Handler.hits
+            replayer = Requester(timeout=5, replay=path)
+            response = replayer.request("GET", f"{self.base}/redirect")
+            posted = replayer.post(f"{self.base}/form", {"a": "1"})
+            unknown = replayer.request("GET", f"{self.base}/not-recorded")
+            stats = replayer.cassette_stats()["replayed"]
+            replayer.close()
+
+        # Ответы пришли из кассеты, сервер запросов не получал
+        self.assertEqual(_Handler.hits, hits)
+        self.assertEqual((response.status, response.url, response.text), (200, f"{self.base}/final", "path=/final"))
+        self.assertEqual(response.headers["Content-Type"], "text/html")
+        self.assertEqual(posted, "posted=a=1")
+        self.assertIsNone(unknown)
+        self.assertEqual(stats, {"records": 2, "hits": 2, "misses": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
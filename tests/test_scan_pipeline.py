@@ -0,0 +1,46 @@
+import threading
+import unittest
+
+from src.core.scan_pipeline import ScanPipeline
+
+
+class _SilentLogger:
+    def info(self, msg):
+        pass
+
+
+class TestScanPipeline(unittest.TestCase):
+    def test_modules_scan_while_crawl_is_running(self):
+        first_scanned = threading.Event()
+        crawl_finished = []
+
+        def events():
+            yield "url", "http://site/a"
+            # Следующую страницу "находим" только после того, как первая проверена
+            self.assertTrue(first_scanned.wait(5))
+            yield "url", "http://site/b"
+            yield "form", {"action": "http://site/post"}
+            crawl_finished.append(True)
+
+        def sqli(requester, logger, urls, forms):
+            first_scanned.set()
+            return [{"module": "sqli", "target": target} for target in urls + [f["action"] for f in forms]]
+
+        def xss(requester, logger, urls, forms):
+            return [{"module": "xss", "target": url} for url in urls]
+
+        pipeline = ScanPipeline([("sqli", sqli), ("xss", xss)], None, _SilentLogger(), workers=2)
+        results = pipeline.run(events())
+
+        self.assertEqual(crawl_finished, [True])
+        self.assertEqual(
+            [(r["module"], r["target"]) for r in results],
+            [("sqli", "http://site/a"), ("sqli", "http://site/b"), ("sqli", "http://site/post"),
+             ("xss", "http://site/a"), ("xss", "http://site/b")]
+        )
+        self.assertEqual(pipeline.urls, ["http://site/a", "http://site/b"])
+        self.assertEqual(len(pipeline.forms), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+from src.core.simhash import SimHashIndex, hamming, simhash
+
+_PRODUCT = ("<html><head><title>{name}</title></head><body><nav><a href='/'>Home</a><a href='/cart'>Cart</a>"
+            "</nav>" + "".join(f"<p>Delivery and returns, paragraph {i} of the common template.</p>"
+                               for i in range(40)) +
+            "<h1>{name}</h1><p>Price: {price}</p></body></html>")
+
+
+class TestSimHash(unittest.TestCase):
+    def test_similar_pages_have_close_fingerprints(self):
+        red = simhash(_PRODUCT.format(name="Red shirt", price="10"))
+        blue = simhash(_PRODUCT.format(name="Blue shirt", price="12"))
+        contact = simhash("<html><body><h1>Contact us</h1><p>Our office is open from 9 to 5.</p></body></html>")
+        self.assertLessEqual(hamming(red, blue), 6)
+        self.assertGreater(hamming(red, contact), 12)
+        self.assertEqual(simhash(""), 0)
+
+    def test_index_clusters_by_representative(self):
+        index = SimHashIndex(distance=3)
+        self.assertEqual(index.add("/a", 0b0000), "/a")
+        self.assertEqual(index.add("/b", 0b0111), "/a")
+        # 4 бита от представителя — новый кластер, хотя до /b всего 1 бит
+        self.assertEqual(index.add("/c", 0b1111), "/c")
+        self.assertEqual(index.add("/d", (1 << 63) | 0b1), "/a")
+        self.assertEqual(index.add("/e", 0xFFFF_0000_0000_0000), "/e")
+        self.assertEqual(index.duplicates, {"/b": "/a", "/d": "/a"})
+        self.assertEqual(index.stats()["clusters"], 3)
+        self.assertEqual(index.stats()["largest"], [("/a", 3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import gzip
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src.core.crawler import Crawler
+from src.core.frontier import PriorityFrontier
+from src.core.priority import UrlScorer
+from src.core.requester import Requester
+from src.core.sitemap import SitemapParser, SitemapSeeder
+
+_NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _urlset(paths):
+    entries = "".join(f"<url><loc>/{path}</loc><lastmod>2024-01-01</lastmod></url>" for path in paths)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {_NS}>{entries}</urlset>'.encode("utf-8")
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """
+    robots.txt -> индекс карт -> обычная и сжатая (.gz) карты + карта с чужого хоста.
+    Страница /deep/N ссылается только на /deep/N+1: по ссылкам до /deep/30 — 30 переходов.
+    /deep/0 ещё ссылается на /item?id=1 (она же — первая в s1.xml), /item?id=N — на /item?id=N+1.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        content_type = "application/xml"
+        if self.path == "/robots.txt":
+            body, content_type = b"User-agent: *\nDisallow:\nSitemap: /sitemap_index.xml # index\n", "text/plain"
+        elif self.path == "/sitemap_index.xml":
+            body = (f'<sitemapindex {_NS}><sitemap><loc>/s1.xml</loc></sitemap><sitemap><loc>/s2.xml.gz</loc>'
+                    f'</sitemap><sitemap><loc>http://elsewhere.invalid/s.xml</loc></sitemap></sitemapindex>').encode()
+        elif self.path == "/s1.xml":
+            body = _urlset(["item?id=1"] + [f"deep/{n}" for n in range(10, 20)])
+        elif self.path == "/s2.xml.gz":
+            body, content_type = gzip.compress(_urlset(f"deep/{n}" for n in range(20, 31))), "application/x-gzip"
+        elif self.path.startswith("/deep/"):
+            n = int(self.path.rsplit("/", 1)[-1])
+            item = '<a href="/item?id=1">item</a>' if n == 0 else ""
+            body, content_type = f'<html><a href="/deep/{n + 1}">next</a>{item}</html>'.encode(), "text/html"
+        elif self.path.startswith("/item?id="):
+            n = int(self.path.rsplit("=", 1)[-1])
+            body, content_type = f'<html><a href="/item?id={n + 1}">next</a></html>'.encode(), "text/html"
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestSitemap(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.httpd = ThreadingHTTPServer(("localhost", 0), _SiteHandler)
+        cls.base = f"http://localhost:{cls.httpd.server_address[1]}"
+        threading.Thread(target=cls.httpd.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+
+    def test_parser_handles_any_chunking_and_gzip(self):
+        body = gzip.compress(_urlset(f"p/{n}" for n in range(100)))
+        for size in (1, 7, len(body)):
+            parser = SitemapParser(limit=60)
+            parser.reset("application/x-gzip")
+            for start in range(0, len(body), size):
+                parser.feed(body[start:start + size])
+            parser.finish(body)
+            self.assertEqual(parser.urls, [f"/p/{n}" for n in range(60)])
+            self.assertIsNone(parser.error)
+
+        broken = SitemapParser()
+        broken.finish(_urlset(["a", "b"])[:-20])
+        self.assertEqual(broken.urls, ["/a", "/b"])
+        self.assertIsNotNone(broken.error)
+
+    def test_seeded_urls_bypass_depth_within_budget(self):
+        # По ссылкам — /deep/0..2 и /item?id=1..2, из карт — 15 URL (11 из s1.xml и 4 из s2.xml.gz).
+        # /item?id=1 из карты отдаётся после копии глубины 1 — ссылка с неё на /item?id=2 обходится
+        expected = {f"{self.base}/deep/{n}" for n in list(range(3)) + list(range(10, 24))}
+        expected |= {f"{self.base}/item?id=1", f"{self.base}/item?id=2"}
+        for priority in (False, True):
+            with self.subTest(priority=priority):
+                requester = Requester(timeout=5)
+                seeder = SitemapSeeder(max_urls=15)
+                kwargs = {"frontier": PriorityFrontier(), "priority": UrlScorer()} if priority else {}
+                crawler = Crawler(f"{self.base}/deep/0", depth=2, requester=requester, sitemaps=seeder, **kwargs)
+                urls = [item for kind, item in crawler.crawl() if kind == "url"]
+                requester.close()
+
+                self.assertEqual(set(urls), expected)
+                self.assertEqual(len(urls), len(expected))
+                self.assertEqual(crawler.seeded, 15)
+                self.assertEqual(seeder.stats(), {"sitemaps": 3, "failed": 0, "urls": 15, "truncated": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
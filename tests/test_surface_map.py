@@ -0,0 +1,120 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src.core.crawler import Crawler
+from src.core.requester import Requester
+from src.core.simhash import SimHashIndex
+from src.core.surface_map import SurfaceMapReader, SurfaceMapWriter, injection_points
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """/page/N ссылается на /page/N+1 и /item?id=N; на каждой странице форма поиска."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        n = int(self.path.rsplit("/", 1)[-1]) if self.path.startswith("/page/") else 0
+        body = (
+            f'<html><a href="/page/{n + 1}">next</a><a href="/item?id={n}&amp;sort=">item</a>'
+            f'<form action="/search" method="post"><input name="q"><input name="lang"></form></html>'
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestSurfaceMap(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.httpd = ThreadingHTTPServer(("localhost", 0), _SiteHandler)
+        cls.base = f"http://localhost:{cls.httpd.server_address[1]}"
+        threading.Thread(target=cls.httpd.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "surface.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_injection_points(self):
+        self.assertEqual(
+            injection_points("url", "http://h/a?b=1&a=2&b=3"),
+            [("query", "GET", "http://h/a", "a"), ("query", "GET", "http://h/a", "b")]
+        )
+        form = {"method": "post", "action": "http://h/s", "inputs": [{"name": "q"}, {"name": None}]}
+        self.assertEqual(injection_points("form", form), [("form", "POST", "http://h/s", "q")])
+
+    def test_round_trip_keeps_event_order(self):
+        form = {"method": "get", "action": "http://h/s", "inputs": [{"name": "q", "type": "text", "value": ""}]}
+        events = [
+            ("url", "http://h/"), ("form", form), ("url", "http://h/a?x=1"),
+            ("duplicate", ("http://h/b", "http://h/")), ("form", dict(form, method="post"))
+        ]
+        writer = SurfaceMapWriter(self.path, "http://h/", 2, write_batch=2)
+        writer.fingerprint("http://h/", 0xFFFFFFFFFFFFFFFF)
+        for kind, item in events:
+            writer.add(kind, item)
+        writer.close()
+
+        reader = SurfaceMapReader(self.path)
+        self.assertEqual((reader.start_url, reader.depth), ("http://h/", 2))
+        self.assertEqual(list(reader.events()), events)
+        self.assertEqual(reader.fingerprints(), {"http://h/": 0xFFFFFFFFFFFFFFFF})
+        self.assertEqual(reader.injection_points("x"), [("query", "GET", "http://h/a", "x")])
+        self.assertEqual(
+            reader.stats(),
+            {"urls": 3, "duplicates": 1, "forms": 2, "injection_points": 3, "fingerprints": 1}
+        )
+        reader.close()
+
+        # Новый обход в тот же файл заменяет карту
+        SurfaceMapWriter(self.path, "http://other/", 1).close()
+        reader = SurfaceMapReader(self.path)
+        self.assertEqual(list(reader.events()), [])
+        reader.close()
+
+    def test_reader_rejects_missing_and_foreign_files(self):
+        with self.assertRaises(OSError):
+            SurfaceMapReader(self.path)
+        with open(self.path, "w") as f:
+            f.write("not a database")
+        with self.assertRaises(OSError):
+            SurfaceMapReader(self.path)
+
+    def test_crawl_writes_events_that_replay_without_requests(self):
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                requester = Requester(timeout=5)
+                writer = SurfaceMapWriter(self.path, self.base + "/page/0", 3)
+                crawler = Crawler(self.base + "/page/0", depth=3, requester=requester, workers=workers,
+                                  surface=writer, near_duplicates=SimHashIndex(3))
+                crawled = list(crawler.crawl())
+                writer.close()
+                requester.close()
+
+                reader = SurfaceMapReader(self.path)
+                self.assertEqual(list(reader.events()), crawled)
+                stats = reader.stats()
+                self.assertEqual(stats["forms"], 1)
+                self.assertEqual(stats["fingerprints"], crawler.pages_fetched)
+                self.assertEqual(stats["urls"], len(crawled) - 1)
+                params = {(kind, param) for kind, _, _, param in reader.injection_points()}
+                self.assertEqual(params, {("query", "id"), ("query", "sort"), ("form", "q"), ("form", "lang")})
+                reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from src.core.url_traps import TrapDetector, canonicalize_url
+
+
+class TestUrlTraps(unittest.TestCase):
+    def test_canonical_form(self):
+        self.assertEqual(
+            canonicalize_url("http://shop.local/cart;jsessionid=AB12?sort=name&PHPSESSID=x&page=2&a=%20b"),
+            "http://shop.local/cart?a=%20b&page=2&sort=name"
+        )
+        # Общие имена вроде sid — данные приложения, а не сессия: остаются для сканеров
+        self.assertEqual(canonicalize_url("http://a/item?sid=5&a=1"), "http://a/item?a=1&sid=5")
+        # Значения одного параметра сохраняют порядок
+        self.assertEqual(canonicalize_url("http://a/?b=2&a=1&b=1"), "http://a/?a=1&b=2&b=1")
+
+    def test_pagination_and_calendar_are_capped(self):
+        traps = TrapDetector(max_values_per_param=10, max_urls_per_template=20)
+        pages = [traps.allow(f"http://shop.local/list?page={i}") for i in range(100)]
+        self.assertEqual(sum(pages), 10)
+        days = [traps.allow(f"http://shop.local/calendar/2024/{m}/{d}")
+                for m in range(1, 13) for d in range(1, 29)]
+        self.assertEqual(sum(days), 20)
+        self.assertFalse(traps.allow("http://shop.local/a/b/a/b/a/b/a/b"))
+        # Повторная проверка уже отброшенной ссылки не считается заново
+        self.assertFalse(traps.allow("http://shop.local/list?page=99"))
+
+        stats = traps.stats()
+        self.assertEqual(stats["by_rule"], {"param_values": 90, "template": 316, "path_loop": 1})
+        self.assertEqual(stats["skipped"], 407)
+        # Ранее принятые URL по-прежнему разрешены
+        self.assertTrue(traps.allow("http://shop.local/list?page=3"))
+
+    def test_rejected_fingerprints_are_capped(self):
+        traps = TrapDetector(max_values_per_param=1, max_rejected=10)
+        self.assertTrue(traps.allow("http://a/list?page=0"))
+        self.assertEqual(sum(traps.allow(f"http://a/list?page={i}") for i in range(1, 1001)), 0)
+        self.assertEqual(len(traps._rejected), 10)
+        # Решение не зависит от множества: URL сверх лимита по-прежнему отброшены
+        self.assertFalse(traps.allow("http://a/list?page=500"))
+        self.assertEqual(traps.stats()["skipped"], 1001)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from src.core.frontier import MemoryFrontier, SQLiteFrontier
+from src.core.visited import make_visited_set
+
+
+class TestVisitedSets(unittest.TestCase):
+    def test_compact_sets_remember_urls(self):
+        urls = [f"http://shop.local/item?id={i}" for i in range(5000)]
+        for mode in ("exact", "fingerprint", "bloom"):
+            visited = make_visited_set(mode, capacity=1000, error_rate=0.01)
+            for url in urls:
+                visited.add(url)
+            self.assertTrue(all(url in visited for url in urls), mode)
+            self.assertGreater(visited.memory_bytes(), 0)
+
+        # Bloom вырос за capacity, но доля ложных срабатываний в пределах error_rate
+        unseen = [f"http://shop.local/other?id={i}" for i in range(20000)]
+        false_positives = sum(url in visited for url in unseen)
+        self.assertLess(false_positives / len(unseen), 0.01)
+
+    def test_fingerprints_are_smaller_than_strings(self):
+        exact, fingerprint = make_visited_set("exact"), make_visited_set("fingerprint")
+        for i in range(20000):
+            url = f"http://shop.local/catalog/item?id={i}&ref=listing"
+            exact.add(url)
+            fingerprint.add(url)
+        self.assertEqual(len(fingerprint), 20000)
+        self.assertLess(fingerprint.memory_bytes() * 3, exact.memory_bytes())
+
+
+class TestFrontier(unittest.TestCase):
+    def test_sqlite_frontier_keeps_bfs_order(self):
+        rnd = random.Random(7)
+        disk, memory = SQLiteFrontier(write_batch=5, read_batch=3), MemoryFrontier()
+        popped_disk, popped_memory = [], []
+        for step in range(3000):
+            if rnd.random() < 0.55:
+                depth = rnd.randint(0, 5)
+                disk.push(f"u{step}", depth)
+                memory.push(f"u{step}", depth)
+            else:
+                max_depth = rnd.choice([None, rnd.randint(0, 5)])
+                popped_disk.append(disk.pop(max_depth))
+                popped_memory.append(memory.pop(max_depth))
+        self.assertEqual(popped_disk, popped_memory)
+        self.assertEqual(len(disk), len(memory))
+        self.assertEqual(disk.stats()["peak"], memory.stats()["peak"])
+        disk.close()
+
+
+if __name__ == '__main__':
+    unittest.main()